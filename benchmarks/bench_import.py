@@ -0,0 +1,94 @@
+"""Startup benchmarks: import time and first client construction.
+
+Each case runs in a fresh interpreter, so nothing is cached between runs::
+
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --save benchmarks/import_baseline.json
+    python benchmarks/bench_import.py --compare benchmarks/import_baseline.json
+
+Results and regressions use the same format as ``bench_requests.py``.
+Timings are measured inside the child process, so interpreter startup is not
+included.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+from bench_requests import _environment, _format_seconds, compare
+
+_CASES: Dict[str, str] = {
+    "import sendlix": "import sendlix",
+    "from sendlix import EmailClient": "from sendlix import EmailClient",
+    "EmailClient()": "from sendlix import EmailClient\nEmailClient('key.1')",
+    "EmailClient() + first RPC stub": (
+        "from sendlix import EmailClient\nEmailClient('key.1').client"),
+}
+
+_TEMPLATE = """\
+import time
+start = time.perf_counter()
+{code}
+print(time.perf_counter() - start)
+"""
+
+
+def _time_once(code: str) -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", _TEMPLATE.format(code=code)],
+        check=True, capture_output=True, text=True, env=os.environ.copy(),
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def run(pattern: str = "", *, repeat: int = 15) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for name, code in _CASES.items():
+        if pattern and pattern not in name:
+            continue
+        timings = [_time_once(code) for _ in range(repeat)]
+        results[name] = {"best": min(timings), "median": statistics.median(timings),
+                         "loops": repeat}
+        print(f"{name:<50} {_format_seconds(results[name]['best']):>12} "
+              f"(median {_format_seconds(results[name]['median'])})", flush=True)
+    return results
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-k", dest="pattern", default="",
+                        help="only run cases whose name contains this string")
+    parser.add_argument("--repeat", type=int, default=15)
+    parser.add_argument("--save", metavar="PATH", help="write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown before a case counts as a regression")
+    args = parser.parse_args(argv)
+
+    results = run(args.pattern, repeat=args.repeat)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as handle:
+            json.dump({"environment": _environment(), "results": results},
+                      handle, indent=2, sort_keys=True)
+            handle.write("\n")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
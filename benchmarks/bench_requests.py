@@ -0,0 +1,270 @@
+"""Micro-benchmarks for request building and serialization hot paths.
+
+Run from the repository root after ``pip install -e .``::
+
+    python benchmarks/bench_requests.py                     # print results
+    python benchmarks/bench_requests.py -k recipients       # only matching cases
+    python benchmarks/bench_requests.py --save benchmarks/baseline.json
+    python benchmarks/bench_requests.py --compare benchmarks/baseline.json
+
+``--compare`` exits with status 1 when any case is slower than the baseline by
+more than ``--threshold`` (25% by default). Timings are the best of
+``--repeat`` runs, each long enough to last at least ``--min-time`` seconds.
+Baselines are only comparable on the same machine and Python version.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Tuple
+
+import google.protobuf
+from sendlix.clients._helpers import _interned_email_data, build_recipients, to_email_data
+from sendlix.clients.email_client import (
+    MailTemplate,
+    _build_additional_infos,
+    _build_images,
+    _build_mail_content,
+    _build_send_mail_request,
+    _serialize_eml_request,
+)
+from sendlix.clients.group_client import _build_group_entry, _build_insert_request
+
+Case = Callable[[], object]
+_CASES: List[Tuple[str, Callable[[], Case]]] = []
+
+
+def case(name: str):
+    """Register a benchmark; the decorated function does setup and returns the timed callable."""
+
+    def register(setup: Callable[[], Case]) -> Callable[[], Case]:
+        _CASES.append((name, setup))
+        return setup
+
+    return register
+
+
+def _addresses(count: int, *, named: bool = True) -> List[object]:
+    return [
+        {"email": f"user{i}@example.com", "name": f"User {i}"} if named
+        else f"user{i}@example.com"
+        for i in range(count)
+    ]
+
+
+def _html(size: int) -> str:
+    block = "<p>Hello {{name}}, here is your weekly summary.</p>\n"
+    return (block * (size // len(block) + 1))[:size]
+
+
+def _mail(recipients: int, *, html_size: int = 100 * 1024, images=()) -> dict:
+    return {
+        "from": {"email": "sender@example.com", "name": "Sender"},
+        "to": _addresses(recipients),
+        "subject": "Weekly summary",
+        "html": _html(html_size),
+        "text": "Plain text fallback",
+        "images": list(images),
+    }
+
+
+def _image(size: int, placeholder: str = "logo") -> dict:
+    return {"placeholder": placeholder, "data": bytes(size), "type": "PNG"}
+
+
+_ADDITIONAL = {
+    "attachments": [
+        {"contentURL": f"https://cdn.example.com/file{i}.pdf",
+         "filename": f"file{i}.pdf", "contentType": "application/pdf"}
+        for i in range(10)
+    ],
+    "category": "newsletter",
+    "send_at": datetime(2030, 1, 1, tzinfo=timezone.utc),
+}
+
+
+@case("to_email_data[hot]")
+def _to_email_data_hot() -> Case:
+    address = {"email": "hot@example.com", "name": "Hot"}
+    return lambda: to_email_data(address)
+
+
+@case("to_email_data[cold]")
+def _to_email_data_cold() -> Case:
+    build = _interned_email_data.__wrapped__
+    return lambda: build("cold@example.com", "Cold")
+
+
+for _count in (1, 100, 10_000):
+    @case(f"build_recipients[{_count}]")
+    def _recipients(count: int = _count) -> Case:
+        to = _addresses(count)
+        return lambda: build_recipients(to, (), ())
+
+
+@case("_build_mail_content[html=100KB]")
+def _mail_content() -> Case:
+    source = {"html": _html(100 * 1024), "text": "fallback", "tracking": True}
+    return lambda: _build_mail_content(source)
+
+
+for _size_mb in (1, 4):
+    @case(f"_build_images[{_size_mb}MB]")
+    def _images(size_mb: int = _size_mb) -> Case:
+        images = [_image(size_mb * 1024 * 1024)]
+        return lambda: list(_build_images(images))
+
+
+@case("_build_additional_infos[10 attachments]")
+def _additional_infos() -> Case:
+    return lambda: _build_additional_infos(_ADDITIONAL)
+
+
+@case("_build_group_entry")
+def _group_entry() -> Case:
+    record = {
+        "email": {"email": "member@example.com", "name": "Member"},
+        "substitutions": {f"field{i}": f"value {i}" for i in range(5)},
+    }
+    return lambda: _build_group_entry(record)
+
+
+for _count in (1, 100, 10_000):
+    @case(f"SendMailRequest[{_count} recipients, html=100KB]")
+    def _send_mail(count: int = _count) -> Case:
+        mail = _mail(count)
+        return lambda: _build_send_mail_request(mail, _ADDITIONAL).SerializeToString()
+
+
+@case("SendMailRequest[1 recipient, 3x4MB images]")
+def _send_mail_images() -> Case:
+    mail = _mail(1, images=[_image(4 * 1024 * 1024, f"img{i}") for i in range(3)])
+    return lambda: _build_send_mail_request(mail).SerializeToString()
+
+
+@case("MailTemplate.render[1 recipient, html=100KB]")
+def _template_render() -> Case:
+    template = MailTemplate(_mail(0))
+    to = ["someone@example.com"]
+    return lambda: template.render(to)
+
+
+for _count in (1, 1_000, 10_000):
+    @case(f"InsertEmailToGroupRequest[{_count} entries]")
+    def _insert(count: int = _count) -> Case:
+        records = [
+            {"email": address, "substitutions": {"plan": "pro"}}
+            for address in _addresses(count)
+        ]
+        return lambda: _build_insert_request("group-1", records).SerializeToString()
+
+
+@case("_serialize_eml_request[5MB]")
+def _eml() -> Case:
+    eml = b"Subject: hi\r\n\r\n" + b"x" * (5 * 1024 * 1024)
+    return lambda: _serialize_eml_request(eml, {"category": "raw"})
+
+
+def _measure(fn: Case, *, repeat: int, min_time: float) -> Dict[str, float]:
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 10 if elapsed < min_time / 10 else 2
+
+    timings = [elapsed / loops]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        timings.append((time.perf_counter() - start) / loops)
+    return {"best": min(timings), "median": statistics.median(timings), "loops": loops}
+
+
+def run(pattern: str = "", *, repeat: int = 5, min_time: float = 0.1) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for name, setup in _CASES:
+        if pattern and pattern not in name:
+            continue
+        results[name] = _measure(setup(), repeat=repeat, min_time=min_time)
+        print(f"{name:<50} {_format_seconds(results[name]['best']):>12}", flush=True)
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: dict, threshold: float) -> List[str]:
+    """Return a description of every case slower than the baseline allows."""
+
+    regressions = []
+    for name, result in results.items():
+        reference = baseline["results"].get(name)
+        if reference is None:
+            continue
+        ratio = result["best"] / reference["best"]
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{name}: {_format_seconds(result['best'])} vs "
+                f"{_format_seconds(reference['best'])} baseline ({ratio:.2f}x)")
+    return regressions
+
+
+def _format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def _environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "protobuf": google.protobuf.__version__,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-k", dest="pattern", default="",
+                        help="only run cases whose name contains this string")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.1)
+    parser.add_argument("--save", metavar="PATH", help="write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown before a case counts as a regression")
+    args = parser.parse_args(argv)
+
+    results = run(args.pattern, repeat=args.repeat, min_time=args.min_time)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as handle:
+            json.dump({"environment": _environment(), "results": results},
+                      handle, indent=2, sort_keys=True)
+            handle.write("\n")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,36 @@
 """Sendlix Python SDK."""
 
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
 __version__ = "1.0.0"
 
-from .auth import Auth
-from .clients.email_client import EmailClient
-from .clients.group_client import GroupClient
+if TYPE_CHECKING:  # pragma: no cover
+    from .auth import Auth
+    from .clients.email_client import EmailClient
+    from .clients.group_client import GroupClient
+
+# Submodules (and with them grpc and the generated protobuf modules) are only
+# imported when one of these names is first accessed.
+_LAZY_ATTRIBUTES = {
+    "Auth": ".auth",
+    "EmailClient": ".clients.email_client",
+    "GroupClient": ".clients.group_client",
+}
 
 __all__ = ["Auth", "EmailClient", "GroupClient"]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_LAZY_ATTRIBUTES})
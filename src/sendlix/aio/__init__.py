@@ -0,0 +1,8 @@
+"""Asynchronous Sendlix clients built on ``grpc.aio``."""
+
+from .auth import AsyncAuth
+from .client import AsyncClient
+from .email_client import AsyncEmailClient
+from .group_client import AsyncGroupClient
+
+__all__ = ["AsyncAuth", "AsyncClient", "AsyncEmailClient", "AsyncGroupClient"]
@@ -0,0 +1,87 @@
+"""``grpc.aio`` counterpart of :class:`sendlix.policy._PolicyInterceptor`."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import grpc
+import grpc.aio
+
+from ..policy import (
+    CallPolicy,
+    CircuitOpenError,
+    HedgingPolicy,
+    _RETRYABLE_CODES,
+    _method_name,
+    _remaining,
+)
+
+
+class _AsyncPolicyInterceptor(grpc.aio.UnaryUnaryClientInterceptor):
+    """Applies a :class:`CallPolicy` to every outgoing unary call."""
+
+    def __init__(self, policy: CallPolicy) -> None:
+        self._policy = policy
+
+    async def intercept_unary_unary(self, continuation, client_call_details, request):
+        policy = self._policy
+        method = _method_name(client_call_details.method)
+        breaker = policy.circuit_breaker
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpenError(
+                f"Circuit breaker is open; not calling {method}")
+
+        timeout = client_call_details.timeout
+        if timeout is None:
+            timeout = policy.timeout_for(method)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        hedging = policy.hedging_for(method)
+
+        async def attempt():
+            details = client_call_details._replace(timeout=_remaining(deadline))
+            call = await continuation(details, request)
+            return call, await call.code()
+
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                if hedging:
+                    call, code = await _hedge(attempt, hedging, policy)
+                else:
+                    call, code = await attempt()
+            except asyncio.CancelledError:
+                if breaker is not None:
+                    breaker.record(None)
+                raise
+            if breaker is not None:
+                breaker.record(code)
+            delay = policy.retry_delay(method, code, attempts, deadline)
+            if delay is None:
+                return call
+            await asyncio.sleep(delay)
+
+
+async def _hedge(attempt, hedging: HedgingPolicy, policy: CallPolicy):
+    retryable = policy.retry.retryable_codes if policy.retry else _RETRYABLE_CODES
+    pending = {asyncio.ensure_future(attempt())}
+    started = 1
+    result = None
+    while pending:
+        can_hedge = started < hedging.max_attempts
+        done, pending = await asyncio.wait(
+            pending,
+            timeout=hedging.delay if can_hedge else None,
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+        for finished in done:
+            result = finished.result()
+            code = result[1]
+            if code == grpc.StatusCode.OK or code not in retryable:
+                # Slower attempts are left to finish on their own.
+                return result
+        if can_hedge and (not done or not pending):
+            pending.add(asyncio.ensure_future(attempt()))
+            started += 1
+    return result
@@ -0,0 +1,83 @@
+"""Asynchronous authentication helper for the Sendlix SDK."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Tuple
+
+import grpc
+import grpc.aio
+
+from ..auth import _CachedToken, _build_api_key, _token_from_response
+from ..constants import API_HOST, USER_AGENT
+from ..policy import DEFAULT_CALL_POLICY, CallPolicy
+from ..proto import auth_pb2, auth_pb2_grpc
+from ._policy import _AsyncPolicyInterceptor
+
+
+class AsyncAuth:
+    """Fetches and caches JWT tokens without blocking the event loop."""
+
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        host: str = API_HOST,
+        policy: CallPolicy | None = None,
+    ) -> None:
+        self._api_key = _build_api_key(api_key)
+        self._host = host
+        self._channel = grpc.aio.secure_channel(
+            host,
+            grpc.ssl_channel_credentials(),
+            options=(("grpc.primary_user_agent", USER_AGENT),),
+            interceptors=[_AsyncPolicyInterceptor(policy or DEFAULT_CALL_POLICY)],
+        )
+        self._client = auth_pb2_grpc.AuthStub(self._channel)
+        self._token_cache: _CachedToken | None = None
+        # Created lazily so the lock binds to the loop that first uses it.
+        self._lock: asyncio.Lock | None = None
+
+    async def get_auth_header(self) -> Tuple[str, str]:
+        """Return the Authorization header tuple expected by gRPC metadata."""
+
+        token = await self._get_token()
+        return "authorization", f"Bearer {token}"
+
+    async def _get_token(self) -> str:
+        cached = self._token_cache
+        if cached and cached.is_valid(time.time()):
+            return cached.value
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            # Another task may have refreshed the token while we waited.
+            now = time.time()
+            if self._token_cache and self._token_cache.is_valid(now):
+                return self._token_cache.value
+
+            request = auth_pb2.AuthRequest(apiKey=self._api_key)
+            response = await self._client.GetJwtToken(request)
+            self._token_cache = _token_from_response(response, now)
+            return self._token_cache.value
+
+    def invalidate_cache(self) -> None:
+        """Force fetching a new token on the next request."""
+
+        self._token_cache = None
+
+    async def close(self) -> None:
+        """Dispose the gRPC channel."""
+
+        await self._channel.close()
+
+    async def __aenter__(self) -> "AsyncAuth":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    def __repr__(self) -> str:  # pragma: no cover - debug helper
+        return f"AsyncAuth(host={self._host!r}, token_cached={self._token_cache is not None})"
@@ -0,0 +1,89 @@
+"""Base ``grpc.aio`` client utilities for the Sendlix SDK."""
+
+from __future__ import annotations
+
+import inspect
+from typing import Awaitable, Protocol, Tuple, Type, TypeVar, Union
+
+import grpc
+import grpc.aio
+
+from ..constants import API_HOST, USER_AGENT
+from ..policy import DEFAULT_CALL_POLICY, CallPolicy
+from ._policy import _AsyncPolicyInterceptor
+from .auth import AsyncAuth
+
+TStub = TypeVar("TStub")
+
+
+class SupportsAsyncAuthHeader(Protocol):
+    """Protocol describing objects that can provide an auth header.
+
+    Both coroutine and plain implementations of ``get_auth_header`` are
+    accepted, so a synchronous :class:`sendlix.Auth` works as well.
+    """
+
+    def get_auth_header(self) -> Union[Tuple[str, str], Awaitable[Tuple[str, str]]]:
+        ...
+
+
+class _AuthMetadataInterceptor(grpc.aio.UnaryUnaryClientInterceptor):
+    """Attaches the Authorization header to every outgoing unary call."""
+
+    def __init__(self, auth: SupportsAsyncAuthHeader) -> None:
+        self._auth = auth
+
+    async def intercept_unary_unary(self, continuation, client_call_details, request):
+        header = self._auth.get_auth_header()
+        if inspect.isawaitable(header):
+            header = await header
+
+        metadata = grpc.aio.Metadata(*tuple(client_call_details.metadata or ()))
+        metadata.add(*header)
+        details = client_call_details._replace(metadata=metadata)
+        return await continuation(details, request)
+
+
+class AsyncClient:
+    """Base class that wires authentication metadata into a ``grpc.aio`` stub."""
+
+    def __init__(
+        self,
+        auth: SupportsAsyncAuthHeader | str,
+        stub_cls: Type[TStub],
+        *,
+        host: str = API_HOST,
+        policy: CallPolicy | None = None,
+    ) -> None:
+        if isinstance(auth, str):
+            auth = AsyncAuth(auth, host=host, policy=policy)
+
+        if not hasattr(auth, "get_auth_header"):
+            raise TypeError(
+                "auth must be an API key string or expose get_auth_header()")
+
+        self._auth = auth
+        self._host = host
+
+        options = (("grpc.primary_user_agent", USER_AGENT),)
+        self._channel = grpc.aio.secure_channel(
+            host,
+            grpc.ssl_channel_credentials(),
+            options=options,
+            interceptors=[
+                _AuthMetadataInterceptor(auth),
+                _AsyncPolicyInterceptor(policy or DEFAULT_CALL_POLICY),
+            ],
+        )
+        self.client: TStub = stub_cls(self._channel)
+
+    async def close(self) -> None:
+        """Close the underlying gRPC channel."""
+
+        await self._channel.close()
+
+    async def __aenter__(self) -> AsyncClient:
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
@@ -0,0 +1,60 @@
+"""Asynchronous email client mirroring :class:`sendlix.EmailClient`."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Any
+
+from ..clients.email_client import (
+    AdditionalEmailOptions,
+    GroupMailOptions,
+    MailOptions,
+    _build_eml_request,
+    _build_group_mail_request,
+    _build_send_mail_request,
+)
+from ..proto import email_pb2_grpc
+from .client import AsyncClient, SupportsAsyncAuthHeader
+
+
+class AsyncEmailClient(AsyncClient):
+    """Client for the Sendlix email gRPC service on ``grpc.aio``."""
+
+    def __init__(self, auth: SupportsAsyncAuthHeader | str, **options: Any) -> None:
+        super().__init__(auth, email_pb2_grpc.EmailStub, **options)
+
+    async def send_email(
+        self,
+        mail_options: MailOptions,
+        additional_options: AdditionalEmailOptions | None = None,
+    ) -> list[str]:
+        request = _build_send_mail_request(mail_options, additional_options)
+        response = await self.client.SendEmail(request)
+        return list(response.message)
+
+    async def send_eml_email(
+        self,
+        eml: str | Path | bytes | bytearray | memoryview,
+        additional_options: AdditionalEmailOptions | None = None,
+    ) -> list[str]:
+        if isinstance(eml, (str, Path)):
+            # Reading from disk must not stall the event loop.
+            loop = asyncio.get_running_loop()
+            request = await loop.run_in_executor(
+                None, _build_eml_request, eml, additional_options)
+        else:
+            request = _build_eml_request(eml, additional_options)
+
+        response = await self.client.SendEmlEmail(request)
+        return list(response.message)
+
+    async def send_group_email(self, group_mail: GroupMailOptions) -> list[str]:
+        request = _build_group_mail_request(group_mail)
+        response = await self.client.SendGroupEmail(request)
+        return list(response.message)
+
+    # Aliases matching the reference client's naming
+    sendEmail = send_email
+    sendEmlEmail = send_eml_email
+    sendGroupEmail = send_group_email
@@ -0,0 +1,51 @@
+"""Asynchronous group client mirroring :class:`sendlix.GroupClient`."""
+
+from __future__ import annotations
+
+from typing import Any, Sequence
+
+from ..clients.group_client import (
+    GroupEmailInput,
+    _build_check_request,
+    _build_insert_request,
+    _build_remove_request,
+)
+from ..proto import group_pb2_grpc
+from .client import AsyncClient, SupportsAsyncAuthHeader
+
+
+class AsyncGroupClient(AsyncClient):
+    """Client for the Sendlix group gRPC service on ``grpc.aio``."""
+
+    def __init__(self, auth: SupportsAsyncAuthHeader | str, **options: Any) -> None:
+        super().__init__(auth, group_pb2_grpc.GroupStub, **options)
+
+    async def insert_email_into_group(
+        self,
+        group_id: str,
+        email: GroupEmailInput | Sequence[GroupEmailInput],
+        fail_handling: str = "ABORT",
+    ) -> bool:
+        request = _build_insert_request(group_id, email, fail_handling)
+        response = await self.client.InsertEmailToGroup(request)
+        if not response.success:
+            raise RuntimeError(response.message or "InsertEmailToGroup failed")
+        return True
+
+    async def delete_email_from_group(self, group_id: str, email: str) -> bool:
+        request = _build_remove_request(group_id, email)
+        response = await self.client.RemoveEmailFromGroup(request)
+        if not response.success:
+            raise RuntimeError(
+                response.message or "RemoveEmailFromGroup failed")
+        return True
+
+    async def contains_email_in_group(self, group_id: str, email: str) -> bool:
+        request = _build_check_request(group_id, email)
+        response = await self.client.CheckEmailInGroup(request)
+        return bool(response.exists)
+
+    # Aliases to mirror the reference client's naming
+    insertEmailIntoGroup = insert_email_into_group
+    deleteEmailFromGroup = delete_email_from_group
+    containsEmailInGroup = contains_email_in_group
@@ -2,43 +2,124 @@
 
 from __future__ import annotations
 
+import dataclasses
+import hashlib
+import logging
+import threading
 import time
-from typing import Tuple
+from typing import TYPE_CHECKING, Sequence, Tuple
 
 import grpc
 
-from .constants import API_HOST, USER_AGENT
+from .channels import (
+    ChannelConfig,
+    ChannelLease,
+    ChannelPool,
+    Hosts,
+    default_channel_pool,
+    normalize_hosts,
+)
+from .constants import API_HOST
+from .instrumentation import Recorder, _MetricsInterceptor
+from .policy import DEFAULT_CALL_POLICY, CallPolicy, _PolicyInterceptor
 from .proto import auth_pb2, auth_pb2_grpc
 from ._compat import dataclass
 
+if TYPE_CHECKING:  # pragma: no cover
+    from .token_store import TokenStore
+
+
+_logger = logging.getLogger(__name__)
+
+_EXPIRY_SKEW_SECONDS = 5
+DEFAULT_REFRESH_AHEAD_SECONDS = 60.0
+
 
 @dataclass(slots=True)
 class _CachedToken:
     value: str
     expires_at: float
+    issued_at: float = 0.0
+
+    def is_valid(self, now: float) -> bool:
+        return self.expires_at - _EXPIRY_SKEW_SECONDS > now
+
+    def refresh_due(self, now: float, refresh_ahead: float) -> bool:
+        # Never refresh earlier than half-way through the token's lifetime so
+        # short-lived tokens are not re-fetched on every request.
+        lifetime = self.expires_at - self.issued_at
+        window = min(refresh_ahead, lifetime / 2)
+        return self.expires_at - window <= now
+
+
+@dataclass(slots=True)
+class AuthStats:
+    """Token cache counters exposed through :attr:`Auth.stats`."""
+
+    hits: int = 0
+    store_hits: int = 0
+    misses: int = 0
+    refreshes: int = 0
+    background_refreshes: int = 0
+    refresh_errors: int = 0
 
 
 class Auth:
-    """Fetches and caches JWT tokens using an API key."""
-
-    def __init__(self, api_key: str, *, host: str = API_HOST) -> None:
-        secret, key_id = self._split_api_key(api_key)
-        self._api_key = auth_pb2.ApiKey(secret=secret, keyID=int(key_id))
-        self._host = host
-        self._channel = grpc.secure_channel(
-            host,
-            grpc.ssl_channel_credentials(),
-            options=(("grpc.primary_user_agent", USER_AGENT),),
-        )
-        self._client = auth_pb2_grpc.AuthStub(self._channel)
+    """Fetches and caches JWT tokens using an API key.
+
+    Concurrent callers share a single in-flight ``GetJwtToken`` call. Once a
+    cached token is within ``refresh_ahead`` seconds of expiring, the next
+    caller triggers a background refresh and keeps using the still-valid token.
+
+    With a ``token_store`` (see :mod:`sendlix.token_store`) the token is also
+    shared with other ``Auth`` instances and processes using the same store.
+    ``policy`` sets the deadline, retries and circuit breaker for token fetches,
+    and ``recorder`` receives cache events and refresh latencies.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        host: str | Sequence[str] = API_HOST,
+        channel_pool: ChannelPool | None = None,
+        channel_config: ChannelConfig | None = None,
+        refresh_ahead: float = DEFAULT_REFRESH_AHEAD_SECONDS,
+        background_refresh: bool = True,
+        token_store: TokenStore | None = None,
+        policy: CallPolicy | None = None,
+        recorder: Recorder | None = None,
+    ) -> None:
+        if refresh_ahead < 0:
+            raise ValueError("refresh_ahead must not be negative")
+
+        self._api_key = _build_api_key(api_key)
+        self._host = normalize_hosts(host)
+        self._token_store = token_store
+        self._store_key = _store_key(api_key, self._host)
+        self._rejected_token: str | None = None
+        self._pool = channel_pool if channel_pool is not None else default_channel_pool()
+        self._channel_config = channel_config
+        self._policy = policy or DEFAULT_CALL_POLICY
+        self._recorder = recorder
+        # Leased on the first token fetch; see _stub().
+        self._channel: ChannelLease | None = None
+        self._client: auth_pb2_grpc.AuthStub | None = None
         self._token_cache: _CachedToken | None = None
+        self._refresh_ahead = refresh_ahead
+        self._background_refresh = background_refresh
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread: threading.Thread | None = None
+        self._stats_lock = threading.Lock()
+        self._stats = AuthStats()
+        self._closed = False
 
-    def _split_api_key(self, api_key: str) -> Tuple[str, str]:
-        parts = api_key.split(".")
-        if len(parts) != 2 or not parts[0] or not parts[1]:
-            raise ValueError(
-                "Invalid API key format. Expected format: 'key.value'.")
-        return parts[0], parts[1]
+    @property
+    def stats(self) -> AuthStats:
+        """Return a snapshot of the token cache counters."""
+
+        with self._stats_lock:
+            return dataclasses.replace(self._stats)
 
     def get_auth_header(self) -> Tuple[str, str]:
         """Return the Authorization header tuple expected by gRPC metadata."""
@@ -47,31 +128,145 @@ class Auth:
         return "authorization", f"Bearer {token}"
 
     def _get_token(self) -> str:
+        cached = self._token_cache
         now = time.time()
-        if self._token_cache and self._token_cache.expires_at - 5 > now:
-            return self._token_cache.value
+        if cached and cached.is_valid(now):
+            self._count("hits")
+            if self._background_refresh and cached.refresh_due(now, self._refresh_ahead):
+                self._start_background_refresh()
+            return cached.value
+
+        with self._refresh_lock:
+            # Another thread may have refreshed the token while we waited.
+            cached = self._token_cache
+            if cached and cached.is_valid(time.time()):
+                self._count("hits")
+                return cached.value
+
+            shared = self._load_shared(time.time(), background=False)
+            if shared:
+                self._count("store_hits")
+                return shared.value
+
+            self._count("misses")
+            return self._refresh().value
+
+    def _load_shared(self, now: float, *, background: bool) -> _CachedToken | None:
+        """Adopt a usable token from the token store, if there is one."""
 
+        if self._token_store is None:
+            return None
+        shared = self._token_store.load(self._store_key)
+        if (
+            not shared
+            or not shared.is_valid(now)
+            or shared.value == self._rejected_token
+            or (background and shared.refresh_due(now, self._refresh_ahead))
+        ):
+            return None
+        self._token_cache = shared
+        return shared
+
+    def _refresh(self, *, background: bool = False) -> _CachedToken:
+        """Fetch a new token; callers must hold ``_refresh_lock``."""
+
+        if self._token_store is None:
+            return self._fetch()
+
+        with self._token_store.lock(self._store_key):
+            # Another process may have refreshed while we waited for the lock.
+            shared = self._load_shared(time.time(), background=background)
+            if shared:
+                return shared
+            token = self._fetch()
+            self._token_store.save(self._store_key, token)
+            return token
+
+    def _stub(self) -> auth_pb2_grpc.AuthStub:
+        """Return the Auth stub, leasing a channel on first use.
+
+        Only called from ``_fetch``, which runs under ``_refresh_lock``.
+        """
+
+        if self._client is None:
+            if self._closed:
+                raise RuntimeError("Auth is closed")
+            self._channel = self._pool.acquire(self._host, self._channel_config)
+            interceptors: list[grpc.UnaryUnaryClientInterceptor] = [
+                _PolicyInterceptor(self._policy)]
+            if self._recorder is not None:
+                interceptors.insert(0, _MetricsInterceptor(self._recorder))
+            self._client = auth_pb2_grpc.AuthStub(
+                grpc.intercept_channel(self._channel, *interceptors))
+        return self._client
+
+    def _fetch(self) -> _CachedToken:
+        now = time.time()
+        start = time.perf_counter()
         request = auth_pb2.AuthRequest(apiKey=self._api_key)
-        response = self._client.GetJwtToken(request)
-        if not response or not response.token:
-            raise RuntimeError(
-                "Authentication failed: empty response from server")
+        try:
+            response = self._stub().GetJwtToken(request)
+            token = _token_from_response(response, now)
+        except Exception:
+            self._count("refresh_errors")
+            if self._recorder is not None:
+                self._recorder.record_token_refresh(time.perf_counter() - start, False)
+            raise
+        if self._recorder is not None:
+            self._recorder.record_token_refresh(time.perf_counter() - start, True)
+        self._token_cache = token
+        self._count("refreshes")
+        return token
+
+    def _start_background_refresh(self) -> None:
+        if self._closed or (self._refresh_thread and self._refresh_thread.is_alive()):
+            return
+        thread = threading.Thread(
+            target=self._refresh_in_background,
+            name="sendlix-auth-refresh",
+            daemon=True,
+        )
+        self._refresh_thread = thread
+        thread.start()
 
-        ttl_seconds = response.expires.seconds if response.HasField(
-            "expires") else 0
-        expires_at = now + ttl_seconds
-        self._token_cache = _CachedToken(response.token, expires_at)
-        return response.token
+    def _refresh_in_background(self) -> None:
+        # A foreground refresh already in progress makes this one redundant.
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            cached = self._token_cache
+            if cached and not cached.refresh_due(time.time(), self._refresh_ahead):
+                return
+            self._refresh(background=True)
+            self._count("background_refreshes")
+        except Exception:
+            # The current token is still valid; the next caller retries.
+            _logger.warning("Background token refresh failed", exc_info=True)
+        finally:
+            self._refresh_lock.release()
+
+    def _count(self, counter: str) -> None:
+        with self._stats_lock:
+            setattr(self._stats, counter, getattr(self._stats, counter) + 1)
+        if self._recorder is not None:
+            self._recorder.record_token_event(counter)
 
     def invalidate_cache(self) -> None:
         """Force fetching a new token on the next request."""
 
+        if self._token_cache:
+            self._rejected_token = self._token_cache.value
         self._token_cache = None
 
     def close(self) -> None:
-        """Dispose the gRPC channel."""
+        """Release the pooled gRPC channel."""
 
-        self._channel.close()
+        with self._refresh_lock:
+            self._closed = True
+            channel, self._channel = self._channel, None
+            self._client = None
+        if channel is not None:
+            channel.close()
 
     def __enter__(self) -> "Auth":
         return self
@@ -81,3 +276,35 @@ class Auth:
 
     def __repr__(self) -> str:  # pragma: no cover - debug helper
         return f"Auth(host={self._host!r}, token_cached={self._token_cache is not None})"
+
+
+def _split_api_key(api_key: str) -> Tuple[str, str]:
+    parts = api_key.split(".")
+    if len(parts) != 2 or not parts[0] or not parts[1]:
+        raise ValueError(
+            "Invalid API key format. Expected format: 'key.value'.")
+    return parts[0], parts[1]
+
+
+def _store_key(api_key: str, host: Hosts) -> str:
+    # Token stores may be readable by other local users; never use the secret
+    # itself as the storage key.
+    if isinstance(host, tuple):
+        host = ",".join(host)
+    digest = hashlib.sha256(f"{host}|{api_key}".encode("utf-8"))
+    return digest.hexdigest()[:20]
+
+
+def _build_api_key(api_key: str) -> auth_pb2.ApiKey:
+    secret, key_id = _split_api_key(api_key)
+    return auth_pb2.ApiKey(secret=secret, keyID=int(key_id))
+
+
+def _token_from_response(response: auth_pb2.AuthResponse, now: float) -> _CachedToken:
+    if not response or not response.token:
+        raise RuntimeError(
+            "Authentication failed: empty response from server")
+
+    ttl_seconds = response.expires.seconds if response.HasField(
+        "expires") else 0
+    return _CachedToken(response.token, now + ttl_seconds, now)
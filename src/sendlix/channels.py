@@ -0,0 +1,557 @@
+"""Shared, reference-counted gRPC channels for the Sendlix SDK.
+
+``Auth``, ``EmailClient`` and ``GroupClient`` all talk to the same host, so by
+default they lease their transport from one process-wide :class:`ChannelPool`
+instead of opening a TLS connection each. A list of hosts opens one channel
+per endpoint and balances calls across them; see :class:`HealthCheck`.
+"""
+
+from __future__ import annotations
+
+import collections
+import itertools
+import os
+import threading
+import time
+import weakref
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple, Union
+
+import grpc
+
+from ._compat import dataclass
+from .constants import API_HOST, USER_AGENT
+
+ChannelOption = Tuple[str, Any]
+Hosts = Union[str, Tuple[str, ...]]
+
+ROUND_ROBIN = "round_robin"
+LEAST_OUTSTANDING = "least_outstanding"
+
+_EJECTION_CODES = frozenset(
+    {grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED})
+
+
+@dataclass(frozen=True)
+class HealthCheck:
+    """When to take an endpoint out of rotation and how it comes back.
+
+    After ``failure_threshold`` consecutive calls to one endpoint end with one
+    of ``failure_codes``, the endpoint is ejected and receives no calls. Once
+    ``ejection_time`` seconds have passed, the endpoint is probed by waiting up
+    to ``probe_timeout`` seconds for its channel to connect. If the probe
+    succeeds, the endpoint rejoins the rotation. Otherwise it stays ejected,
+    and the wait doubles each time up to ``max_ejection_time``. If every
+    endpoint is ejected, calls are spread over all of them anyway.
+    """
+
+    failure_threshold: int = 5
+    failure_codes: FrozenSet[grpc.StatusCode] = _EJECTION_CODES
+    ejection_time: float = 10.0
+    max_ejection_time: float = 300.0
+    probe_timeout: float = 5.0
+
+    def __post_init__(self) -> None:
+        if self.failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        if self.ejection_time <= 0 or self.max_ejection_time < self.ejection_time:
+            raise ValueError("ejection_time must be positive and at most max_ejection_time")
+
+
+DEFAULT_HEALTH_CHECK = HealthCheck()
+
+
+@dataclass(frozen=True)
+class ChannelConfig:
+    """Connection settings that identify a pooled channel.
+
+    ``subchannels`` controls how many independent HTTP/2 connections are opened
+    for a host; calls are spread across them round-robin so a burst is not
+    capped by a single connection's concurrent stream limit. ``compression``
+    compresses every call on the channel; see :mod:`sendlix.compression` for
+    compressing only large requests. ``insecure`` disables TLS and is meant
+    for local test servers only.
+
+    ``load_balancing`` and ``health_check`` apply when a client is given
+    several hosts. ``"round_robin"`` takes endpoints in turn, and
+    ``"least_outstanding"`` picks the endpoint with the fewest calls in
+    flight, which steers traffic away from slow nodes.
+    """
+
+    subchannels: int = 1
+    keepalive_time_ms: Optional[int] = None
+    keepalive_timeout_ms: Optional[int] = None
+    keepalive_permit_without_calls: bool = False
+    options: Tuple[ChannelOption, ...] = ()
+    compression: Optional[grpc.Compression] = None
+    insecure: bool = False
+    load_balancing: str = ROUND_ROBIN
+    health_check: HealthCheck = DEFAULT_HEALTH_CHECK
+
+    def __post_init__(self) -> None:
+        if self.subchannels < 1:
+            raise ValueError("subchannels must be at least 1")
+        if self.load_balancing not in (ROUND_ROBIN, LEAST_OUTSTANDING):
+            raise ValueError(
+                f"load_balancing must be {ROUND_ROBIN!r} or {LEAST_OUTSTANDING!r}")
+
+    def channel_options(self) -> Tuple[ChannelOption, ...]:
+        """Return the gRPC channel arguments for this configuration."""
+
+        options: list[ChannelOption] = [("grpc.primary_user_agent", USER_AGENT)]
+        if self.keepalive_time_ms is not None:
+            options.append(("grpc.keepalive_time_ms", self.keepalive_time_ms))
+        if self.keepalive_timeout_ms is not None:
+            options.append(
+                ("grpc.keepalive_timeout_ms", self.keepalive_timeout_ms))
+        if self.keepalive_permit_without_calls:
+            options.append(("grpc.keepalive_permit_without_calls", 1))
+        if self.subchannels > 1:
+            # Channels with identical arguments share one global subchannel
+            # pool; a local pool gives every channel its own connection.
+            options.append(("grpc.use_local_subchannel_pool", 1))
+        options.extend(self.options)
+        return tuple(options)
+
+
+DEFAULT_CHANNEL_CONFIG = ChannelConfig()
+
+
+class _ClientCallDetails(
+    collections.namedtuple(
+        "_ClientCallDetails",
+        ("method", "timeout", "metadata", "credentials",
+         "wait_for_ready", "compression"),
+    ),
+    grpc.ClientCallDetails,
+):
+    pass
+
+
+def _replace_call_details(details: grpc.ClientCallDetails, **changes) -> _ClientCallDetails:
+    fields = {
+        name: getattr(details, name, None) for name in _ClientCallDetails._fields
+    }
+    fields.update(changes)
+    return _ClientCallDetails(**fields)
+
+
+class _RoundRobinMultiCallable:
+    """Dispatches each invocation to the next channel's multi-callable."""
+
+    def __init__(self, callables: Sequence[Any], counter: "itertools.count[int]") -> None:
+        self._callables = tuple(callables)
+        self._counter = counter
+
+    def _next(self) -> Any:
+        return self._callables[next(self._counter) % len(self._callables)]
+
+    def __call__(self, request, *args, **kwargs):
+        return self._next()(request, *args, **kwargs)
+
+    def with_call(self, request, *args, **kwargs):
+        return self._next().with_call(request, *args, **kwargs)
+
+    def future(self, request, *args, **kwargs):
+        return self._next().future(request, *args, **kwargs)
+
+
+class _RoundRobinChannel(grpc.Channel):
+    """A channel facade that spreads calls over several underlying channels."""
+
+    def __init__(self, channels: Sequence[grpc.Channel]) -> None:
+        self._channels = tuple(channels)
+        # Shared by every multi-callable so that calls to different methods
+        # also take turns.
+        self._counter = itertools.count()
+        self._callables: Dict[Any, Any] = {}
+
+    def _cached(self, key: Any, build) -> Any:
+        # Intercepted channels ask for a multi-callable on every call; reuse
+        # them rather than creating one per underlying channel each time.
+        multi_callable = self._callables.get(key)
+        if multi_callable is None:
+            multi_callable = self._callables.setdefault(key, build())
+        return multi_callable
+
+    def _multi_callable(self, factory: str, method: str, *args, **kwargs):
+        return self._cached(
+            (factory, method, args, tuple(sorted(kwargs.items()))),
+            lambda: _RoundRobinMultiCallable(
+                [getattr(channel, factory)(method, *args, **kwargs)
+                 for channel in self._channels],
+                self._counter,
+            ),
+        )
+
+    def unary_unary(self, method, *args, **kwargs):
+        return self._multi_callable("unary_unary", method, *args, **kwargs)
+
+    def unary_stream(self, method, *args, **kwargs):
+        return self._multi_callable("unary_stream", method, *args, **kwargs)
+
+    def stream_unary(self, method, *args, **kwargs):
+        return self._multi_callable("stream_unary", method, *args, **kwargs)
+
+    def stream_stream(self, method, *args, **kwargs):
+        return self._multi_callable("stream_stream", method, *args, **kwargs)
+
+    def subscribe(self, callback, try_to_connect=False):
+        for channel in self._channels:
+            channel.subscribe(callback, try_to_connect)
+
+    def unsubscribe(self, callback):
+        for channel in self._channels:
+            channel.unsubscribe(callback)
+
+    def close(self) -> None:
+        for channel in self._channels:
+            channel.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+class _Endpoint:
+    __slots__ = ("index", "host", "channel", "outstanding", "failures",
+                 "ejections", "ejected_until", "probing")
+
+    def __init__(self, index: int, host: str, channel: grpc.Channel) -> None:
+        self.index = index
+        self.host = host
+        self.channel = channel
+        self.outstanding = 0
+        self.failures = 0
+        self.ejections = 0
+        self.ejected_until: Optional[float] = None
+        self.probing = False
+
+
+@dataclass(frozen=True)
+class EndpointStatus:
+    """Snapshot of one endpoint of a multi-host channel."""
+
+    host: str
+    outstanding: int
+    consecutive_failures: int
+    ejected: bool
+
+
+class _BalancedMultiCallable:
+    """Sends each unary call to the endpoint picked by the balancer."""
+
+    def __init__(self, balancer: "_BalancedChannel", callables: Sequence[Any]) -> None:
+        self._balancer = balancer
+        self._callables = tuple(callables)
+
+    def _invoke(self, attribute: Optional[str], request, args, kwargs):
+        balancer = self._balancer
+        endpoint = balancer._pick()
+        target = self._callables[endpoint.index]
+        if attribute is not None:
+            target = getattr(target, attribute)
+        try:
+            result = target(request, *args, **kwargs)
+        except grpc.RpcError as exc:
+            code = exc.code() if hasattr(exc, "code") else None
+            balancer._finish(endpoint, code)
+            raise
+        except BaseException:
+            balancer._finish(endpoint, None)
+            raise
+        balancer._finish(endpoint, grpc.StatusCode.OK)
+        return result
+
+    def __call__(self, request, *args, **kwargs):
+        return self._invoke(None, request, args, kwargs)
+
+    def with_call(self, request, *args, **kwargs):
+        return self._invoke("with_call", request, args, kwargs)
+
+    def future(self, request, *args, **kwargs):
+        balancer = self._balancer
+        endpoint = balancer._pick()
+        try:
+            call = self._callables[endpoint.index].future(request, *args, **kwargs)
+        except BaseException:
+            balancer._finish(endpoint, None)
+            raise
+
+        def finished(call) -> None:
+            balancer._finish(endpoint, None if call.cancelled() else call.code())
+
+        call.add_done_callback(finished)
+        return call
+
+
+class _BalancedChannel(_RoundRobinChannel):
+    """A channel facade over one channel per host, with health-based ejection.
+
+    Unary-unary calls are balanced and tracked. The other call types are
+    spread round-robin across all endpoints.
+    """
+
+    def __init__(self, endpoints: Sequence[Tuple[str, grpc.Channel]], config: ChannelConfig) -> None:
+        super().__init__([channel for _, channel in endpoints])
+        self._endpoints = tuple(
+            _Endpoint(index, host, channel) for index, (host, channel) in enumerate(endpoints))
+        self._least_outstanding = config.load_balancing == LEAST_OUTSTANDING
+        self._health = config.health_check
+        self._lock = threading.Lock()
+
+    def unary_unary(self, method, *args, **kwargs):
+        return self._cached(
+            ("balanced", method, args, tuple(sorted(kwargs.items()))),
+            lambda: _BalancedMultiCallable(
+                self, [channel.unary_unary(method, *args, **kwargs)
+                       for channel in self._channels]),
+        )
+
+    def endpoint_status(self) -> List[EndpointStatus]:
+        with self._lock:
+            return [
+                EndpointStatus(endpoint.host, endpoint.outstanding, endpoint.failures,
+                               endpoint.ejected_until is not None)
+                for endpoint in self._endpoints
+            ]
+
+    def _pick(self) -> _Endpoint:
+        now = time.monotonic()
+        with self._lock:
+            candidates = []
+            for endpoint in self._endpoints:
+                if endpoint.ejected_until is None:
+                    candidates.append(endpoint)
+                elif not endpoint.probing and now >= endpoint.ejected_until:
+                    endpoint.probing = True
+                    threading.Thread(
+                        target=self._probe, args=(endpoint,),
+                        name="sendlix-health-probe", daemon=True,
+                    ).start()
+            if not candidates:
+                candidates = list(self._endpoints)
+            start = next(self._counter) % len(candidates)
+            if self._least_outstanding:
+                # Rotating the starting point spreads ties evenly.
+                rotated = candidates[start:] + candidates[:start]
+                endpoint = min(rotated, key=lambda candidate: candidate.outstanding)
+            else:
+                endpoint = candidates[start]
+            endpoint.outstanding += 1
+            return endpoint
+
+    def _finish(self, endpoint: _Endpoint, code: Optional[grpc.StatusCode]) -> None:
+        health = self._health
+        with self._lock:
+            endpoint.outstanding -= 1
+            if code is None or code == grpc.StatusCode.CANCELLED:
+                return
+            if code not in health.failure_codes:
+                endpoint.failures = 0
+                endpoint.ejections = 0
+                return
+            endpoint.failures += 1
+            if endpoint.ejected_until is None and endpoint.failures >= health.failure_threshold:
+                self._eject(endpoint)
+
+    def _eject(self, endpoint: _Endpoint) -> None:
+        health = self._health
+        delay = min(health.ejection_time * 2 ** endpoint.ejections, health.max_ejection_time)
+        endpoint.ejections += 1
+        endpoint.ejected_until = time.monotonic() + delay
+
+    def _probe(self, endpoint: _Endpoint) -> None:
+        try:
+            grpc.channel_ready_future(endpoint.channel).result(
+                timeout=self._health.probe_timeout)
+            healthy = True
+        except Exception:
+            healthy = False
+        with self._lock:
+            endpoint.probing = False
+            if healthy:
+                endpoint.ejected_until = None
+                endpoint.failures = 0
+            else:
+                self._eject(endpoint)
+
+
+class _PoolEntry:
+    __slots__ = ("channel", "refs")
+
+    def __init__(self, channel: grpc.Channel) -> None:
+        self.channel = channel
+        self.refs = 0
+
+
+class ChannelLease(grpc.Channel):
+    """A handle on a pooled channel; ``close()`` releases this reference only."""
+
+    def __init__(self, pool: "ChannelPool", key: Tuple[Hosts, ChannelConfig], entry: _PoolEntry) -> None:
+        self._pool = pool
+        self._key = key
+        self._entry = entry
+        self._channel = entry.channel
+        self._released = False
+
+    @property
+    def host(self) -> Hosts:
+        return self._key[0]
+
+    def endpoint_status(self) -> List[EndpointStatus]:
+        """Per-endpoint load and health; empty for a single-host channel."""
+
+        if isinstance(self._channel, _BalancedChannel):
+            return self._channel.endpoint_status()
+        return []
+
+    def unary_unary(self, method, *args, **kwargs):
+        return self._channel.unary_unary(method, *args, **kwargs)
+
+    def unary_stream(self, method, *args, **kwargs):
+        return self._channel.unary_stream(method, *args, **kwargs)
+
+    def stream_unary(self, method, *args, **kwargs):
+        return self._channel.stream_unary(method, *args, **kwargs)
+
+    def stream_stream(self, method, *args, **kwargs):
+        return self._channel.stream_stream(method, *args, **kwargs)
+
+    def subscribe(self, callback, try_to_connect=False):
+        self._channel.subscribe(callback, try_to_connect)
+
+    def unsubscribe(self, callback):
+        self._channel.unsubscribe(callback)
+
+    def close(self) -> None:
+        """Release the lease; the channel closes when its last lease does."""
+
+        if self._released:
+            return
+        self._released = True
+        self._pool._release(self._key, self._entry)
+
+    def __enter__(self) -> "ChannelLease":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+class ChannelPool:
+    """Registry of secure channels keyed by host(s) and :class:`ChannelConfig`."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[Hosts, ChannelConfig], _PoolEntry] = {}
+        _pools.add(self)
+
+    def _reset_after_fork(self) -> None:
+        # gRPC channels must not be used across fork(). Forget the parent's
+        # channels without closing them; the child opens its own on demand.
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def acquire(self, host: str | Sequence[str] = API_HOST,
+                config: ChannelConfig | None = None) -> ChannelLease:
+        """Lease the channel for ``host``/``config``, opening it on first use.
+
+        ``host`` may be a list of endpoints to balance calls across.
+        """
+
+        key = (normalize_hosts(host), config or DEFAULT_CHANNEL_CONFIG)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _PoolEntry(_open_channel(*key))
+                self._entries[key] = entry
+            entry.refs += 1
+            return ChannelLease(self, key, entry)
+
+    def _release(self, key: Tuple[Hosts, ChannelConfig], entry: _PoolEntry) -> None:
+        with self._lock:
+            if self._entries.get(key) is not entry:
+                # The pool was closed (or reset) since this lease was taken.
+                return
+            entry.refs -= 1
+            if entry.refs > 0:
+                return
+            del self._entries[key]
+        entry.channel.close()
+
+    def close(self) -> None:
+        """Close every pooled channel regardless of outstanding leases."""
+
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            entry.channel.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __repr__(self) -> str:  # pragma: no cover - debug helper
+        return f"ChannelPool(channels={len(self)})"
+
+
+def normalize_hosts(host: str | Sequence[str]) -> Hosts:
+    """Return ``host`` as a string, or as a tuple when it names several endpoints."""
+
+    if isinstance(host, str):
+        return host
+    hosts = tuple(dict.fromkeys(host))
+    if not hosts or not all(isinstance(item, str) and item for item in hosts):
+        raise ValueError("host must be a non-empty string or list of strings")
+    return hosts[0] if len(hosts) == 1 else hosts
+
+
+def _open_channel(host: Hosts, config: ChannelConfig) -> grpc.Channel:
+    if isinstance(host, tuple):
+        return _BalancedChannel(
+            [(endpoint, _open_endpoint(endpoint, config)) for endpoint in host], config)
+    return _open_endpoint(host, config)
+
+
+def _open_endpoint(host: str, config: ChannelConfig) -> grpc.Channel:
+    options = config.channel_options()
+    extra: Dict[str, Any] = {}
+    if config.compression is not None:
+        extra["compression"] = config.compression
+    if config.insecure:
+        channels = [
+            grpc.insecure_channel(host, options=options, **extra)
+            for _ in range(config.subchannels)
+        ]
+    else:
+        channels = [
+            grpc.secure_channel(host, grpc.ssl_channel_credentials(), options=options, **extra)
+            for _ in range(config.subchannels)
+        ]
+    if len(channels) == 1:
+        return channels[0]
+    return _RoundRobinChannel(channels)
+
+
+_pools: "weakref.WeakSet[ChannelPool]" = weakref.WeakSet()
+_default_pool = ChannelPool()
+
+
+def _after_fork_in_child() -> None:
+    for pool in list(_pools):
+        pool._reset_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def default_channel_pool() -> ChannelPool:
+    """Return the process-wide pool used when no pool is passed explicitly."""
+
+    return _default_pool
@@ -1,7 +1,41 @@
 """Client implementations for the Sendlix SDK."""
 
-from .email_client import EmailClient
-from .group_client import GroupClient
-from .client import Client
+from __future__ import annotations
 
-__all__ = ["Client", "EmailClient", "GroupClient"]
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ._helpers import AddressValidationError, set_email_data_cache_size
+    from .client import Client
+    from .email_client import EmailClient
+    from .group_client import GroupClient
+
+_LAZY_ATTRIBUTES = {
+    "AddressValidationError": "._helpers",
+    "Client": ".client",
+    "EmailClient": ".email_client",
+    "GroupClient": ".group_client",
+    "set_email_data_cache_size": "._helpers",
+}
+
+__all__ = [
+    "AddressValidationError",
+    "Client",
+    "EmailClient",
+    "GroupClient",
+    "set_email_data_cache_size",
+]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_LAZY_ATTRIBUTES})
@@ -0,0 +1,89 @@
+"""Small thread-safe caches used by the clients."""
+
+from __future__ import annotations
+
+import dataclasses
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Generic, Hashable, Optional, Tuple, TypeVar
+
+from .._compat import dataclass
+
+V = TypeVar("V")
+
+MISSING: Any = object()
+
+
+@dataclass(slots=True)
+class CacheStats:
+    """Counters reported by the client caches."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LRUCache(Generic[V]):
+    """Bounded least-recently-used cache with an optional time-to-live.
+
+    ``get`` returns :data:`MISSING` for absent or expired keys so that falsy
+    values such as ``False`` can be cached.
+    """
+
+    def __init__(self, max_entries: int, ttl: Optional[float] = None) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[V, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return dataclasses.replace(self._stats)
+
+    def get(self, key: Hashable) -> V:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self._stats.misses += 1
+                return MISSING
+            value, expires_at = item
+            if expires_at and expires_at <= time.monotonic():
+                del self._data[key]
+                self._stats.misses += 1
+                return MISSING
+            self._data.move_to_end(key)
+            self._stats.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        expires_at = time.monotonic() + self._ttl if self._ttl else 0.0
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self._max_entries:
+                self._data.popitem(last=False)
+                self._stats.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
@@ -0,0 +1,65 @@
+"""Bounded-concurrency helpers shared by the bulk client APIs."""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Iterable, Iterator, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def bounded_map(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    *,
+    concurrency: int,
+    ordered: bool = True,
+    thread_name_prefix: str = "sendlix",
+) -> Iterator[Tuple[int, T, "Future[R]"]]:
+    """Run ``fn`` over ``items`` on a thread pool, yielding finished futures.
+
+    At most ``concurrency`` items are pulled from ``items`` and in flight at
+    any time, so lazily generated inputs are consumed only as fast as results
+    are taken. Yields ``(index, item, future)``; with ``ordered=False`` results
+    are yielded as soon as they complete instead of in input order.
+    """
+
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    iterator = enumerate(items)
+    pending: Deque[Tuple[int, T, Future]] = deque()
+    executor = ThreadPoolExecutor(
+        max_workers=concurrency, thread_name_prefix=thread_name_prefix)
+    try:
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < concurrency:
+                try:
+                    index, item = next(iterator)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending.append((index, item, executor.submit(fn, item)))
+
+            if not pending:
+                return
+
+            if ordered:
+                entry = pending.popleft()
+                wait((entry[2],))
+                yield entry
+                continue
+
+            done, _ = wait([entry[2] for entry in pending],
+                           return_when=FIRST_COMPLETED)
+            for entry in [entry for entry in pending if entry[2] in done]:
+                pending.remove(entry)
+                yield entry
+    finally:
+        # Runs on exhaustion and when the consumer stops iterating early.
+        for _, _, future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
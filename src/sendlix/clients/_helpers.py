@@ -2,14 +2,18 @@
 
 from __future__ import annotations
 
+import functools
 import re
-from typing import TypedDict, Union
+from typing import Iterable, List, Optional, Sequence, Tuple, TypedDict, Union
 
-from .._compat import NotRequired
+from .._compat import NotRequired, dataclass
 from ..proto import EmailData_pb2
 
 _EMAIL_REGEX = re.compile(r"^[^\s@]+@[^\s@]+\.[^\s@]+$")
 
+# Number of distinct (email, name) pairs kept as prebuilt EmailData messages.
+EMAIL_DATA_CACHE_SIZE = 8192
+
 
 class EmailAddressDict(TypedDict, total=False):
     email: str
@@ -19,23 +23,148 @@ class EmailAddressDict(TypedDict, total=False):
 EmailAddress = Union[str, EmailAddressDict]
 
 
+class AddressValidationError(ValueError):
+    """Raised when one or more addresses in a batch are invalid.
+
+    ``invalid`` lists every offending entry as ``(field, index, value)``.
+    """
+
+    def __init__(self, invalid: Sequence[Tuple[str, int, object]]) -> None:
+        self.invalid = list(invalid)
+        shown = ", ".join(
+            f"{field}[{index}]={value!r}" if field else f"[{index}]={value!r}"
+            for field, index, value in self.invalid[:5]
+        )
+        more = f" (+{len(self.invalid) - 5} more)" if len(self.invalid) > 5 else ""
+        super().__init__(f"Invalid email address(es): {shown}{more}")
+
+    def __reduce__(self):
+        return type(self), (self.invalid,)
+
+
+@dataclass(slots=True)
+class Recipients:
+    """Validated recipient lists produced by :func:`build_recipients`."""
+
+    to: List[EmailData_pb2.EmailData]
+    cc: List[EmailData_pb2.EmailData]
+    bcc: List[EmailData_pb2.EmailData]
+
+
 def to_email_data(value: EmailAddress) -> EmailData_pb2.EmailData:
-    email = EmailData_pb2.EmailData()
-    if isinstance(value, str):
-        _validate_email(value)
-        email.email = value
+    """Validate an address and return a new ``EmailData`` message.
+
+    An ``EmailData`` passed in is validated and returned as is.
+    """
+
+    email = _email_data(value)
+    if email is value:
         return email
+    copy = EmailData_pb2.EmailData()
+    copy.CopyFrom(email)
+    return copy
+
+
+def set_email_data_cache_size(maxsize: int) -> None:
+    """Resize the cache of prebuilt ``EmailData`` messages; ``0`` disables it.
+
+    The cache is shared by every client in the process and is emptied by
+    resizing.
+    """
+
+    global _interned_email_data
+    if maxsize < 0:
+        raise ValueError("maxsize must not be negative")
+    _interned_email_data = functools.lru_cache(maxsize=maxsize)(_build_email_data)
+
+
+def _email_data(value: EmailAddress) -> EmailData_pb2.EmailData:
+    # Messages for recently used addresses are shared from the cache, so
+    # callers must copy (``CopyFrom``/``extend``) rather than mutate them.
+    if isinstance(value, str):
+        return _interned_email_data(value, None)
+    if isinstance(value, EmailData_pb2.EmailData):
+        _validate_email(value.email)
+        return value
 
     address = value.get("email")
     if not address:
         raise ValueError("Email record must include an 'email' value")
+    return _interned_email_data(address, value.get("name") or None)
+
+
+def _build_email_data(address: str, name: Optional[str]) -> EmailData_pb2.EmailData:
     _validate_email(address)
-    email.email = address
-    if value.get("name"):
-        email.name = value["name"]
+    email = EmailData_pb2.EmailData(email=address)
+    if name:
+        email.name = name
     return email
 
 
+_interned_email_data = functools.lru_cache(maxsize=EMAIL_DATA_CACHE_SIZE)(_build_email_data)
+
+
+def validate_addresses(
+    addresses: Iterable[EmailAddress],
+    *,
+    field: str = "",
+) -> List[EmailData_pb2.EmailData]:
+    """Validate a column of addresses, reporting every invalid index at once.
+
+    The returned messages may be shared with the address cache; copy them
+    before mutating.
+    """
+
+    built: List[EmailData_pb2.EmailData] = []
+    invalid: List[Tuple[str, int, object]] = []
+    for index, value in enumerate(addresses):
+        try:
+            built.append(_email_data(value))
+        except ValueError:
+            invalid.append((field, index, value))
+    if invalid:
+        raise AddressValidationError(invalid)
+    return built
+
+
+def build_recipients(
+    to: Iterable[EmailAddress] = (),
+    cc: Iterable[EmailAddress] = (),
+    bcc: Iterable[EmailAddress] = (),
+    *,
+    dedupe: bool = False,
+) -> Recipients:
+    """Validate ``to``/``cc``/``bcc`` together.
+
+    All invalid entries across the three lists are reported in a single
+    :class:`AddressValidationError`. With ``dedupe=True`` an address (compared
+    case-insensitively) is kept only in the first list it appears in, in
+    ``to``, ``cc``, ``bcc`` order. As with :func:`validate_addresses` the
+    messages may be shared.
+    """
+
+    columns = (("to", to), ("cc", cc), ("bcc", bcc))
+    built: dict = {"to": [], "cc": [], "bcc": []}
+    invalid: List[Tuple[str, int, object]] = []
+    seen = set()
+    for field, values in columns:
+        for index, value in enumerate(values):
+            try:
+                email = _email_data(value)
+            except ValueError:
+                invalid.append((field, index, value))
+                continue
+            if dedupe:
+                key = email.email.lower()
+                if key in seen:
+                    continue
+                seen.add(key)
+            built[field].append(email)
+    if invalid:
+        raise AddressValidationError(invalid)
+    return Recipients(built["to"], built["cc"], built["bcc"])
+
+
 def _validate_email(address: str) -> None:
     if not _EMAIL_REGEX.match(address):
         raise ValueError(f"Invalid email address format: {address}")
@@ -0,0 +1,45 @@
+"""Protobuf wire-format helpers for requests that are encoded by hand."""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+
+def encode_varint(value: int) -> bytes:
+    """Encode a non-negative integer as a protobuf base-128 varint."""
+
+    out = bytearray()
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def varint_size(value: int) -> int:
+    """Return the length of :func:`encode_varint` ``(value)`` without building it."""
+
+    size = 1
+    while value >= 0x80:
+        value >>= 7
+        size += 1
+    return size
+
+
+def decode_varint(buffer: bytes | bytearray | memoryview, offset: int) -> Tuple[int, int]:
+    """Decode the varint at ``offset``; return its value and the next offset.
+
+    ``buffer`` may be anything indexable by byte, such as an ``mmap``.
+    """
+
+    value = shift = 0
+    end = len(buffer)
+    while True:
+        if offset >= end:
+            raise ValueError("Truncated varint")
+        byte = buffer[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, offset
+        shift += 7
@@ -2,14 +2,30 @@
 
 from __future__ import annotations
 
-from typing import Protocol, Tuple, Type, TypeVar
+import contextlib
+import threading
+from concurrent.futures import CancelledError, Future
+from typing import Any, Callable, ContextManager, List, Optional, Protocol, Sequence, Tuple, Type, TypeVar
 
 import grpc
 
 from ..auth import Auth
-from ..constants import API_HOST, USER_AGENT
+from ..channels import (
+    ChannelConfig,
+    ChannelLease,
+    ChannelPool,
+    EndpointStatus,
+    _replace_call_details,
+    default_channel_pool,
+    normalize_hosts,
+)
+from ..compression import CompressionPolicy, CompressionStats, _CompressionInterceptor
+from ..constants import API_HOST
+from ..instrumentation import Recorder, _MetricsInterceptor
+from ..policy import DEFAULT_CALL_POLICY, CallPolicy, _nonblocking, _PolicyInterceptor
 
 TStub = TypeVar("TStub")
+R = TypeVar("R")
 
 
 class SupportsAuthHeader(Protocol):
@@ -19,18 +35,56 @@ class SupportsAuthHeader(Protocol):
         ...
 
 
+class _AuthMetadataInterceptor(grpc.UnaryUnaryClientInterceptor):
+    """Attaches the Authorization header to every outgoing unary call.
+
+    Auth is added per call rather than through channel credentials so that a
+    single pooled channel can serve ``Auth`` and any number of clients.
+    """
+
+    def __init__(self, auth: SupportsAuthHeader) -> None:
+        self._auth = auth
+
+    def intercept_unary_unary(self, continuation, client_call_details, request):
+        metadata = list(client_call_details.metadata or ())
+        metadata.append(self._auth.get_auth_header())
+        details = _replace_call_details(client_call_details, metadata=metadata)
+        return continuation(details, request)
+
+
 class Client:
-    """Base class that wires authentication metadata into a gRPC stub."""
+    """Base class that wires authentication metadata into a gRPC stub.
+
+    Every call goes through ``policy`` (a :class:`sendlix.policy.CallPolicy`),
+    which sets deadlines and handles retries, hedging and circuit breaking.
+    A ``recorder`` (see :mod:`sendlix.instrumentation`) receives per-call
+    metrics and client-side stage timings, and ``compression`` (a
+    :class:`sendlix.compression.CompressionPolicy`) compresses large requests.
+
+    The channel is leased and the stub created on first use, so constructing
+    a client does no network work. ``host`` may be a list of endpoints, in
+    which case calls are balanced across them as set by ``channel_config``.
+    """
 
     def __init__(
         self,
         auth: SupportsAuthHeader | str,
         stub_cls: Type[TStub],
         *,
-        host: str = API_HOST,
+        host: str | Sequence[str] = API_HOST,
+        channel_pool: ChannelPool | None = None,
+        channel_config: ChannelConfig | None = None,
+        policy: CallPolicy | None = None,
+        recorder: Recorder | None = None,
+        compression: CompressionPolicy | None = None,
     ) -> None:
+        pool = channel_pool if channel_pool is not None else default_channel_pool()
+        host = normalize_hosts(host)
+        self._owns_auth = isinstance(auth, str)
         if isinstance(auth, str):
-            auth = Auth(auth, host=host)
+            auth = Auth(auth, host=host, channel_pool=pool,
+                        channel_config=channel_config, policy=policy,
+                        recorder=recorder)
 
         if not hasattr(auth, "get_auth_header"):
             raise TypeError(
@@ -39,32 +93,138 @@ class Client:
         self._auth = auth
         self._host = host
 
-        metadata_credentials = grpc.metadata_call_credentials(
-            self._build_metadata_callback()
-        )
-        channel_credentials = grpc.composite_channel_credentials(
-            grpc.ssl_channel_credentials(),
-            metadata_credentials,
-        )
-        options = (("grpc.primary_user_agent", USER_AGENT),)
-        self._channel = grpc.secure_channel(
-            host, channel_credentials, options=options)
-        self.client: TStub = stub_cls(self._channel)
-
-    def _build_metadata_callback(self):  # type: ignore[override]
-        def callback(context, callback_func):
+        self._policy = policy or DEFAULT_CALL_POLICY
+        self._recorder = recorder
+        self._compression = (
+            _CompressionInterceptor(compression) if compression is not None else None)
+        self._pool = pool
+        self._channel_config = channel_config
+        self._stub_cls = stub_cls
+        self._connect_lock = threading.Lock()
+        self._channel: Optional[ChannelLease] = None
+        self._intercepted_channel: Optional[grpc.Channel] = None
+        self._stub: Optional[TStub] = None
+        self._closed = False
+
+    @property
+    def client(self) -> TStub:
+        """The generated gRPC stub, created on first access."""
+
+        stub = self._stub
+        if stub is None:
+            stub = self._connect()
+        return stub
+
+    @property
+    def _stub_channel(self) -> grpc.Channel:
+        """The channel with auth, metrics and policy interceptors applied."""
+
+        if self._intercepted_channel is None:
+            self._connect()
+        return self._intercepted_channel  # type: ignore[return-value]
+
+    def _connect(self) -> TStub:
+        with self._connect_lock:
+            if self._stub is not None:
+                return self._stub
+            if self._closed:
+                raise RuntimeError("Client is closed")
+            self._channel = self._pool.acquire(self._host, self._channel_config)
+            # The auth header is resolved once per call, outside the retry
+            # loop, so a failing token fetch is not retried a second time here.
+            interceptors: list[grpc.UnaryUnaryClientInterceptor] = [
+                _AuthMetadataInterceptor(self._auth)]
+            if self._recorder is not None:
+                interceptors.append(_MetricsInterceptor(self._recorder))
+            if self._compression is not None:
+                interceptors.append(self._compression)
+            interceptors.append(_PolicyInterceptor(self._policy))
+            self._intercepted_channel = grpc.intercept_channel(
+                self._channel, *interceptors)
+            self._stub = self._stub_cls(self._intercepted_channel)
+            return self._stub
+
+    @property
+    def compression_stats(self) -> Optional[CompressionStats]:
+        """Snapshot of the per-call compression counters, if enabled."""
+
+        if self._compression is None:
+            return None
+        return self._compression.stats
+
+    def endpoint_status(self) -> List[EndpointStatus]:
+        """Load and health of each endpoint when ``host`` lists several."""
+
+        channel = self._channel
+        return channel.endpoint_status() if channel is not None else []
+
+    def _future(
+        self,
+        rpc: Any,
+        request: Any,
+        transform: Callable[[Any], R],
+        *,
+        on_error: Optional[Callable[[BaseException], None]] = None,
+    ) -> "Future[R]":
+        """Start ``rpc`` with ``.future()`` and map its response with ``transform``.
+
+        Returns at once; retries run from completion callbacks. ``on_error``
+        is called with any error before the returned future fails with it.
+        Cancelling the returned future cancels the call.
+        """
+
+        future: "Future[R]" = Future()
+        try:
+            with _nonblocking():
+                call = rpc.future(request)
+        except Exception as exc:  # e.g. CircuitOpenError from the call policy
+            if on_error is not None:
+                on_error(exc)
+            future.set_running_or_notify_cancel()
+            future.set_exception(exc)
+            return future
+
+        def complete(call: Any) -> None:
+            if not future.set_running_or_notify_cancel():
+                if on_error is not None:
+                    on_error(CancelledError())
+                return
             try:
-                header_name, header_value = self._auth.get_auth_header()
-                callback_func(((header_name, header_value),), None)
-            except Exception as exc:  # pragma: no cover - exercised via client calls
-                callback_func((), exc)
-
-        return callback
+                if call.cancelled():
+                    raise CancelledError()
+                value = transform(call.result())
+            except BaseException as exc:
+                if on_error is not None:
+                    on_error(exc)
+                future.set_exception(exc)
+            else:
+                future.set_result(value)
+
+        def propagate_cancel(done: "Future[R]") -> None:
+            if done.cancelled():
+                call.cancel()
+
+        future.add_done_callback(propagate_cancel)
+        call.add_done_callback(complete)
+        return future
+
+    def _stage(self, stage: str) -> ContextManager[None]:
+        if self._recorder is None:
+            return contextlib.nullcontext()
+        return self._recorder.span(stage)
 
     def close(self) -> None:
-        """Close the underlying gRPC channel."""
-
-        self._channel.close()
+        """Release the pooled gRPC channel and any ``Auth`` created for it."""
+
+        with self._connect_lock:
+            self._closed = True
+            channel, self._channel = self._channel, None
+            self._stub = None
+            self._intercepted_channel = None
+        if channel is not None:
+            channel.close()
+        if self._owns_auth:
+            self._auth.close()  # type: ignore[attr-defined]
 
     def __enter__(self) -> Client:
         return self
@@ -0,0 +1,102 @@
+"""Content-addressed cache for built ``MailContent`` messages."""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Tuple, TypeVar
+
+from google.protobuf.message import Message
+
+from ._cache import CacheStats
+
+TMessage = TypeVar("TMessage", bound=Message)
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Longer bodies and image data are keyed by digest instead of by value.
+_INLINE_KEY_LENGTH = 256
+
+
+class ContentCache:
+    """Bounded LRU cache of built content messages, keyed by their inputs.
+
+    Logos, banners and bodies that repeat across many mails are converted
+    and copied into protobuf once. Entries are evicted least-recently-used
+    first once the serialized size of all cached messages exceeds
+    ``max_bytes``. Cached messages are shared and must not be mutated.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, max_entries: int = 10_000) -> None:
+        if max_bytes < 1 or max_entries < 1:
+            raise ValueError("max_bytes and max_entries must be positive")
+        self._max_bytes = max_bytes
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[Message, int]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return dataclasses.replace(self._stats)
+
+    @property
+    def size_bytes(self) -> int:
+        with self._lock:
+            return self._size
+
+    def get_or_build(self, key: Hashable, build: Callable[[], TMessage]) -> TMessage:
+        """Return the cached message for ``key``, building it on a miss."""
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats.hits += 1
+                return entry[0]  # type: ignore[return-value]
+            self._stats.misses += 1
+
+        message = build()
+        size = message.ByteSize()
+        if size > self._max_bytes:
+            return message
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous[1]
+            self._entries[key] = (message, size)
+            self._size += size
+            while self._size > self._max_bytes or len(self._entries) > self._max_entries:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+                self._stats.evictions += 1
+        return message
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+def data_key(data: Any) -> Hashable:
+    """Return a content key for a body or image data.
+
+    Short ``str`` and ``bytes`` values are their own key. Longer values and
+    mutable buffers are reduced to a BLAKE2 digest, so keys stay small next
+    to the messages that ``max_bytes`` accounts for.
+    """
+
+    if isinstance(data, (str, bytes)) and len(data) <= _INLINE_KEY_LENGTH:
+        return data
+    if isinstance(data, str):
+        data = data.encode("utf-8", "surrogatepass")
+    return ("blake2b", hashlib.blake2b(data, digest_size=16).digest())
@@ -2,16 +2,35 @@
 
 from __future__ import annotations
 
+import abc
+import collections
+import contextlib
+import mmap
+import os
+import queue
 import re
+import threading
+from concurrent.futures import Future
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterable, MutableMapping, Sequence, TypedDict
-from .._compat import NotRequired
+from types import MappingProxyType
+from typing import Any, Iterable, Iterator, Mapping, MutableMapping, Optional, Sequence, TypedDict, Union
+from .._compat import NotRequired, dataclass
 
+from google.protobuf.message import Message
 from google.protobuf.timestamp_pb2 import Timestamp
 
 from ..proto import email_pb2, email_pb2_grpc
-from ._helpers import EmailAddress, EmailAddressDict, to_email_data
+from ..rate_limit import RateLimiter
+from ._concurrency import bounded_map
+from .content_cache import ContentCache, data_key
+from ._helpers import (
+    EmailAddress,
+    EmailAddressDict,
+    _email_data,
+    build_recipients,
+)
+from ._wire import encode_varint, varint_size
 from .client import Client, SupportsAuthHeader
 
 
@@ -46,6 +65,7 @@ MailOptions = TypedDict(
         "text": str,
         "tracking": bool,
         "images": Sequence[ImageConfig],
+        "dedupeRecipients": bool,
     },
     total=False,
 )
@@ -67,93 +87,849 @@ GroupMailOptions = TypedDict(
 )
 
 
+EmlSource = Union[str, Path, bytes, bytearray, memoryview, mmap.mmap]
+
+
+@dataclass(slots=True)
+class SendResult:
+    """Outcome of one message sent through :meth:`EmailClient.send_many`."""
+
+    index: int
+    mail_options: MailOptions
+    message_ids: list[str]
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+DEFAULT_MAX_REQUEST_BYTES = 4 * 1024 * 1024  # gRPC's default receive limit
+
+
+class PartialSendError(RuntimeError):
+    """Some, but not all, of the requests of a split send failed.
+
+    ``message_ids`` holds the IDs of the requests that were accepted and
+    ``errors`` the exception of each failed request.
+    """
+
+    def __init__(self, message_ids: list[str], errors: list[BaseException]) -> None:
+        super().__init__(
+            f"{len(errors)} of the split requests failed: {errors[0]}")
+        self.message_ids = message_ids
+        self.errors = errors
+
+
+@dataclass(frozen=True)
+class RecipientSplitting:
+    """Split sends whose request would be too large into several requests.
+
+    A ``SendMailRequest`` larger than ``max_request_bytes`` or with more than
+    ``max_recipients`` recipients is sent as several requests that share the
+    serialized content and each carry a slice of the recipients, with up to
+    ``concurrency`` in flight. Every recipient still gets exactly one copy,
+    but recipients in different requests do not see each other in
+    ``To``/``Cc``. Each request carries at least one ``to`` recipient, so a
+    split that would need more requests than there are ``to`` recipients
+    raises :class:`ValueError`.
+
+    Splitting applies to :meth:`EmailClient.send_email` and
+    :meth:`EmailClient.send_email_future`. Requests that were serialized in
+    advance, such as outbox entries, pipeline output or replayed request
+    files, are sent as they are.
+    """
+
+    max_request_bytes: int = DEFAULT_MAX_REQUEST_BYTES
+    max_recipients: Optional[int] = None
+    concurrency: int = 8
+
+    def __post_init__(self) -> None:
+        if self.max_recipients is not None and self.max_recipients < 1:
+            raise ValueError("max_recipients must be at least 1")
+        if self.concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+    def split(self, request: email_pb2.SendMailRequest) -> Optional[list[bytes]]:
+        """Return the serialized requests to send, or ``None`` if no split is needed."""
+
+        parts = self._split(request)
+        return None if parts is None else [payload for payload, _ in parts]
+
+    def _split(self, request: email_pb2.SendMailRequest) -> Optional[list[tuple[bytes, int]]]:
+        # Like split(), with the number of recipients in each request.
+        recipients = [
+            (name, email)
+            for name in ("to", "cc", "bcc")
+            for email in getattr(request, name)
+        ]
+        limit = self.max_recipients or len(recipients)
+        if len(recipients) <= limit and request.ByteSize() <= self.max_request_bytes:
+            return None
+
+        shared_request = email_pb2.SendMailRequest()
+        shared_request.CopyFrom(request)
+        for name in ("to", "cc", "bcc"):
+            del getattr(shared_request, name)[:]
+        shared = shared_request.SerializeToString()
+        budget = self.max_request_bytes - len(shared)
+
+        def entry_size(email: Any) -> int:
+            # One tag byte, the length prefix and the EmailData itself.
+            size = email.ByteSize()
+            size += 1 + varint_size(size)
+            if size > budget:
+                raise ValueError(
+                    f"Mail content ({len(shared)} bytes) is too large to send "
+                    f"within {self.max_request_bytes} bytes")
+            return size
+
+        # Every request needs a ``to`` recipient. Each batch therefore starts
+        # with one and is topped up with cc/bcc first, so that ``to``
+        # recipients last for as many batches as possible.
+        to = collections.deque(request.to)
+        others = collections.deque(
+            (name, email) for name in ("cc", "bcc") for email in getattr(request, name))
+        batches: list[dict] = []
+        while to or others:
+            if not to:
+                raise ValueError(
+                    f"Cannot split {len(recipients)} recipients into requests that "
+                    f"each have a 'to' recipient; {len(request.to)} 'to' "
+                    "recipient(s) are not enough for the size and recipient limits")
+            email = to.popleft()
+            batch: dict = {"to": [email], "cc": [], "bcc": []}
+            size, count = entry_size(email), 1
+            while count < limit and (others or to):
+                name, email = others[0] if others else ("to", to[0])
+                email_size = entry_size(email)
+                if size + email_size > budget:
+                    break
+                (others if name != "to" else to).popleft()
+                batch[name].append(email)
+                size += email_size
+                count += 1
+            batches.append(batch)
+        return [
+            (shared + email_pb2.SendMailRequest(**recipients).SerializeToString(),
+             sum(map(len, recipients.values())))
+            for recipients in batches
+        ]
+
+
+_EMAIL_SERVICE = "/sendlix.api.v1.Email/"
+
+
+class _RawEmailStub:
+    """EmailStub counterpart whose methods take pre-serialized request bytes."""
+
+    def __init__(self, channel) -> None:
+        def raw(method: str):
+            return channel.unary_unary(
+                _EMAIL_SERVICE + method,
+                request_serializer=None,
+                response_deserializer=email_pb2.SendEmailResponse.FromString,
+            )
+
+        self.SendEmail = raw("SendEmail")
+        self.SendEmlEmail = raw("SendEmlEmail")
+        self.SendGroupEmail = raw("SendGroupEmail")
+
+
+class MailTemplate:
+    """The recipient-independent part of a ``SendMailRequest``, built once.
+
+    Sender, subject, content, images, reply-to and additional infos (plus any
+    ``to``/``cc``/``bcc`` shared by every send) are validated and serialized at
+    construction. :meth:`render` serializes only the per-recipient fields and
+    appends them: protobuf merges concatenated messages, so the result is a
+    complete ``SendMailRequest``.
+    """
+
+    __slots__ = ("_shared", "_has_to", "_dedupe", "_shared_recipients")
+
+    def __init__(
+        self,
+        mail_options: MailOptions,
+        additional_options: AdditionalEmailOptions | None = None,
+    ) -> None:
+        _validate_mail_options(mail_options, ("from", "subject"))
+        request = _populate_send_mail_request(
+            email_pb2.SendMailRequest(), mail_options, additional_options)
+        self._shared = request.SerializeToString()
+        self._has_to = bool(mail_options.get("to"))
+        self._dedupe = bool(mail_options.get("dedupeRecipients"))
+        self._shared_recipients = _recipient_count(request)
+
+    @property
+    def shared_bytes(self) -> bytes:
+        return self._shared
+
+    def render(
+        self,
+        to: EmailAddress | Sequence[EmailAddress] = (),
+        cc: EmailAddress | Sequence[EmailAddress] = (),
+        bcc: EmailAddress | Sequence[EmailAddress] = (),
+    ) -> bytes:
+        """Return the serialized ``SendMailRequest`` for these recipients."""
+
+        return self._render(to, cc, bcc)[0]
+
+    def _render(
+        self,
+        to: EmailAddress | Sequence[EmailAddress],
+        cc: EmailAddress | Sequence[EmailAddress],
+        bcc: EmailAddress | Sequence[EmailAddress],
+    ) -> tuple[bytes, int]:
+        # Like render(), with the number of recipients in the request.
+        to, cc, bcc = _as_addresses(to), _as_addresses(cc), _as_addresses(bcc)
+        if not to and not self._has_to:
+            raise ValueError(
+                "Missing required mail_options field(s): to")
+        built = build_recipients(to, cc, bcc, dedupe=self._dedupe)
+        recipients = email_pb2.SendMailRequest(
+            to=built.to, cc=built.cc, bcc=built.bcc)
+        count = self._shared_recipients + len(built.to) + len(built.cc) + len(built.bcc)
+        return self._shared + recipients.SerializeToString(), count
+
+    def build(
+        self,
+        to: EmailAddress | Sequence[EmailAddress] = (),
+        cc: EmailAddress | Sequence[EmailAddress] = (),
+        bcc: EmailAddress | Sequence[EmailAddress] = (),
+    ) -> email_pb2.SendMailRequest:
+        """Return the rendered request as a message, e.g. for inspection."""
+
+        return email_pb2.SendMailRequest.FromString(self.render(to, cc, bcc))
+
+
+def _freeze(value: Any) -> Any:
+    """Return a deep, read-only copy of mail options."""
+
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (bytearray, memoryview)):
+        return bytes(value)
+    if isinstance(value, Message):
+        copy = type(value)()
+        copy.CopyFrom(value)
+        return copy
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Undo :func:`_freeze` so that options can be pickled."""
+
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+class _PreparedMail(abc.ABC):
+    """Immutable mail whose serialized request is built on first use."""
+
+    __slots__ = ("_options", "_additional", "_payload", "_recipients")
+
+    _message_type: Any = None
+
+    def __init__(self, options: Mapping[str, Any], additional: Mapping[str, Any] | None) -> None:
+        object.__setattr__(self, "_options", _freeze(options))
+        object.__setattr__(
+            self, "_additional", _freeze(additional) if additional else None)
+        object.__setattr__(self, "_payload", None)
+        object.__setattr__(self, "_recipients", None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        additional = _thaw(self._additional) if self._additional else None
+        return type(self)._restore, (_thaw(self._options), additional, self._payload)
+
+    @classmethod
+    def _restore(cls, options, additional, payload):
+        mail = cls.__new__(cls)
+        _PreparedMail.__init__(mail, options, additional)
+        object.__setattr__(mail, "_payload", payload)
+        return mail
+
+    @property
+    def options(self) -> Mapping[str, Any]:
+        return self._options
+
+    @abc.abstractmethod
+    def _build(self) -> Any:
+        """Build the request message from the frozen options."""
+
+    def build(self) -> Any:
+        """Return the request message, parsed from the cached bytes."""
+
+        return self._message_type.FromString(self.serialize())
+
+    def serialize(self) -> bytes:
+        """Return the serialized request, building it on the first call."""
+
+        payload = self._payload
+        if payload is None:
+            payload = self._build().SerializeToString()
+            object.__setattr__(self, "_payload", payload)
+        return payload
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.serialize() == other.serialize()  # type: ignore[attr-defined]
+
+    def __hash__(self) -> int:
+        return hash(self.serialize())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(subject={self._options.get('subject')!r})"
+
+
+class Mail(_PreparedMail):
+    """A validated, immutable :data:`MailOptions` for :meth:`EmailClient.send_email`.
+
+    Options, addresses, images and additional options are validated once
+    here, and a deep read-only copy is kept, so later changes to the dicts
+    passed in do not affect the mail. The ``SendMailRequest`` is built and
+    serialized on first send and its bytes are reused for every later send,
+    retry or outbox entry of the same ``Mail``.
+    """
+
+    __slots__ = ()
+    _message_type = email_pb2.SendMailRequest
+
+    def __init__(
+        self,
+        mail_options: MailOptions,
+        additional_options: AdditionalEmailOptions | None = None,
+    ) -> None:
+        _validate_mail_options(mail_options)
+        built = build_recipients(
+            mail_options.get("to") or (),
+            mail_options.get("cc") or (),
+            mail_options.get("bcc") or (),
+            dedupe=bool(mail_options.get("dedupeRecipients")),
+        )
+        if mail_options.get("replyTo"):
+            _email_data(mail_options["replyTo"])
+        _validate_content(mail_options)
+        if additional_options:
+            _build_additional_infos(additional_options)
+        super().__init__(mail_options, additional_options)
+        object.__setattr__(
+            self, "_recipients", len(built.to) + len(built.cc) + len(built.bcc))
+
+    def _recipient_count(self) -> int:
+        """Number of recipients, counted once from the frozen options."""
+
+        count = self._recipients
+        if count is None:
+            options = self._options
+            built = build_recipients(
+                options.get("to") or (),
+                options.get("cc") or (),
+                options.get("bcc") or (),
+                dedupe=bool(options.get("dedupeRecipients")),
+            )
+            count = len(built.to) + len(built.cc) + len(built.bcc)
+            object.__setattr__(self, "_recipients", count)
+        return count
+
+    def _build(self) -> email_pb2.SendMailRequest:
+        return _populate_send_mail_request(
+            email_pb2.SendMailRequest(), self._options,  # type: ignore[arg-type]
+            self._additional)  # type: ignore[arg-type]
+
+
+class GroupMail(_PreparedMail):
+    """A validated, immutable :data:`GroupMailOptions` for :meth:`EmailClient.send_group_email`."""
+
+    __slots__ = ()
+    _message_type = email_pb2.GroupMailData
+
+    def __init__(self, group_mail: GroupMailOptions) -> None:
+        _validate_group_mail(group_mail)
+        _validate_content(group_mail)
+        super().__init__(group_mail, None)
+
+    def _build(self) -> email_pb2.GroupMailData:
+        return _build_group_mail_request(self._options)  # type: ignore[arg-type]
+
+
 class EmailClient(Client):
-    """Client for interacting with the Sendlix email gRPC service."""
+    """Client for interacting with the Sendlix email gRPC service.
+
+    Pass a :class:`sendlix.rate_limit.RateLimiter` as ``rate_limiter`` to pace
+    sends and stop before the account's quota runs out, and a
+    :class:`RecipientSplitting` as ``split_recipients`` to split oversized
+    :meth:`send_email` requests.
+    """
+
+    def __init__(
+        self,
+        auth: SupportsAuthHeader | str,
+        *,
+        content_cache: ContentCache | None = None,
+        rate_limiter: RateLimiter | None = None,
+        split_recipients: RecipientSplitting | None = None,
+        **options: Any,
+    ) -> None:
+        super().__init__(auth, email_pb2_grpc.EmailStub, **options)
+        self._raw_stub: _RawEmailStub | None = None
+        self._content_cache = content_cache
+        self._rate_limiter = rate_limiter
+        self._split_recipients = split_recipients
+        self._emails_left: int | None = None
+
+    @property
+    def content_cache(self) -> ContentCache | None:
+        return self._content_cache
+
+    @property
+    def rate_limiter(self) -> RateLimiter | None:
+        return self._rate_limiter
+
+    @property
+    def emails_left(self) -> int | None:
+        """Remaining quota reported by the most recent send, if any."""
+
+        return self._emails_left
+
+    def _message_call(self, method: str, request: Any) -> tuple[Any, Any]:
+        if self._recorder is None:
+            return getattr(self.client, method), request
+        # Serialize up front so the time shows up as its own stage rather
+        # than inside the RPC latency.
+        with self._stage("serialize"):
+            payload = request.SerializeToString()
+        return getattr(self._raw_client, method), payload
+
+    def _send_message(self, method: str, request: Any) -> list[str]:
+        emails = _recipient_count(request) if method == "SendEmail" else 1
+        return self._send(*self._message_call(method, request), emails=emails)
+
+    def _send(self, rpc: Any, request: Any, metadata: Any = None, *, emails: int = 1) -> list[str]:
+        self._acquire(emails)
+        response = rpc(request, metadata=metadata) if metadata else rpc(request)
+        return self._handle_response(response)
 
-    def __init__(self, auth: SupportsAuthHeader | str) -> None:
-        super().__init__(auth, email_pb2_grpc.EmailStub)
+    def _send_future(self, rpc: Any, request: Any, *, emails: int = 1) -> "Future[list[str]]":
+        self._acquire(emails)
+        return self._future(rpc, request, self._handle_response)
+
+    def _acquire(self, emails: int) -> None:
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire(emails=emails)
+
+    def _emails_in(self, method: str, payload: bytes) -> int:
+        """Recipients in a serialized request whose count was not kept.
+
+        Parses the payload, so it is only done when a rate limiter needs it.
+        """
+
+        if self._rate_limiter is None or method != "SendEmail":
+            return 1
+        return _recipient_count(email_pb2.SendMailRequest.FromString(payload))
+
+    def _handle_response(self, response: email_pb2.SendEmailResponse) -> list[str]:
+        self._emails_left = response.emailsLeft
+        if self._rate_limiter is not None:
+            self._rate_limiter.update_quota(response.emailsLeft)
+        return list(response.message)
+
+    def _send_serialized(
+        self,
+        method: str,
+        payload: bytes,
+        metadata: Any = None,
+        *,
+        emails: Optional[int] = None,
+    ) -> list[str]:
+        """Send an already serialized request, e.g. one stored by an outbox.
+
+        ``emails`` is the number of recipients, stored with the request.
+        """
+
+        if emails is None:
+            emails = self._emails_in(method, payload)
+        return self._send(getattr(self._raw_client, method), payload, metadata, emails=emails)
+
+    @property
+    def _raw_client(self) -> _RawEmailStub:
+        if self._raw_stub is None:
+            self._raw_stub = _RawEmailStub(self._stub_channel)
+        return self._raw_stub
 
     def send_email(
         self,
-        mail_options: MailOptions,
+        mail_options: MailOptions | Mail,
         additional_options: AdditionalEmailOptions | None = None,
     ) -> list[str]:
-        self._validate_mail_options(mail_options)
-
-        request = email_pb2.SendMailRequest()
-        getattr(request, "from").CopyFrom(to_email_data(mail_options["from"]))
-        request.to.extend(to_email_data(entry) for entry in mail_options["to"])
-        request.subject = mail_options["subject"]
-        request.TextContent.CopyFrom(_build_mail_content(mail_options))
-
-        if mail_options.get("cc"):
-            request.cc.extend(to_email_data(addr)
-                              for addr in mail_options["cc"])
-        if mail_options.get("bcc"):
-            request.bcc.extend(to_email_data(addr)
-                               for addr in mail_options["bcc"])
-        if mail_options.get("replyTo"):
-            request.reply_to.CopyFrom(to_email_data(mail_options["replyTo"]))
+        if isinstance(mail_options, Mail):
+            payload = self._mail_payload(mail_options, additional_options)
+            parts = self._split(mail_options)
+            if parts is not None:
+                return self._send_split(parts)
+            return self._send(self._raw_client.SendEmail, payload,
+                              emails=mail_options._recipient_count())
+
+        with self._stage("validate"):
+            _validate_mail_options(mail_options)
+        with self._stage("build"):
+            request = _populate_send_mail_request(
+                email_pb2.SendMailRequest(), mail_options,
+                additional_options, self._content_cache)
+        parts = self._split(request)
+        if parts is not None:
+            return self._send_split(parts)
+        return self._send_message("SendEmail", request)
 
+    def _split(self, request: email_pb2.SendMailRequest | Mail) -> Optional[list[tuple[bytes, int]]]:
+        if self._split_recipients is None:
+            return None
+        with self._stage("split"):
+            if isinstance(request, Mail):
+                request = request.build()
+            return self._split_recipients._split(request)
+
+    def _mail_payload(self, mail: _PreparedMail, additional_options: Any = None) -> bytes:
         if additional_options:
-            request.additionalInfos.CopyFrom(
-                _build_additional_infos(additional_options))
+            raise TypeError(
+                f"additional_options cannot be combined with a {type(mail).__name__}; "
+                "pass them to its constructor")
+        with self._stage("serialize"):
+            return mail.serialize()
 
-        response = self.client.SendEmail(request)
-        return list(response.message)
+    def _send_split(self, parts: Sequence[tuple[bytes, int]]) -> list[str]:
+        """Send split requests, ``concurrency`` at a time, and merge the IDs.
+
+        Runs on the calling thread; the done-callbacks only queue results, so
+        rate limiting never blocks a gRPC callback thread.
+        """
+
+        window = self._split_recipients.concurrency  # type: ignore[union-attr]
+        done: "queue.SimpleQueue[tuple[int, Future]]" = queue.SimpleQueue()
+        outcomes: list[Any] = [None] * len(parts)
+        in_flight = started = 0
+        while started < len(parts) or in_flight:
+            while in_flight < window and started < len(parts):
+                index = started
+                started += 1
+                payload, emails = parts[index]
+                try:
+                    call = self._send_future(self._raw_client.SendEmail, payload, emails=emails)
+                except Exception as exc:  # e.g. QuotaExhaustedError or CircuitOpenError
+                    # The rest would fail the same way; report them unsent.
+                    outcomes[index:] = [exc] * (len(parts) - index)
+                    started = len(parts)
+                    break
+                in_flight += 1
+                call.add_done_callback(lambda call, index=index: done.put((index, call)))
+            if in_flight:
+                index, call = done.get()
+                in_flight -= 1
+                error = call.exception()
+                outcomes[index] = call.result() if error is None else error
+        return _merge_split(outcomes)
+
+    def _send_split_future(self, parts: Sequence[tuple[bytes, int]]) -> "Future[list[str]]":
+        """Non-blocking :meth:`_send_split`, driven from its own thread."""
+
+        result: "Future[list[str]]" = Future()
+        result.set_running_or_notify_cancel()
+
+        def drive() -> None:
+            try:
+                result.set_result(self._send_split(parts))
+            except BaseException as exc:
+                result.set_exception(exc)
+
+        threading.Thread(target=drive, name="sendlix-split", daemon=True).start()
+        return result
 
     def send_eml_email(
         self,
-        eml: str | Path | bytes | bytearray | memoryview,
+        eml: EmlSource,
         additional_options: AdditionalEmailOptions | None = None,
     ) -> list[str]:
-        raw_bytes = _coerce_eml_bytes(eml)
-        request = email_pb2.EmlMailRequest(mail=raw_bytes)
-        if additional_options:
-            request.additionalInfos.CopyFrom(
-                _build_additional_infos(additional_options))
+        """Send a raw EML message from a path, bytes-like object or ``mmap``.
 
-        response = self.client.SendEmlEmail(request)
-        return list(response.message)
+        Files are memory-mapped and the request is encoded directly around
+        the mapped buffer, so the message body is copied only once.
+        """
 
-    def send_group_email(self, group_mail: GroupMailOptions) -> list[str]:
-        required = ("from", "groupId", "subject")
-        missing = [field for field in required if not group_mail.get(field)]
-        if missing:
-            raise ValueError(
-                f"Missing required group_mail field(s): {', '.join(missing)}")
+        with self._stage("serialize"):
+            payload = _serialize_eml_request(eml, additional_options)
+        return self._send(self._raw_client.SendEmlEmail, payload)
 
-        request = email_pb2.GroupMailData(
-            groupId=group_mail["groupId"],
-            subject=group_mail["subject"],
-        )
-        getattr(request, "from").CopyFrom(to_email_data(group_mail["from"]))
-        request.TextContent.CopyFrom(_build_mail_content(group_mail))
+    def send_group_email(self, group_mail: GroupMailOptions | GroupMail) -> list[str]:
+        if isinstance(group_mail, GroupMail):
+            return self._send(self._raw_client.SendGroupEmail, self._mail_payload(group_mail))
+        with self._stage("build"):
+            request = _build_group_mail_request(group_mail, self._content_cache)
+        return self._send_message("SendGroupEmail", request)
 
-        if group_mail.get("category"):
-            request.category = group_mail["category"]
+    def compile_template(
+        self,
+        mail_options: MailOptions,
+        additional_options: AdditionalEmailOptions | None = None,
+    ) -> MailTemplate:
+        """Validate and serialize the shared parts of a mail for fan-out sends."""
 
-        response = self.client.SendGroupEmail(request)
-        return list(response.message)
+        return MailTemplate(mail_options, additional_options)
+
+    def send_template(
+        self,
+        template: MailTemplate,
+        to: EmailAddress | Sequence[EmailAddress] = (),
+        cc: EmailAddress | Sequence[EmailAddress] = (),
+        bcc: EmailAddress | Sequence[EmailAddress] = (),
+    ) -> list[str]:
+        """Send a compiled template to the given recipients."""
+
+        with self._stage("serialize"):
+            payload, emails = template._render(to, cc, bcc)
+        return self._send(self._raw_client.SendEmail, payload, emails=emails)
+
+    def send_email_future(
+        self,
+        mail_options: MailOptions | Mail,
+        additional_options: AdditionalEmailOptions | None = None,
+    ) -> "Future[list[str]]":
+        """Start :meth:`send_email` and return a future of its message IDs.
+
+        The request is validated and built before this returns, so invalid
+        options still raise here. The call itself, including retries, does
+        not block the caller, which lets one thread keep hundreds of sends in
+        flight on a single channel.
+        """
+
+        if isinstance(mail_options, Mail):
+            payload = self._mail_payload(mail_options, additional_options)
+            parts = self._split(mail_options)
+            if parts is not None:
+                return self._send_split_future(parts)
+            return self._send_future(self._raw_client.SendEmail, payload,
+                                     emails=mail_options._recipient_count())
+        with self._stage("validate"):
+            _validate_mail_options(mail_options)
+        with self._stage("build"):
+            request = _populate_send_mail_request(
+                email_pb2.SendMailRequest(), mail_options,
+                additional_options, self._content_cache)
+        parts = self._split(request)
+        if parts is not None:
+            return self._send_split_future(parts)
+        return self._send_future(*self._message_call("SendEmail", request),
+                                 emails=_recipient_count(request))
+
+    def send_eml_email_future(
+        self,
+        eml: EmlSource,
+        additional_options: AdditionalEmailOptions | None = None,
+    ) -> "Future[list[str]]":
+        """Non-blocking :meth:`send_eml_email`."""
+
+        with self._stage("serialize"):
+            payload = _serialize_eml_request(eml, additional_options)
+        return self._send_future(self._raw_client.SendEmlEmail, payload)
+
+    def send_group_email_future(self, group_mail: GroupMailOptions | GroupMail) -> "Future[list[str]]":
+        """Non-blocking :meth:`send_group_email`."""
+
+        if isinstance(group_mail, GroupMail):
+            return self._send_future(
+                self._raw_client.SendGroupEmail, self._mail_payload(group_mail))
+        with self._stage("build"):
+            request = _build_group_mail_request(group_mail, self._content_cache)
+        return self._send_future(*self._message_call("SendGroupEmail", request))
+
+    def send_template_future(
+        self,
+        template: MailTemplate,
+        to: EmailAddress | Sequence[EmailAddress] = (),
+        cc: EmailAddress | Sequence[EmailAddress] = (),
+        bcc: EmailAddress | Sequence[EmailAddress] = (),
+    ) -> "Future[list[str]]":
+        """Non-blocking :meth:`send_template`."""
+
+        with self._stage("serialize"):
+            payload, emails = template._render(to, cc, bcc)
+        return self._send_future(self._raw_client.SendEmail, payload, emails=emails)
+
+    def send_many(
+        self,
+        mails: Iterable[MailOptions | Mail],
+        *,
+        concurrency: int = 16,
+        ordered: bool = True,
+        additional_options: AdditionalEmailOptions | None = None,
+    ) -> Iterator[SendResult]:
+        """Send many emails with up to ``concurrency`` requests in flight.
+
+        ``mails`` may be an unbounded generator; it is only advanced as results
+        are consumed. Failures, including validation errors, are reported on
+        the yielded :class:`SendResult` rather than raised. With
+        ``ordered=False`` results are yielded as they complete.
+        """
+
+        def send(mail_options: MailOptions | Mail) -> list[str]:
+            return self.send_email(mail_options, additional_options)
+
+        for index, mail_options, future in bounded_map(
+            send, mails, concurrency=concurrency, ordered=ordered,
+            thread_name_prefix="sendlix-send",
+        ):
+            error = future.exception()
+            message_ids = [] if error else future.result()
+            yield SendResult(index, mail_options, message_ids, error)
 
     # Aliases matching the reference client's naming
     sendEmail = send_email
     sendEmlEmail = send_eml_email
     sendGroupEmail = send_group_email
 
-    def _validate_mail_options(self, mail_options: MailOptions) -> None:
-        required = ("from", "to", "subject")
-        missing = [field for field in required if not mail_options.get(field)]
-        if missing:
-            raise ValueError(
-                f"Missing required mail_options field(s): {', '.join(missing)}")
 
-        if not mail_options.get("html") and not mail_options.get("text"):
-            raise ValueError(
-                "Either 'html' or 'text' content must be provided")
+def _recipient_count(request: email_pb2.SendMailRequest) -> int:
+    return len(request.to) + len(request.cc) + len(request.bcc)
+
+
+def _merge_split(outcomes: Sequence[Any]) -> list[str]:
+    message_ids: list[str] = []
+    errors: list[BaseException] = []
+    for outcome in outcomes:
+        if isinstance(outcome, BaseException):
+            errors.append(outcome)
+        else:
+            message_ids.extend(outcome)
+    if errors and len(errors) == len(outcomes):
+        raise errors[0]
+    if errors:
+        raise PartialSendError(message_ids, errors)
+    return message_ids
+
+
+def _validate_mail_options(
+    mail_options: MailOptions,
+    required: Sequence[str] = ("from", "to", "subject"),
+) -> None:
+    missing = [field for field in required if not mail_options.get(field)]
+    if missing:
+        raise ValueError(
+            f"Missing required mail_options field(s): {', '.join(missing)}")
+
+    if not mail_options.get("html") and not mail_options.get("text"):
+        raise ValueError(
+            "Either 'html' or 'text' content must be provided")
+    if mail_options.get("from"):
+        _email_data(mail_options["from"])
+
+
+def _validate_content(source: Mapping[str, Any]) -> None:
+    for image in source.get("images") or ():
+        if not image.get("placeholder"):
+            raise ValueError("Image must include a 'placeholder'")
+        if not isinstance(image.get("data"), (bytes, bytearray, memoryview)):
+            raise TypeError("Image 'data' must be bytes-like")
+        _image_mime(image)
+
+
+def _build_send_mail_request(
+    mail_options: MailOptions,
+    additional_options: AdditionalEmailOptions | None = None,
+    content_cache: ContentCache | None = None,
+) -> email_pb2.SendMailRequest:
+    _validate_mail_options(mail_options)
+    return _populate_send_mail_request(
+        email_pb2.SendMailRequest(), mail_options, additional_options, content_cache)
+
+
+def _populate_send_mail_request(
+    request: email_pb2.SendMailRequest,
+    mail_options: MailOptions,
+    additional_options: AdditionalEmailOptions | None = None,
+    content_cache: ContentCache | None = None,
+) -> email_pb2.SendMailRequest:
+    getattr(request, "from").CopyFrom(_email_data(mail_options["from"]))
+    # Validate all recipient lists in one pass so every bad address is
+    # reported together.
+    recipients = build_recipients(
+        mail_options.get("to") or (),
+        mail_options.get("cc") or (),
+        mail_options.get("bcc") or (),
+        dedupe=bool(mail_options.get("dedupeRecipients")),
+    )
+    request.to.extend(recipients.to)
+    request.subject = mail_options["subject"]
+    request.TextContent.CopyFrom(
+        _build_mail_content(mail_options, content_cache))
+
+    request.cc.extend(recipients.cc)
+    request.bcc.extend(recipients.bcc)
+    if mail_options.get("replyTo"):
+        request.reply_to.CopyFrom(_email_data(mail_options["replyTo"]))
+
+    if additional_options:
+        request.additionalInfos.CopyFrom(
+            _build_additional_infos(additional_options))
+    return request
+
+
+def _build_eml_request(
+    eml: EmlSource,
+    additional_options: AdditionalEmailOptions | None = None,
+) -> email_pb2.EmlMailRequest:
+    raw_bytes = _coerce_eml_bytes(eml)
+    request = email_pb2.EmlMailRequest(mail=raw_bytes)
+    if additional_options:
+        request.additionalInfos.CopyFrom(
+            _build_additional_infos(additional_options))
+    return request
+
+
+def _validate_group_mail(group_mail: GroupMailOptions) -> None:
+    required = ("from", "groupId", "subject")
+    missing = [field for field in required if not group_mail.get(field)]
+    if missing:
+        raise ValueError(
+            f"Missing required group_mail field(s): {', '.join(missing)}")
+    _email_data(group_mail["from"])
+
+
+def _build_group_mail_request(
+    group_mail: GroupMailOptions,
+    content_cache: ContentCache | None = None,
+) -> email_pb2.GroupMailData:
+    _validate_group_mail(group_mail)
+    request = email_pb2.GroupMailData(
+        groupId=group_mail["groupId"],
+        subject=group_mail["subject"],
+    )
+    getattr(request, "from").CopyFrom(_email_data(group_mail["from"]))
+    request.TextContent.CopyFrom(
+        _build_mail_content(group_mail, content_cache))
 
+    if group_mail.get("category"):
+        request.category = group_mail["category"]
+    return request
+
+
+def _build_mail_content(
+    source: MutableMapping[str, object],
+    content_cache: ContentCache | None = None,
+) -> email_pb2.MailContent:
+    if content_cache is not None:
+        return _cached_mail_content(source, content_cache)
 
-def _build_mail_content(source: MutableMapping[str, object]) -> email_pb2.MailContent:
     content = email_pb2.MailContent(
         html=source.get("html", "") or "",
         text=source.get("text", "") or "",
@@ -164,17 +940,51 @@ def _build_mail_content(source: MutableMapping[str, object]) -> email_pb2.MailCo
     return content
 
 
+def _cached_mail_content(
+    source: MutableMapping[str, object],
+    content_cache: ContentCache,
+) -> email_pb2.MailContent:
+    images = source.get("images") or ()
+    image_keys = tuple(_image_key(image) for image in images)
+    html = source.get("html", "") or ""
+    text = source.get("text", "") or ""
+    tracking = bool(source.get("tracking", False))
+    key = ("content", data_key(html), data_key(text), tracking, image_keys)
+
+    def build() -> email_pb2.MailContent:
+        # Images are cached only inside the content, so that their bytes
+        # count once against max_bytes.
+        content = email_pb2.MailContent(html=html, text=text, tracking=tracking)
+        content.Images.extend(_build_images(images))
+        return content
+
+    return content_cache.get_or_build(key, build)
+
+
+def _image_key(image: ImageConfig) -> tuple:
+    return ("image", image["placeholder"], image.get("type", "PNG").upper(),
+            data_key(image["data"]))
+
+
 def _build_images(images: Sequence[ImageConfig]) -> Iterable[email_pb2.Images]:
     for image in images:
-        payload = email_pb2.Images(
-            placeholder=image["placeholder"],
-            Image=bytes(image["data"]),
-        )
-        mime = image.get("type", "PNG").upper()
-        if mime not in email_pb2.MimeType.keys():
-            raise ValueError(f"Unsupported image MIME type: {mime}")
-        payload.type = email_pb2.MimeType.Value(mime)
-        yield payload
+        yield _build_image(image)
+
+
+def _build_image(image: ImageConfig) -> email_pb2.Images:
+    payload = email_pb2.Images(
+        placeholder=image["placeholder"],
+        Image=bytes(image["data"]),
+    )
+    payload.type = email_pb2.MimeType.Value(_image_mime(image))
+    return payload
+
+
+def _image_mime(image: ImageConfig) -> str:
+    mime = image.get("type", "PNG").upper()
+    if mime not in email_pb2.MimeType.keys():
+        raise ValueError(f"Unsupported image MIME type: {mime}")
+    return mime
 
 
 def _build_additional_infos(options: AdditionalEmailOptions) -> email_pb2.AdditionalInfos:
@@ -200,8 +1010,64 @@ def _build_additional_infos(options: AdditionalEmailOptions) -> email_pb2.Additi
     return info
 
 
-def _coerce_eml_bytes(eml: str | Path | bytes | bytearray | memoryview) -> bytes:
-    if isinstance(eml, (bytes, bytearray, memoryview)):
+def _as_addresses(value: EmailAddress | Sequence[EmailAddress]) -> Sequence[EmailAddress]:
+    if isinstance(value, (str, dict)):
+        return [value]
+    return value or ()
+
+
+def _coerce_eml_bytes(eml: EmlSource) -> bytes:
+    if isinstance(eml, bytes):
+        return eml
+    if isinstance(eml, (bytearray, memoryview, mmap.mmap)):
         return bytes(eml)
     path = Path(eml)
     return path.read_bytes()
+
+
+# EmlMailRequest wire tags: field 1 (mail) and field 2 (additionalInfos),
+# both length-delimited.
+_EML_MAIL_TAG = b"\x0a"
+_EML_INFOS_TAG = b"\x12"
+
+
+def _serialize_eml_request(
+    eml: EmlSource,
+    additional_options: AdditionalEmailOptions | None = None,
+) -> bytes:
+    """Encode an ``EmlMailRequest`` without an intermediate message object.
+
+    Equivalent to ``_build_eml_request(...).SerializeToString()``, but the
+    EML body is copied straight from its buffer into the output.
+    """
+
+    tail = b""
+    if additional_options:
+        infos = _build_additional_infos(additional_options).SerializeToString()
+        tail = _EML_INFOS_TAG + encode_varint(len(infos)) + infos
+
+    with _eml_buffer(eml) as buffer:
+        size = len(buffer)
+        if not size:
+            return tail
+        return b"".join((_EML_MAIL_TAG, encode_varint(size), buffer, tail))
+
+
+@contextlib.contextmanager
+def _eml_buffer(eml: EmlSource) -> Iterator[Any]:
+    if isinstance(eml, memoryview):
+        yield eml.cast("B") if eml.ndim != 1 or eml.itemsize != 1 else eml
+        return
+    if isinstance(eml, (bytes, bytearray, mmap.mmap)):
+        yield eml
+        return
+
+    with open(Path(eml), "rb") as handle:
+        if not os.fstat(handle.fileno()).st_size:
+            yield b""
+            return
+        mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield mapped
+        finally:
+            mapped.close()
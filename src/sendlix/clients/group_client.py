@@ -2,11 +2,22 @@
 
 from __future__ import annotations
 
-from typing import Mapping, MutableMapping, Sequence, TypedDict, Union
+from concurrent.futures import Future
+from typing import Any, Dict, Iterable, Iterator, Mapping, MutableMapping, Optional, Sequence, TypedDict, Union
 
 from .._compat import NotRequired
 from ..proto import EmailData_pb2, group_pb2, group_pb2_grpc
-from ._helpers import EmailAddress, to_email_data
+from ._cache import MISSING, LRUCache
+from ._concurrency import bounded_map
+from ._helpers import EmailAddress, _email_data
+from .group_import import (
+    DEFAULT_MAX_CHUNK_BYTES,
+    DEFAULT_MAX_CHUNK_ENTRIES,
+    ChunkFailure,
+    ImportResult,
+    _Chunk,
+    _iter_chunks,
+)
 from .client import Client, SupportsAuthHeader
 
 
@@ -18,11 +29,48 @@ class EmailRecord(TypedDict, total=False):
 GroupEmailInput = Union[EmailAddress, EmailRecord]
 
 
+class MembershipCache(LRUCache[bool]):
+    """LRU+TTL cache of ``(group_id, email) -> exists`` lookups.
+
+    ``GroupClient`` keeps it in sync with its own inserts and deletes; changes
+    made elsewhere become visible once an entry's ``ttl`` elapses.
+    """
+
+    def __init__(self, max_entries: int = 100_000, ttl: Optional[float] = 300.0) -> None:
+        super().__init__(max_entries, ttl)
+
+
+_GROUP_SERVICE = "/sendlix.api.v1.Group/"
+
+
+class _RawGroupStub:
+    """GroupStub counterpart whose methods take pre-serialized request bytes."""
+
+    def __init__(self, channel) -> None:
+        self.InsertEmailToGroup = channel.unary_unary(
+            _GROUP_SERVICE + "InsertEmailToGroup",
+            request_serializer=None,
+            response_deserializer=group_pb2.UpdateResponse.FromString,
+        )
+
+
 class GroupClient(Client):
     """Client for the Sendlix group gRPC service."""
 
-    def __init__(self, auth: SupportsAuthHeader | str) -> None:
-        super().__init__(auth, group_pb2_grpc.GroupStub)
+    def __init__(
+        self,
+        auth: SupportsAuthHeader | str,
+        *,
+        membership_cache: MembershipCache | None = None,
+        **options: Any,
+    ) -> None:
+        super().__init__(auth, group_pb2_grpc.GroupStub, **options)
+        self._membership_cache = membership_cache
+        self._raw_stub: _RawGroupStub | None = None
+
+    @property
+    def membership_cache(self) -> MembershipCache | None:
+        return self._membership_cache
 
     def insert_email_into_group(
         self,
@@ -30,43 +78,286 @@ class GroupClient(Client):
         email: GroupEmailInput | Sequence[GroupEmailInput],
         fail_handling: str = "ABORT",
     ) -> bool:
-        if not group_id:
-            raise ValueError("group_id is required")
+        with self._stage("build"):
+            request = _build_insert_request(group_id, email, fail_handling)
+        try:
+            response = self.client.InsertEmailToGroup(request)
+        except Exception:
+            self._forget_entries(group_id, request.entries)
+            raise
+        return self._inserted(group_id, request, response)
+
+    def insert_email_into_group_future(
+        self,
+        group_id: str,
+        email: GroupEmailInput | Sequence[GroupEmailInput],
+        fail_handling: str = "ABORT",
+    ) -> "Future[bool]":
+        """Non-blocking :meth:`insert_email_into_group`."""
 
-        entries = email if isinstance(email, Sequence) and not isinstance(
-            email, (str, bytes)) else [email]
+        with self._stage("build"):
+            request = _build_insert_request(group_id, email, fail_handling)
+        return self._future(
+            self.client.InsertEmailToGroup, request,
+            lambda response: self._inserted(group_id, request, response),
+            on_error=lambda exc: self._forget_entries(group_id, request.entries))
 
-        request = group_pb2.InsertEmailToGroupRequest(groupId=group_id)
-        request.onFailure = _resolve_failure_handler(fail_handling)
+    def _inserted(
+        self,
+        group_id: str,
+        request: group_pb2.InsertEmailToGroupRequest,
+        response: group_pb2.UpdateResponse,
+    ) -> bool:
+        self._remember_inserted(group_id, request, response)
+        return _insert_succeeded(response)
 
-        for record in entries:
-            request.entries.append(_build_group_entry(record))
+    def _insert_serialized_future(self, payload: bytes) -> "Future[bool]":
+        """Non-blocking insert of an already serialized request."""
 
-        response = self.client.InsertEmailToGroup(request)
-        if not response.success:
-            raise RuntimeError(response.message or "InsertEmailToGroup failed")
-        return True
+        if self._membership_cache is None:
+            return self._future(
+                self._raw_client.InsertEmailToGroup, payload, _insert_succeeded)
+        # Keeping the cache in step needs the group and entries back.
+        request = group_pb2.InsertEmailToGroupRequest.FromString(payload)
+        return self._future(
+            self._raw_client.InsertEmailToGroup, payload,
+            lambda response: self._inserted(request.groupId, request, response),
+            on_error=lambda exc: self._forget_entries(request.groupId, request.entries))
 
-    def delete_email_from_group(self, group_id: str, email: str) -> bool:
-        if not group_id or not email:
-            raise ValueError("Both group_id and email are required")
+    @property
+    def _raw_client(self) -> _RawGroupStub:
+        if self._raw_stub is None:
+            self._raw_stub = _RawGroupStub(self._stub_channel)
+        return self._raw_stub
 
-        request = group_pb2.RemoveEmailFromGroupRequest(
-            groupId=group_id, email=email)
+    def delete_email_from_group(self, group_id: str, email: str) -> bool:
+        request = self._start_delete(group_id, email)
         response = self.client.RemoveEmailFromGroup(request)
+        return self._deleted(group_id, email, response)
+
+    def delete_email_from_group_future(self, group_id: str, email: str) -> "Future[bool]":
+        """Non-blocking :meth:`delete_email_from_group`."""
+
+        request = self._start_delete(group_id, email)
+        return self._future(
+            self.client.RemoveEmailFromGroup, request,
+            lambda response: self._deleted(group_id, email, response))
+
+    def _start_delete(self, group_id: str, email: str) -> group_pb2.RemoveEmailFromGroupRequest:
+        with self._stage("build"):
+            request = _build_remove_request(group_id, email)
+        if self._membership_cache is not None:
+            self._membership_cache.delete((group_id, email))
+        return request
+
+    def _deleted(self, group_id: str, email: str, response: group_pb2.UpdateResponse) -> bool:
         if not response.success:
             raise RuntimeError(
                 response.message or "RemoveEmailFromGroup failed")
+        if self._membership_cache is not None:
+            self._membership_cache.set((group_id, email), False)
         return True
 
     def contains_email_in_group(self, group_id: str, email: str) -> bool:
-        if not group_id or not email:
-            raise ValueError("Both group_id and email are required")
+        with self._stage("build"):
+            request = _build_check_request(group_id, email)
+        cache = self._membership_cache
+        if cache is not None:
+            cached = cache.get((group_id, email))
+            if cached is not MISSING:
+                return cached
 
-        request = group_pb2.CheckEmailInGroupRequest(
-            groupId=group_id, email=email)
         response = self.client.CheckEmailInGroup(request)
-        return bool(response.exists)
+        return self._checked(group_id, email, response)
+
+    def contains_email_in_group_future(self, group_id: str, email: str) -> "Future[bool]":
+        """Non-blocking :meth:`contains_email_in_group`; cache hits resolve at once."""
+
+        with self._stage("build"):
+            request = _build_check_request(group_id, email)
+        cache = self._membership_cache
+        if cache is not None:
+            cached = cache.get((group_id, email))
+            if cached is not MISSING:
+                future: "Future[bool]" = Future()
+                future.set_result(cached)
+                return future
+
+        return self._future(
+            self.client.CheckEmailInGroup, request,
+            lambda response: self._checked(group_id, email, response))
+
+    def _checked(self, group_id: str, email: str, response: group_pb2.CheckEmailInGroupResponse) -> bool:
+        exists = bool(response.exists)
+        if self._membership_cache is not None:
+            self._membership_cache.set((group_id, email), exists)
+        return exists
+
+    def contains_many(
+        self,
+        group_id: str,
+        emails: Iterable[str],
+        *,
+        concurrency: int = 16,
+    ) -> Dict[str, bool]:
+        """Check many addresses at once, returning ``{email: exists}``.
+
+        Duplicate addresses are looked up once and cached answers are served
+        without an RPC. Up to ``concurrency`` checks run in parallel; the first
+        failed check is raised once the in-flight checks have finished.
+        """
+
+        if not group_id:
+            raise ValueError("group_id is required")
+
+        results: Dict[str, bool] = {}
+        pending = []
+        for email in dict.fromkeys(emails):
+            if not email:
+                raise ValueError("Both group_id and email are required")
+            cached = MISSING
+            if self._membership_cache is not None:
+                cached = self._membership_cache.get((group_id, email))
+            if cached is MISSING:
+                pending.append(email)
+            else:
+                results[email] = cached
+
+        def check(email: str) -> bool:
+            request = _build_check_request(group_id, email)
+            return bool(self.client.CheckEmailInGroup(request).exists)
+
+        error: BaseException | None = None
+        for _, email, future in bounded_map(
+            check, pending, concurrency=concurrency, ordered=False,
+            thread_name_prefix="sendlix-check",
+        ):
+            if future.exception() is not None:
+                error = error or future.exception()
+                continue
+            results[email] = future.result()
+            if self._membership_cache is not None:
+                self._membership_cache.set((group_id, email), results[email])
+        if error is not None:
+            raise error
+        return results
+
+    def import_emails(
+        self,
+        group_id: str,
+        records: Iterable[GroupEmailInput],
+        *,
+        fail_handling: str = "ABORT",
+        max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES,
+        max_chunk_entries: int = DEFAULT_MAX_CHUNK_ENTRIES,
+        concurrency: int = 4,
+    ) -> ImportResult:
+        """Stream ``records`` into a group in size-bounded, parallel chunks.
+
+        ``records`` is consumed lazily (see :func:`read_csv` and
+        :func:`read_jsonl`), so memory stays bounded by ``concurrency`` chunks.
+        With ``ABORT`` the first invalid record or failed chunk stops the
+        import; chunks already in flight still complete, and valid records
+        that were read but not sent are listed in ``unsent_records``. With
+        ``SKIP`` invalid records and failed chunks are reported and the import
+        continues.
+        """
+
+        if not group_id:
+            raise ValueError("group_id is required")
+        on_failure = _resolve_failure_handler(fail_handling)
+        abort = on_failure == group_pb2.FailureHandler.ABORT
+        result = ImportResult()
+
+        def on_invalid(record_index: int, exc: Exception) -> bool:
+            result.invalid_records.append((record_index, str(exc)))
+            if abort:
+                result.aborted = True
+            return not abort
+
+        def unsent(chunk: _Chunk) -> None:
+            result.unsent_records.extend(
+                range(chunk.first_record, chunk.first_record + len(chunk.entries)))
+
+        def send_chunk(chunk: _Chunk) -> int:
+            request = group_pb2.InsertEmailToGroupRequest(
+                groupId=group_id, onFailure=on_failure)
+            request.entries.extend(chunk.entries)
+            try:
+                response = self.client.InsertEmailToGroup(request)
+            except Exception:
+                self._forget_entries(group_id, chunk.entries)
+                raise
+            self._remember_inserted(group_id, request, response)
+            if not response.success:
+                raise RuntimeError(
+                    response.message or "InsertEmailToGroup failed")
+            return response.affectedRows
+
+        chunks = _iter_chunks(
+            records,
+            _build_group_entry,
+            max_chunk_bytes=max_chunk_bytes,
+            max_chunk_entries=max_chunk_entries,
+            on_invalid=on_invalid,
+            on_stop=unsent,
+        )
+
+        def until_aborted() -> Iterator[_Chunk]:
+            # Stops new chunks after an abort; bounded_map still drains the
+            # ones already in flight so their rows are counted.
+            for chunk in chunks:
+                if result.aborted:
+                    unsent(chunk)
+                    return
+                yield chunk
+
+        results = bounded_map(
+            send_chunk, until_aborted(), concurrency=concurrency, ordered=False,
+            thread_name_prefix="sendlix-import",
+        )
+        try:
+            for _, chunk, future in results:
+                result.chunks += 1
+                error = future.exception()
+                if error is None:
+                    result.affected_rows += future.result()
+                    result.records += len(chunk.entries)
+                    continue
+                result.failures.append(ChunkFailure(
+                    chunk.index, chunk.first_record, len(chunk.entries), error))
+                if abort:
+                    result.aborted = True
+        finally:
+            results.close()
+        return result
+
+    def _remember_inserted(
+        self,
+        group_id: str,
+        request: group_pb2.InsertEmailToGroupRequest,
+        response: group_pb2.UpdateResponse,
+    ) -> None:
+        cache = self._membership_cache
+        if cache is None:
+            return
+        # A successful ABORT insert covers every entry; with SKIP only a full
+        # row count tells us that no entry was rejected.
+        complete = response.success and (
+            request.onFailure == group_pb2.FailureHandler.ABORT
+            or response.affectedRows == len(request.entries)
+        )
+        for entry in request.entries:
+            key = (group_id, entry.email.email)
+            if complete:
+                cache.set(key, True)
+            else:
+                cache.delete(key)
+
+    def _forget_entries(self, group_id: str, entries: Iterable[group_pb2.GroupEntry]) -> None:
+        if self._membership_cache is not None:
+            for entry in entries:
+                self._membership_cache.delete((group_id, entry.email.email))
 
     # Aliases to mirror the reference client's naming
     insertEmailIntoGroup = insert_email_into_group
@@ -74,6 +365,43 @@ class GroupClient(Client):
     containsEmailInGroup = contains_email_in_group
 
 
+def _insert_succeeded(response: group_pb2.UpdateResponse) -> bool:
+    if not response.success:
+        raise RuntimeError(response.message or "InsertEmailToGroup failed")
+    return True
+
+
+def _build_insert_request(
+    group_id: str,
+    email: GroupEmailInput | Sequence[GroupEmailInput],
+    fail_handling: str = "ABORT",
+) -> group_pb2.InsertEmailToGroupRequest:
+    if not group_id:
+        raise ValueError("group_id is required")
+
+    entries = email if isinstance(email, Sequence) and not isinstance(
+        email, (str, bytes)) else [email]
+
+    request = group_pb2.InsertEmailToGroupRequest(groupId=group_id)
+    request.onFailure = _resolve_failure_handler(fail_handling)
+
+    for record in entries:
+        request.entries.append(_build_group_entry(record))
+    return request
+
+
+def _build_remove_request(group_id: str, email: str) -> group_pb2.RemoveEmailFromGroupRequest:
+    if not group_id or not email:
+        raise ValueError("Both group_id and email are required")
+    return group_pb2.RemoveEmailFromGroupRequest(groupId=group_id, email=email)
+
+
+def _build_check_request(group_id: str, email: str) -> group_pb2.CheckEmailInGroupRequest:
+    if not group_id or not email:
+        raise ValueError("Both group_id and email are required")
+    return group_pb2.CheckEmailInGroupRequest(groupId=group_id, email=email)
+
+
 def _resolve_failure_handler(value: str) -> int:
     try:
         return group_pb2.FailureHandler.Value(value.upper())
@@ -93,12 +421,12 @@ def _build_group_entry(record: GroupEmailInput) -> group_pb2.GroupEntry:
         )
         if is_email_record and "email" in record:
             recipient = record["email"]
-            entry.email.CopyFrom(to_email_data(recipient))
+            entry.email.CopyFrom(_email_data(recipient))
             substitutions = record.get("substitutions") or {}
         else:
-            entry.email.CopyFrom(to_email_data(record))
+            entry.email.CopyFrom(_email_data(record))
     else:
-        entry.email.CopyFrom(to_email_data(record))
+        entry.email.CopyFrom(_email_data(record))
 
     if substitutions:
         entry.substitutions.update(substitutions)
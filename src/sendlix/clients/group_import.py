@@ -0,0 +1,197 @@
+"""Streaming inputs and chunking for :meth:`GroupClient.import_emails`."""
+
+from __future__ import annotations
+
+import csv
+import json
+from dataclasses import field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .._compat import dataclass
+from ..proto import group_pb2
+from ._wire import varint_size
+
+DEFAULT_MAX_CHUNK_BYTES = 1024 * 1024
+DEFAULT_MAX_CHUNK_ENTRIES = 5000
+
+# groupId, onFailure and framing overhead of an InsertEmailToGroupRequest.
+_REQUEST_OVERHEAD_BYTES = 512
+
+
+@dataclass(slots=True)
+class ChunkFailure:
+    """A chunk that the API rejected or that failed in transport."""
+
+    chunk_index: int
+    first_record: int
+    entries: int
+    error: BaseException
+
+
+@dataclass(slots=True)
+class ImportResult:
+    """Aggregated outcome of a streaming group import.
+
+    ``unsent_records`` lists valid records that were read but not sent
+    because the import aborted; records after them are not read at all.
+    """
+
+    affected_rows: int = 0
+    records: int = 0
+    chunks: int = 0
+    failures: List[ChunkFailure] = field(default_factory=list)
+    invalid_records: List[Tuple[int, str]] = field(default_factory=list)
+    unsent_records: List[int] = field(default_factory=list)
+    aborted: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures and not self.invalid_records and not self.aborted
+
+
+@dataclass(slots=True)
+class _Chunk:
+    index: int
+    first_record: int
+    entries: List[group_pb2.GroupEntry]
+
+
+def read_csv(
+    path: str | Path,
+    *,
+    email_field: str = "email",
+    name_field: str = "name",
+    substitution_fields: Optional[Sequence[str]] = None,
+    encoding: str = "utf-8",
+    **reader_options: Any,
+) -> Iterator[Dict[str, Any]]:
+    """Yield group records from a CSV file with a header row, one at a time.
+
+    Columns other than ``email_field``/``name_field`` become substitutions
+    unless ``substitution_fields`` restricts them.
+    """
+
+    with open(path, newline="", encoding=encoding) as handle:
+        for row in csv.DictReader(handle, **reader_options):
+            yield _record_from_mapping(
+                row, email_field, name_field, substitution_fields)
+
+
+def read_jsonl(
+    path: str | Path,
+    *,
+    email_field: str = "email",
+    name_field: str = "name",
+    encoding: str = "utf-8",
+) -> Iterator[Any]:
+    """Yield group records from a JSON Lines file, one at a time.
+
+    Each line is either an email string or an object. Objects may already use
+    the ``{"email": ..., "substitutions": {...}}`` record shape; otherwise a
+    top-level name field is folded into the address.
+    """
+
+    with open(path, encoding=encoding) as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            value = json.loads(line)
+            if isinstance(value, dict) and isinstance(value.get(email_field), str):
+                substitutions = value.get("substitutions")
+                value = _record_from_mapping(
+                    {k: v for k, v in value.items() if k != "substitutions"},
+                    email_field, name_field, ())
+                if substitutions:
+                    value["substitutions"] = substitutions
+            yield value
+
+
+def _record_from_mapping(
+    row: Dict[str, Any],
+    email_field: str,
+    name_field: str,
+    substitution_fields: Optional[Sequence[str]],
+) -> Dict[str, Any]:
+    address: Dict[str, str] = {"email": (row.get(email_field) or "").strip()}
+    if row.get(name_field):
+        address["name"] = row[name_field]
+
+    if substitution_fields is None:
+        substitution_fields = [
+            key for key in row if key not in (email_field, name_field)]
+    substitutions = {
+        key: str(row[key]) for key in substitution_fields
+        if row.get(key) not in (None, "")
+    }
+    return {"email": address, "substitutions": substitutions}
+
+
+def _entry_wire_size(entry: group_pb2.GroupEntry) -> int:
+    size = entry.ByteSize()
+    # One tag byte plus the varint length prefix of the repeated field.
+    return 1 + varint_size(size) + size
+
+
+def _iter_chunks(
+    records: Iterable[Any],
+    build_entry: Callable[[Any], group_pb2.GroupEntry],
+    *,
+    max_chunk_bytes: int,
+    max_chunk_entries: int,
+    on_invalid: Callable[[int, Exception], bool],
+    on_stop: Optional[Callable[[_Chunk], None]] = None,
+) -> Iterator[_Chunk]:
+    """Group records into chunks bounded by serialized size and entry count.
+
+    ``on_invalid`` is called for records that fail to build; returning
+    ``False`` stops the iteration, and the partly filled chunk is handed to
+    ``on_stop`` instead of being yielded.
+    """
+
+    budget = max_chunk_bytes - _REQUEST_OVERHEAD_BYTES
+    if budget <= 0:
+        raise ValueError("max_chunk_bytes is too small")
+    if max_chunk_entries < 1:
+        raise ValueError("max_chunk_entries must be at least 1")
+
+    chunk_index = 0
+    entries: List[group_pb2.GroupEntry] = []
+    first_record = 0
+    size = 0
+
+    def stop() -> None:
+        if entries and on_stop is not None:
+            on_stop(_Chunk(chunk_index, first_record, entries))
+
+    for record_index, record in enumerate(records):
+        try:
+            entry = build_entry(record)
+        except (ValueError, TypeError, AttributeError) as exc:  # malformed records
+            if not on_invalid(record_index, exc):
+                stop()
+                return
+            continue
+
+        entry_size = _entry_wire_size(entry)
+        if entry_size > budget:
+            if not on_invalid(record_index, ValueError(
+                    f"Record exceeds max_chunk_bytes ({entry_size} bytes)")):
+                stop()
+                return
+            continue
+
+        if entries and (size + entry_size > budget or len(entries) >= max_chunk_entries):
+            yield _Chunk(chunk_index, first_record, entries)
+            chunk_index += 1
+            entries = []
+            size = 0
+
+        if not entries:
+            first_record = record_index
+        entries.append(entry)
+        size += entry_size
+
+    if entries:
+        yield _Chunk(chunk_index, first_record, entries)
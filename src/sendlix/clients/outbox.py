@@ -0,0 +1,443 @@
+"""Durable SQLite outbox for sending email outside the request path.
+
+:meth:`Outbox.enqueue` validates and serializes a mail and stores the request
+bytes in a local SQLite database, so a web request only pays for one insert.
+An :class:`OutboxWorker`, possibly in another process, claims batches of
+queued mails and sends them through an :class:`EmailClient`::
+
+    outbox = Outbox("outbox.sqlite3")
+    outbox.enqueue(mail_options, idempotency_key=f"welcome-{user.id}")
+
+    worker = OutboxWorker(outbox, EmailClient("sk_xxx.xxx"))
+    worker.run_forever()
+
+Delivery is at least once: a claimed mail is leased to its worker for
+``lease_seconds``, and if the worker dies before recording the outcome the
+mail is sent again after the lease expires. Each mail carries an idempotency
+key, which is unique within the outbox and is sent as ``idempotency-key``
+request metadata on every attempt.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import grpc
+
+from .._compat import dataclass
+from ..policy import CircuitOpenError, RetryPolicy
+from ..proto import email_pb2
+from ..rate_limit import QuotaExhaustedError
+from ._concurrency import bounded_map
+from .email_client import (
+    AdditionalEmailOptions,
+    EmailClient,
+    EmlSource,
+    GroupMail,
+    GroupMailOptions,
+    Mail,
+    MailOptions,
+    _build_group_mail_request,
+    _populate_send_mail_request,
+    _recipient_count,
+    _serialize_eml_request,
+    _validate_mail_options,
+)
+
+_logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+SENDING = "sending"
+SENT = "sent"
+FAILED = "failed"
+
+IDEMPOTENCY_METADATA_KEY = "idempotency-key"
+
+# Codes after which a later attempt may succeed. Everything else, such as
+# INVALID_ARGUMENT, moves the mail to FAILED straight away.
+_OUTBOX_RETRYABLE_CODES = frozenset({
+    grpc.StatusCode.UNAVAILABLE,
+    grpc.StatusCode.DEADLINE_EXCEEDED,
+    grpc.StatusCode.RESOURCE_EXHAUSTED,
+    grpc.StatusCode.ABORTED,
+    grpc.StatusCode.INTERNAL,
+    grpc.StatusCode.UNKNOWN,
+})
+
+DEFAULT_OUTBOX_RETRY = RetryPolicy(
+    max_attempts=8,
+    initial_backoff=1.0,
+    max_backoff=300.0,
+    retryable_codes=_OUTBOX_RETRYABLE_CODES,
+    # Every attempt carries the mail's idempotency key.
+    methods=None,
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    method TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    emails INTEGER NOT NULL DEFAULT 1,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    created_at REAL NOT NULL,
+    message_ids TEXT,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS outbox_ready ON outbox (status, available_at);
+"""
+
+_COLUMNS = ("id, idempotency_key, method, status, attempts, created_at, "
+            "message_ids, last_error")
+
+
+@dataclass(slots=True)
+class OutboxEntry:
+    """One queued mail; ``payload`` is only loaded for claimed entries."""
+
+    id: int
+    idempotency_key: str
+    method: str
+    status: str
+    attempts: int
+    created_at: float
+    message_ids: List[str] = field(default_factory=list)
+    last_error: Optional[str] = None
+    payload: bytes = b""
+    emails: int = 1
+
+
+@dataclass(slots=True)
+class OutboxResult:
+    """Entries processed by one :meth:`OutboxWorker.run_once` pass."""
+
+    sent: List[OutboxEntry] = field(default_factory=list)
+    retried: List[OutboxEntry] = field(default_factory=list)
+    failed: List[OutboxEntry] = field(default_factory=list)
+
+
+class Outbox:
+    """SQLite-backed queue of serialized send requests.
+
+    The database runs in WAL mode, so enqueueing never waits for a worker
+    that is reading. With the default ``synchronous="NORMAL"`` committed
+    mails survive a crash of the process; use ``"FULL"`` to also survive
+    power loss. Several processes may enqueue into and drain the same file.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        lease_seconds: float = 300.0,
+        synchronous: str = "NORMAL",
+        timeout: float = 30.0,
+    ) -> None:
+        if synchronous.upper() not in ("OFF", "NORMAL", "FULL", "EXTRA"):
+            raise ValueError(f"Unknown synchronous mode: {synchronous}")
+        self._lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            str(path), timeout=timeout, isolation_level=None,
+            check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(f"PRAGMA synchronous={synchronous.upper()}")
+        self._connection.executescript(_SCHEMA)
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(outbox)")}
+        if "emails" not in columns:  # outbox created before recipients were stored
+            self._connection.execute(
+                "ALTER TABLE outbox ADD COLUMN emails INTEGER NOT NULL DEFAULT 1")
+
+    def enqueue(
+        self,
+        mail_options: MailOptions | Mail,
+        additional_options: AdditionalEmailOptions | None = None,
+        *,
+        idempotency_key: str | None = None,
+    ) -> str:
+        """Queue a mail for :meth:`EmailClient.send_email`.
+
+        The mail is validated and serialized here, so invalid options raise
+        ``ValueError`` immediately; a :class:`Mail` contributes its cached
+        bytes. Returns the idempotency key; enqueueing a key that is already
+        in the outbox does nothing.
+        """
+
+        if isinstance(mail_options, Mail):
+            if additional_options:
+                raise TypeError("additional_options cannot be combined with a Mail")
+            return self._insert("SendEmail", mail_options.serialize(), idempotency_key,
+                                mail_options._recipient_count())
+        _validate_mail_options(mail_options)
+        request = _populate_send_mail_request(
+            email_pb2.SendMailRequest(), mail_options, additional_options)
+        return self._insert("SendEmail", request.SerializeToString(), idempotency_key,
+                            _recipient_count(request))
+
+    def enqueue_eml(
+        self,
+        eml: EmlSource,
+        additional_options: AdditionalEmailOptions | None = None,
+        *,
+        idempotency_key: str | None = None,
+    ) -> str:
+        """Queue a raw EML message for :meth:`EmailClient.send_eml_email`."""
+
+        payload = _serialize_eml_request(eml, additional_options)
+        return self._insert("SendEmlEmail", payload, idempotency_key)
+
+    def enqueue_group(
+        self,
+        group_mail: GroupMailOptions | GroupMail,
+        *,
+        idempotency_key: str | None = None,
+    ) -> str:
+        """Queue a mail for :meth:`EmailClient.send_group_email`."""
+
+        if isinstance(group_mail, GroupMail):
+            payload = group_mail.serialize()
+        else:
+            payload = _build_group_mail_request(group_mail).SerializeToString()
+        return self._insert("SendGroupEmail", payload, idempotency_key)
+
+    def _insert(self, method: str, payload: bytes, key: str | None, emails: int = 1) -> str:
+        key = key or uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR IGNORE INTO outbox (idempotency_key, method, payload, emails, "
+                "status, available_at, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, method, payload, emails, PENDING, now, now))
+        return key
+
+    def get(self, idempotency_key: str) -> Optional[OutboxEntry]:
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT {_COLUMNS} FROM outbox WHERE idempotency_key = ?",
+                (idempotency_key,)).fetchone()
+        return _entry(row) if row else None
+
+    def counts(self) -> Dict[str, int]:
+        """Return the number of entries per status."""
+
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall()
+        counts = dict.fromkeys((PENDING, SENDING, SENT, FAILED), 0)
+        counts.update(rows)
+        return counts
+
+    def claim(self, limit: int) -> List[OutboxEntry]:
+        """Lease up to ``limit`` due entries to the caller, oldest first.
+
+        Entries left in ``SENDING`` by a worker whose lease expired are
+        claimed again.
+        """
+
+        now = time.time()
+        with self._lock, self._transaction():
+            rows = self._connection.execute(
+                f"SELECT {_COLUMNS}, payload, emails FROM outbox "
+                "WHERE status IN (?, ?) AND available_at <= ? ORDER BY id LIMIT ?",
+                (PENDING, SENDING, now, limit)).fetchall()
+            self._connection.executemany(
+                "UPDATE outbox SET status = ?, attempts = attempts + 1, "
+                "available_at = ? WHERE id = ?",
+                [(SENDING, now + self._lease_seconds, row[0]) for row in rows])
+        entries = []
+        for row in rows:
+            entry = _entry(row[:-2])
+            entry.status = SENDING
+            entry.attempts += 1
+            entry.payload = bytes(row[-2])
+            entry.emails = row[-1]
+            entries.append(entry)
+        return entries
+
+    def complete(
+        self,
+        sent: Sequence[OutboxEntry] = (),
+        retried: Sequence[Tuple[OutboxEntry, float]] = (),
+        failed: Sequence[OutboxEntry] = (),
+    ) -> None:
+        """Record the outcome of claimed entries in one transaction.
+
+        ``retried`` pairs each entry with the delay before its next attempt.
+        The payload of sent entries is dropped to keep the database small.
+        An entry whose lease expired and was claimed again is left to the
+        worker holding the newer claim.
+        """
+
+        now = time.time()
+        # Matching the claim's attempt count skips rows re-claimed since.
+        claimed = "WHERE id = ? AND status = ? AND attempts = ?"
+        with self._lock, self._transaction():
+            self._connection.executemany(
+                "UPDATE outbox SET status = ?, payload = X'', message_ids = ?, "
+                f"last_error = NULL {claimed}",
+                [(SENT, json.dumps(entry.message_ids), entry.id, SENDING, entry.attempts)
+                 for entry in sent])
+            self._connection.executemany(
+                f"UPDATE outbox SET status = ?, available_at = ?, last_error = ? {claimed}",
+                [(PENDING, now + delay, entry.last_error, entry.id, SENDING, entry.attempts)
+                 for entry, delay in retried])
+            self._connection.executemany(
+                f"UPDATE outbox SET status = ?, last_error = ? {claimed}",
+                [(FAILED, entry.last_error, entry.id, SENDING, entry.attempts)
+                 for entry in failed])
+
+    def requeue_failed(self) -> int:
+        """Move every ``FAILED`` entry back to ``PENDING``; returns how many."""
+
+        with self._lock:
+            cursor = self._connection.execute(
+                "UPDATE outbox SET status = ?, attempts = 0, available_at = ? "
+                "WHERE status = ?", (PENDING, time.time(), FAILED))
+        return cursor.rowcount
+
+    def purge_sent(self, older_than: float = 0.0) -> int:
+        """Delete sent entries created more than ``older_than`` seconds ago.
+
+        Purged keys are forgotten, so enqueueing one of them again sends
+        another mail.
+        """
+
+        with self._lock:
+            cursor = self._connection.execute(
+                "DELETE FROM outbox WHERE status = ? AND created_at <= ?",
+                (SENT, time.time() - older_than))
+        return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self) -> "Outbox":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    @contextlib.contextmanager
+    def _transaction(self) -> Iterator[None]:
+        # IMMEDIATE takes the write lock up front, so two workers never claim
+        # the same rows.
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+        self._connection.execute("COMMIT")
+
+
+def _entry(row: tuple) -> OutboxEntry:
+    entry_id, key, method, status, attempts, created_at, message_ids, last_error = row
+    return OutboxEntry(
+        id=entry_id,
+        idempotency_key=key,
+        method=method,
+        status=status,
+        attempts=attempts,
+        created_at=created_at,
+        message_ids=json.loads(message_ids) if message_ids else [],
+        last_error=last_error,
+    )
+
+
+class OutboxWorker:
+    """Drains an :class:`Outbox` through an :class:`EmailClient`.
+
+    Each pass claims up to ``batch_size`` entries and sends them with up to
+    ``concurrency`` requests in flight. Failures with one of
+    ``retry.retryable_codes``, an open circuit breaker or an exhausted quota
+    are retried with ``retry``'s backoff until ``retry.max_attempts`` attempts
+    were made; other failures mark the entry ``FAILED`` at once.
+    """
+
+    def __init__(
+        self,
+        outbox: Outbox,
+        client: EmailClient,
+        *,
+        batch_size: int = 100,
+        concurrency: int = 8,
+        retry: RetryPolicy = DEFAULT_OUTBOX_RETRY,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self._outbox = outbox
+        self._client = client
+        self._batch_size = batch_size
+        self._concurrency = concurrency
+        self._retry = retry
+
+    def run_once(self) -> OutboxResult:
+        """Send one batch of due entries and return what happened."""
+
+        result = OutboxResult()
+        entries = self._outbox.claim(self._batch_size)
+        if not entries:
+            return result
+        retried: List[Tuple[OutboxEntry, float]] = []
+        for _, entry, future in bounded_map(
+            self._send_entry, entries, concurrency=self._concurrency,
+            ordered=False, thread_name_prefix="sendlix-outbox",
+        ):
+            error = future.exception()
+            if error is None:
+                entry.status = SENT
+                entry.message_ids = future.result()
+                result.sent.append(entry)
+                continue
+            entry.last_error = f"{type(error).__name__}: {error}"
+            if self._should_retry(error, entry.attempts):
+                entry.status = PENDING
+                retried.append((entry, self._retry.backoff(entry.attempts)))
+                result.retried.append(entry)
+            else:
+                _logger.warning("Outbox entry %s failed: %s",
+                                entry.idempotency_key, error)
+                entry.status = FAILED
+                result.failed.append(entry)
+        self._outbox.complete(result.sent, retried, result.failed)
+        return result
+
+    def run_forever(
+        self,
+        *,
+        poll_interval: float = 1.0,
+        stop_event: Optional[threading.Event] = None,
+    ) -> None:
+        """Drain the outbox until ``stop_event`` is set."""
+
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            result = self.run_once()
+            if not (result.sent or result.retried or result.failed):
+                stop_event.wait(poll_interval)
+
+    def _send_entry(self, entry: OutboxEntry) -> List[str]:
+        metadata = ((IDEMPOTENCY_METADATA_KEY, entry.idempotency_key),)
+        return self._client._send_serialized(
+            entry.method, entry.payload, metadata, emails=entry.emails)
+
+    def _should_retry(self, error: BaseException, attempts: int) -> bool:
+        if attempts >= self._retry.max_attempts:
+            return False
+        if isinstance(error, (CircuitOpenError, QuotaExhaustedError)):
+            return True
+        code = error.code() if isinstance(error, grpc.RpcError) and hasattr(error, "code") else None
+        return code in self._retry.retryable_codes
@@ -0,0 +1,344 @@
+"""Multi-process sending for campaigns where building requests is CPU bound.
+
+Validating and serializing a ``SendMailRequest`` with large HTML bodies and
+inline images holds the GIL, so :meth:`EmailClient.send_many` is limited to
+one core no matter how many threads it uses. :class:`ProcessPipeline`
+spreads that work over a pool of worker processes::
+
+    with ProcessPipeline("sk_xxx.xxx", processes=8) as pipeline:
+        for result in pipeline.send_many(mails):
+            ...
+
+By default each worker sends what it built from its own ``EmailClient``, whose
+gRPC channel is opened inside the worker. Pass ``client=`` to
+:meth:`ProcessPipeline.send_many` to send from the parent process instead; the
+serialized requests are then handed back through shared memory.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import pickle
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import grpc
+
+from ..proto import email_pb2
+from ._concurrency import bounded_map
+from .email_client import (
+    AdditionalEmailOptions,
+    EmailClient,
+    Mail,
+    MailOptions,
+    SendResult,
+    _populate_send_mail_request,
+    _recipient_count,
+    _validate_mail_options,
+)
+
+_Chunk = List[Tuple[int, MailOptions]]
+# (index, message ids, error) per mail, or the shared memory block holding the
+# serialized requests plus per-mail sizes, recipient counts and errors.
+_SentChunk = List[Tuple[int, List[str], Optional[BaseException]]]
+_BuiltChunk = Tuple[Optional[str], List[int], List[int], Dict[int, BaseException]]
+
+
+class RemoteSendError(RuntimeError):
+    """A send in a worker process failed; ``code`` is the gRPC status name."""
+
+    def __init__(self, message: str, code: Optional[str] = None) -> None:
+        super().__init__(message)
+        self.code = code
+
+    def __reduce__(self):
+        return type(self), (str(self), self.code)
+
+
+class ProcessPipeline:
+    """Builds, serializes and sends mails from a pool of worker processes.
+
+    ``api_key`` and ``client_options`` (``host``, ``channel_config``,
+    ``policy`` and so on) are passed to an ``EmailClient`` created in each
+    worker, so they must be picklable. Up to ``chunk_size`` mails are handed
+    to a worker at a time, and each worker keeps up to ``concurrency`` sends
+    in flight. Workers are started with ``forkserver`` where available and
+    ``spawn`` otherwise, so they never inherit the parent's gRPC state.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        processes: Optional[int] = None,
+        chunk_size: int = 16,
+        concurrency: int = 8,
+        mp_context: Optional[multiprocessing.context.BaseContext] = None,
+        **client_options: Any,
+    ) -> None:
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self._processes = processes or os.cpu_count() or 1
+        self._chunk_size = chunk_size
+        self._concurrency = concurrency
+        self._executor = ProcessPoolExecutor(
+            max_workers=self._processes,
+            mp_context=mp_context or _default_context(),
+            initializer=_init_worker,
+            initargs=(api_key, client_options),
+        )
+
+    def send_many(
+        self,
+        mails: Iterable[MailOptions],
+        *,
+        additional_options: AdditionalEmailOptions | None = None,
+        client: EmailClient | None = None,
+        ordered: bool = True,
+    ) -> Iterator[SendResult]:
+        """Send ``mails`` and yield a :class:`SendResult` for each.
+
+        Like :meth:`EmailClient.send_many`, ``mails`` is consumed lazily and
+        failures are reported on the results. Errors raised in a worker
+        arrive as :class:`RemoteSendError` unless they can be pickled as is.
+        """
+
+        if client is not None:
+            yield from self._send_from(client, mails, additional_options, ordered)
+            return
+        for chunk, future in self._map(
+                _send_chunk, mails, (additional_options, self._concurrency), ordered):
+            mails_by_index = dict(chunk)
+            for index, message_ids, error in future.result():
+                yield SendResult(index, mails_by_index[index], message_ids, error)
+
+    def serialize_many(
+        self,
+        mails: Iterable[MailOptions],
+        *,
+        additional_options: AdditionalEmailOptions | None = None,
+    ) -> Iterator[bytes]:
+        """Yield the serialized ``SendMailRequest`` for each mail, in order.
+
+        Raises the first validation error instead of yielding past it.
+        """
+
+        for chunk, future in self._map(_build_chunk, mails, (additional_options,), True):
+            payloads, _, errors = _read_built_chunk(future.result(), len(chunk))
+            for position, payload in enumerate(payloads):
+                if position in errors:
+                    raise errors[position]
+                yield payload
+
+    def _send_from(
+        self,
+        client: EmailClient,
+        mails: Iterable[MailOptions],
+        additional_options: AdditionalEmailOptions | None,
+        ordered: bool,
+    ) -> Iterator[SendResult]:
+        def built() -> Iterator[Tuple[int, MailOptions, Optional[bytes], int, Optional[BaseException]]]:
+            for chunk, future in self._map(_build_chunk, mails, (additional_options,), ordered):
+                payloads, counts, errors = _read_built_chunk(future.result(), len(chunk))
+                for position, (index, mail) in enumerate(chunk):
+                    yield index, mail, payloads[position], counts[position], errors.get(position)
+
+        def send(item) -> List[str]:
+            _, _, payload, emails, error = item
+            if error is not None:
+                raise error
+            return client._send_serialized("SendEmail", payload, emails=emails)
+
+        for _, (index, mail, _, _, _), future in bounded_map(
+            send, built(), concurrency=self._concurrency * self._processes,
+            ordered=ordered, thread_name_prefix="sendlix-pipeline",
+        ):
+            error = future.exception()
+            yield SendResult(index, mail, [] if error else future.result(), error)
+
+    def _map(
+        self,
+        fn,
+        mails: Iterable[MailOptions],
+        args: tuple,
+        ordered: bool,
+    ) -> Iterator[Tuple[_Chunk, Future]]:
+        # Keep two chunks per worker queued so no process idles between chunks
+        # while still consuming ``mails`` lazily.
+        pending: Deque[Tuple[_Chunk, Future]] = deque()
+        chunks = _chunks(mails, self._chunk_size)
+        limit = self._processes * 2
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) < limit:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        exhausted = True
+                        break
+                    pending.append((chunk, self._executor.submit(fn, chunk, *args)))
+                if not pending:
+                    return
+                if ordered:
+                    entry = pending.popleft()
+                    wait((entry[1],))
+                    yield entry
+                    continue
+                done, _ = wait([entry[1] for entry in pending], return_when=FIRST_COMPLETED)
+                for entry in [entry for entry in pending if entry[1] in done]:
+                    pending.remove(entry)
+                    yield entry
+        finally:
+            # Runs when the consumer stops early or raises; chunks that were
+            # already built still hold shared memory blocks.
+            for _, future in pending:
+                future.cancel()
+            if fn is _build_chunk:
+                for _, future in pending:
+                    if not future.cancelled() and future.exception() is None:
+                        _discard_built_chunk(future.result())
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> "ProcessPipeline":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+def _default_context() -> multiprocessing.context.BaseContext:
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _chunks(mails: Iterable[MailOptions], size: int) -> Iterator[_Chunk]:
+    chunk: _Chunk = []
+    for item in enumerate(mails):
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _read_built_chunk(
+    built: _BuiltChunk, count: int,
+) -> Tuple[List[Optional[bytes]], List[int], Dict[int, BaseException]]:
+    name, sizes, counts, errors = built
+    payloads: List[Optional[bytes]] = [None] * count
+    if name is None:
+        return payloads, counts, errors
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        offset = 0
+        for position, size in enumerate(sizes):
+            if position not in errors:
+                payloads[position] = bytes(block.buf[offset:offset + size])
+            offset += size
+    finally:
+        block.close()
+        block.unlink()
+    return payloads, counts, errors
+
+
+def _discard_built_chunk(built: _BuiltChunk) -> None:
+    name = built[0]
+    if name is None:
+        return
+    block = shared_memory.SharedMemory(name=name)
+    block.close()
+    block.unlink()
+
+
+# Worker process state, set up by ``_init_worker``.
+_worker_client: Optional[EmailClient] = None
+
+
+def _init_worker(api_key: str, client_options: Dict[str, Any]) -> None:
+    global _worker_client
+    _worker_client = EmailClient(api_key, **client_options)
+
+
+def _serialize(
+    mail: MailOptions | Mail, additional_options: AdditionalEmailOptions | None,
+) -> Tuple[bytes, int]:
+    """Return the serialized request and its number of recipients."""
+
+    if isinstance(mail, Mail):
+        return mail.serialize(), mail._recipient_count()
+    _validate_mail_options(mail)
+    request = _populate_send_mail_request(
+        email_pb2.SendMailRequest(), mail, additional_options)
+    return request.SerializeToString(), _recipient_count(request)
+
+
+def _send_chunk(
+    chunk: _Chunk,
+    additional_options: AdditionalEmailOptions | None,
+    concurrency: int,
+) -> _SentChunk:
+    client = _worker_client
+    assert client is not None, "worker not initialised"
+
+    def send(item: Tuple[int, MailOptions]) -> List[str]:
+        payload, emails = _serialize(item[1], additional_options)
+        return client._send_serialized("SendEmail", payload, emails=emails)
+
+    results: _SentChunk = []
+    for _, (index, _), future in bounded_map(
+        send, chunk, concurrency=concurrency, thread_name_prefix="sendlix-pipeline",
+    ):
+        error = future.exception()
+        results.append((index, [] if error else future.result(), _portable(error)))
+    return results
+
+
+def _build_chunk(chunk: _Chunk, additional_options: AdditionalEmailOptions | None) -> _BuiltChunk:
+    payloads: List[bytes] = []
+    counts: List[int] = []
+    errors: Dict[int, BaseException] = {}
+    for position, (_, mail) in enumerate(chunk):
+        try:
+            payload, emails = _serialize(mail, additional_options)
+        except Exception as exc:
+            payload, emails = b"", 0
+            errors[position] = _portable(exc)
+        payloads.append(payload)
+        counts.append(emails)
+
+    total = sum(map(len, payloads))
+    if not total:
+        return None, [len(payload) for payload in payloads], counts, errors
+    block = shared_memory.SharedMemory(create=True, size=total)
+    offset = 0
+    for payload in payloads:
+        block.buf[offset:offset + len(payload)] = payload
+        offset += len(payload)
+    block.close()
+    # The parent unlinks the block after copying the requests out.
+    return block.name, [len(payload) for payload in payloads], counts, errors
+
+
+def _portable(error: Optional[BaseException]) -> Optional[BaseException]:
+    """Return ``error`` in a form that survives pickling back to the parent."""
+
+    if error is None:
+        return None
+    if isinstance(error, grpc.RpcError) and hasattr(error, "code"):
+        return RemoteSendError(f"{error.code().name}: {error.details()}", error.code().name)
+    if isinstance(error, (ValueError, TypeError, KeyError)):
+        # An exception whose __init__ does not match its args pickles fine
+        # but fails to unpickle, which breaks the whole pool.
+        try:
+            pickle.loads(pickle.dumps(error))
+        except Exception:
+            pass
+        else:
+            return error
+    return RemoteSendError(f"{type(error).__name__}: {error}")
@@ -0,0 +1,342 @@
+"""Pre-built request files and a replay engine for scheduled campaigns.
+
+:class:`RequestWriter` does all the CPU work of a send ahead of time. It
+validates, builds and serializes each request and appends it to a compact
+file instead of calling the API. It has the same sending methods as
+``EmailClient`` and ``GroupClient``, so code written against a client can be
+run in build-only mode by handing it a writer::
+
+    with RequestWriter("campaign.slxr") as writer:
+        for mail in mails:
+            writer.send_email(mail)
+
+At send time :func:`replay` memory-maps the file and streams the stored
+requests to the API with up to ``concurrency`` calls in flight, so sending is
+purely I/O bound::
+
+    for result in replay("campaign.slxr", email_client=client):
+        ...
+
+A file starts with :data:`MAGIC` and holds one record per request: a one
+byte method code, the number of recipients and the payload length as protobuf
+varints, and the serialized request. The recipient count is kept so that a
+rate limiter can charge the quota without parsing the request again.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import queue
+from concurrent.futures import Future
+from dataclasses import field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .._compat import dataclass
+from ..proto import email_pb2
+from ._helpers import EmailAddress
+from ._wire import decode_varint, encode_varint
+from .content_cache import ContentCache
+from .email_client import (
+    AdditionalEmailOptions,
+    EmailClient,
+    EmlSource,
+    GroupMail,
+    GroupMailOptions,
+    Mail,
+    MailOptions,
+    MailTemplate,
+    _build_group_mail_request,
+    _populate_send_mail_request,
+    _recipient_count,
+    _serialize_eml_request,
+    _validate_mail_options,
+)
+from .group_client import GroupClient, GroupEmailInput, _build_insert_request
+
+MAGIC = b"SLXR\x02"
+
+_METHOD_CODES: Dict[str, int] = {
+    "SendEmail": 1,
+    "SendEmlEmail": 2,
+    "SendGroupEmail": 3,
+    "InsertEmailToGroup": 4,
+}
+_METHODS = {code: method for method, code in _METHOD_CODES.items()}
+
+
+@dataclass(slots=True)
+class ReplayResult:
+    """Outcome of one replayed request; group inserts have no message IDs."""
+
+    index: int
+    method: str
+    message_ids: List[str] = field(default_factory=list)
+    error: Optional[BaseException] = None
+
+
+class RequestWriter:
+    """Builds requests and appends them to a request file instead of sending.
+
+    The file is written under a temporary name and renamed to ``path`` by
+    :meth:`close`, so a partly written file is never replayed. Leaving the
+    ``with`` block with an exception discards it. Each sending method returns
+    the index of the stored request.
+    """
+
+    def __init__(self, path: str | Path, *, content_cache: ContentCache | None = None) -> None:
+        self._path = Path(path)
+        self._tmp_path = self._path.with_name(self._path.name + ".tmp")
+        self._content_cache = content_cache
+        self._file = open(self._tmp_path, "wb")
+        self._file.write(MAGIC)
+        self._count = 0
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def count(self) -> int:
+        """Number of requests written so far."""
+
+        return self._count
+
+    def send_email(
+        self,
+        mail_options: MailOptions | Mail,
+        additional_options: AdditionalEmailOptions | None = None,
+    ) -> int:
+        if isinstance(mail_options, Mail):
+            if additional_options:
+                raise TypeError("additional_options belong in the Mail itself")
+            return self.write("SendEmail", mail_options.serialize(),
+                              emails=mail_options._recipient_count())
+        _validate_mail_options(mail_options)
+        request = _populate_send_mail_request(
+            email_pb2.SendMailRequest(), mail_options, additional_options, self._content_cache)
+        return self.write("SendEmail", request.SerializeToString(),
+                          emails=_recipient_count(request))
+
+    def send_eml_email(
+        self,
+        eml: EmlSource,
+        additional_options: AdditionalEmailOptions | None = None,
+    ) -> int:
+        return self.write("SendEmlEmail", _serialize_eml_request(eml, additional_options))
+
+    def send_group_email(self, group_mail: GroupMailOptions | GroupMail) -> int:
+        if isinstance(group_mail, GroupMail):
+            return self.write("SendGroupEmail", group_mail.serialize())
+        request = _build_group_mail_request(group_mail, self._content_cache)
+        return self.write("SendGroupEmail", request.SerializeToString())
+
+    def send_template(
+        self,
+        template: MailTemplate,
+        to: EmailAddress | Sequence[EmailAddress] = (),
+        cc: EmailAddress | Sequence[EmailAddress] = (),
+        bcc: EmailAddress | Sequence[EmailAddress] = (),
+    ) -> int:
+        payload, emails = template._render(to, cc, bcc)
+        return self.write("SendEmail", payload, emails=emails)
+
+    def insert_email_into_group(
+        self,
+        group_id: str,
+        email: GroupEmailInput | Sequence[GroupEmailInput],
+        fail_handling: str = "ABORT",
+    ) -> int:
+        request = _build_insert_request(group_id, email, fail_handling)
+        return self.write("InsertEmailToGroup", request.SerializeToString())
+
+    def write(self, method: str, payload: bytes, *, emails: int = 1) -> int:
+        """Append an already serialized request for ``method``.
+
+        ``emails`` is the number of recipients the request sends to.
+        """
+
+        code = _METHOD_CODES.get(method)
+        if code is None:
+            raise ValueError(f"Unsupported method: {method}")
+        if self._file.closed:
+            raise RuntimeError("RequestWriter is closed")
+        self._file.write(bytes((code,)) + encode_varint(emails) + encode_varint(len(payload)))
+        self._file.write(payload)
+        index = self._count
+        self._count += 1
+        return index
+
+    def close(self) -> None:
+        """Flush the file to disk and move it to ``path``."""
+
+        if self._file.closed:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self._tmp_path, self._path)
+
+    def discard(self) -> None:
+        """Close and delete the partly written file."""
+
+        if not self._file.closed:
+            self._file.close()
+            self._tmp_path.unlink()
+
+    def __enter__(self) -> "RequestWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    # Aliases matching the reference client's naming
+    sendEmail = send_email
+    sendEmlEmail = send_eml_email
+    sendGroupEmail = send_group_email
+    insertEmailIntoGroup = insert_email_into_group
+
+
+class RequestFile:
+    """Read-only, memory-mapped view of a file written by :class:`RequestWriter`."""
+
+    def __init__(self, path: str | Path) -> None:
+        self._path = Path(path)
+        with open(self._path, "rb") as file:
+            if os.fstat(file.fileno()).st_size < len(MAGIC):
+                raise ValueError(f"{self._path} is not a Sendlix request file")
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(MAGIC)] != MAGIC:
+            self._map.close()
+            raise ValueError(f"{self._path} is not a Sendlix request file")
+        self._count: Optional[int] = None
+
+    def records(self, start: int = 0) -> Iterator[Tuple[int, str, bytes]]:
+        """Yield ``(index, method, payload)`` for each request from ``start``.
+
+        Only the header of each skipped record is read, and a payload is
+        copied out of the mapping only when it is yielded.
+        """
+
+        for index, method, _, payload in self._records(start):
+            yield index, method, payload
+
+    def _records(self, start: int) -> Iterator[Tuple[int, str, int, bytes]]:
+        # Like records(), with the number of recipients of each request.
+        buffer = self._map
+        end = len(buffer)
+        offset = len(MAGIC)
+        index = 0
+        while offset < end:
+            method = _METHODS.get(buffer[offset])
+            if method is None:
+                raise ValueError(f"Unknown method code at offset {offset}")
+            emails, offset = decode_varint(buffer, offset + 1)
+            size, offset = decode_varint(buffer, offset)
+            if offset + size > end:
+                raise ValueError(f"Truncated record {index} in {self._path}")
+            if index >= start:
+                yield index, method, emails, buffer[offset:offset + size]
+            offset += size
+            index += 1
+
+    def __iter__(self) -> Iterator[Tuple[int, str, bytes]]:
+        return self.records()
+
+    def __len__(self) -> int:
+        if self._count is None:
+            offset, end, count = len(MAGIC), len(self._map), 0
+            while offset < end:
+                _, offset = decode_varint(self._map, offset + 1)
+                size, offset = decode_varint(self._map, offset)
+                offset += size
+                count += 1
+            self._count = count
+        return self._count
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self) -> "RequestFile":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+def replay(
+    source: str | Path | RequestFile,
+    *,
+    email_client: EmailClient | None = None,
+    group_client: GroupClient | None = None,
+    concurrency: int = 256,
+    start: int = 0,
+) -> Iterator[ReplayResult]:
+    """Send the requests stored in ``source`` and yield a result for each.
+
+    Calls are started with the clients' non-blocking ``.future()`` path from
+    the calling thread, so ``concurrency`` can be in the hundreds without a
+    thread per call. Retries, rate limiting and metrics apply as for any
+    other send. Results are yielded as calls complete, not in file order;
+    failures are reported on the results. Pass ``start`` to resume a replay
+    from a request index.
+    """
+
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    request_file = source if isinstance(source, RequestFile) else RequestFile(source)
+    done: "queue.SimpleQueue[Tuple[int, str, Future]]" = queue.SimpleQueue()
+    in_flight: Set[Future] = set()
+    records = request_file._records(start)
+    try:
+        exhausted = False
+        while True:
+            while not exhausted and len(in_flight) < concurrency:
+                record = next(records, None)
+                if record is None:
+                    exhausted = True
+                    break
+                index, method, emails, payload = record
+                is_group = method == "InsertEmailToGroup"
+                client = group_client if is_group else email_client
+                if client is None:
+                    raise ValueError(f"Replaying {method} requests needs "
+                                     f"{'group_client' if is_group else 'email_client'}")
+                try:
+                    future = _start(method, payload, emails, client)
+                except Exception as exc:  # e.g. QuotaExhaustedError
+                    yield ReplayResult(index, method, error=exc)
+                    continue
+                in_flight.add(future)
+                future.add_done_callback(
+                    lambda future, index=index, method=method: done.put((index, method, future)))
+
+            if not in_flight:
+                return
+
+            index, method, future = done.get()
+            in_flight.discard(future)
+            error = future.exception()
+            if error is not None:
+                yield ReplayResult(index, method, error=error)
+            elif method == "InsertEmailToGroup":
+                yield ReplayResult(index, method)
+            else:
+                yield ReplayResult(index, method, future.result())
+    finally:
+        # Runs on exhaustion and when the consumer stops iterating early.
+        for future in list(in_flight):
+            future.cancel()
+        if request_file is not source:
+            request_file.close()
+
+
+def _start(method: str, payload: bytes, emails: int, client: EmailClient | GroupClient) -> Future:
+    if isinstance(client, GroupClient):
+        return client._insert_serialized_future(payload)
+    return client._send_future(getattr(client._raw_client, method), payload, emails=emails)
+
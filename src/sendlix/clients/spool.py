@@ -0,0 +1,158 @@
+"""Spool-directory sender for EML files handed over by an MTA."""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import field
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from .._compat import dataclass
+from ._concurrency import bounded_map
+from .email_client import AdditionalEmailOptions, EmailClient
+
+_logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class SpoolResult:
+    """Files processed by one :meth:`SpoolSender.run_once` pass."""
+
+    sent: List[Tuple[Path, List[str]]] = field(default_factory=list)
+    failed: List[Tuple[Path, BaseException]] = field(default_factory=list)
+
+
+class SpoolSender:
+    """Sends every ``*.eml`` file in a directory with ``send_eml_email``.
+
+    Before sending, a file is claimed by renaming it to ``<name>.sending`` in
+    the same directory, so several senders can drain one spool directory and
+    a file is never sent twice. It is moved into ``sent_directory`` once the
+    API accepted it. Failed files are moved into ``failed_directory`` when one
+    is configured, and otherwise renamed back and retried with exponential
+    backoff, from ``retry_backoff`` up to ``max_retry_backoff`` seconds.
+    Writers should create files under another name (for example ``*.tmp``)
+    and rename them to ``*.eml`` once complete. A ``.sending`` file left by a
+    crash may or may not have been sent and is not picked up again.
+    """
+
+    def __init__(
+        self,
+        client: EmailClient,
+        directory: str | Path,
+        *,
+        pattern: str = "*.eml",
+        sent_directory: str | Path | None = None,
+        failed_directory: str | Path | None = None,
+        concurrency: int = 8,
+        additional_options: AdditionalEmailOptions | None = None,
+        retry_backoff: float = 1.0,
+        max_retry_backoff: float = 300.0,
+    ) -> None:
+        self._client = client
+        self._directory = Path(directory)
+        self._pattern = pattern
+        self._sent_directory = Path(sent_directory or self._directory / "sent")
+        self._failed_directory = Path(
+            failed_directory) if failed_directory else None
+        self._concurrency = concurrency
+        self._additional_options = additional_options
+        self._retry_backoff = retry_backoff
+        self._max_retry_backoff = max_retry_backoff
+        self._sent_directory.mkdir(parents=True, exist_ok=True)
+        if self._failed_directory is not None:
+            self._failed_directory.mkdir(parents=True, exist_ok=True)
+        for target in (self._sent_directory, self._failed_directory):
+            if target is not None and target.stat().st_dev != self._directory.stat().st_dev:
+                raise ValueError(
+                    f"{target} must be on the same filesystem as {self._directory}")
+        self._in_flight: Set[Path] = set()
+        # Failed file -> (consecutive failures, monotonic time of next attempt)
+        self._retries: Dict[Path, Tuple[int, float]] = {}
+
+    def pending(self) -> List[Path]:
+        """Return the spooled files waiting to be sent, oldest first."""
+
+        files = []
+        for path in self._directory.glob(self._pattern):
+            try:
+                if path.is_file():
+                    files.append((path.stat().st_mtime, path))
+            except FileNotFoundError:  # removed between glob and stat
+                continue
+        return [path for _, path in sorted(files)]
+
+    def run_once(self) -> SpoolResult:
+        """Send all spooled files that are due and return what happened."""
+
+        result = SpoolResult()
+        now = time.monotonic()
+        pending = self.pending()
+        waiting = set(pending)
+        self._retries = {
+            path: retry for path, retry in self._retries.items() if path in waiting}
+        paths = [
+            path for path in pending
+            if path not in self._in_flight and self._retries.get(path, (0, now))[1] <= now
+        ]
+        self._in_flight.update(paths)
+        try:
+            for _, path, future in bounded_map(
+                self._send_file, paths, concurrency=self._concurrency,
+                ordered=False, thread_name_prefix="sendlix-spool",
+            ):
+                error = future.exception()
+                if error is None:
+                    message_ids = future.result()
+                    if message_ids is not None:  # None: claimed by another sender
+                        self._retries.pop(path, None)
+                        result.sent.append((path, message_ids))
+                    continue
+                _logger.warning("Sending spooled file %s failed: %s", path, error)
+                result.failed.append((path, error))
+                if self._failed_directory is None:
+                    failures = self._retries.get(path, (0, 0.0))[0] + 1
+                    delay = min(self._retry_backoff * 2 ** (failures - 1),
+                                self._max_retry_backoff)
+                    self._retries[path] = (failures, time.monotonic() + delay)
+        finally:
+            self._in_flight.difference_update(paths)
+        return result
+
+    def run_forever(
+        self,
+        *,
+        poll_interval: float = 1.0,
+        stop_event: Optional[threading.Event] = None,
+    ) -> None:
+        """Poll the spool directory until ``stop_event`` is set."""
+
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            if not self.run_once().sent:
+                stop_event.wait(poll_interval)
+
+    def _send_file(self, path: Path) -> Optional[List[str]]:
+        claimed = path.with_name(path.name + ".sending")
+        try:
+            os.rename(path, claimed)
+        except FileNotFoundError:
+            return None
+        try:
+            message_ids = self._client.send_eml_email(claimed, self._additional_options)
+        except BaseException:
+            if self._failed_directory is not None:
+                os.replace(claimed, self._failed_directory / path.name)
+            else:
+                os.replace(claimed, path)
+            raise
+        try:
+            os.replace(claimed, self._sent_directory / path.name)
+        except OSError:
+            # The mail is out; leaving the .sending file keeps it from being
+            # sent again.
+            _logger.exception("Moving sent spool file %s failed", claimed)
+        return message_ids
@@ -0,0 +1,124 @@
+"""Per-call gRPC compression for large Sendlix requests.
+
+Large HTML bodies, inline images and EML payloads compress well, but
+compressing every small ``CheckEmailInGroup`` call only costs CPU. Pass a
+:class:`CompressionPolicy` as ``compression=`` to ``EmailClient`` or
+``GroupClient`` to compress only requests of at least ``min_size`` bytes. To
+compress every call on a channel instead, set ``ChannelConfig.compression``.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import threading
+import zlib
+from typing import FrozenSet, Optional
+
+import grpc
+
+from ._compat import dataclass
+from .channels import _replace_call_details
+from .instrumentation import _payload_size
+from .policy import _method_name
+
+DEFAULT_MIN_SIZE = 16 * 1024
+
+
+@dataclass(frozen=True)
+class CompressionPolicy:
+    """Which requests to compress, and with which algorithm.
+
+    Requests smaller than ``min_size`` bytes are sent uncompressed; use
+    ``min_size=0`` to compress every call. ``methods`` limits compression to
+    the given RPC names. Every ``sample_every``-th compressed request is also
+    deflated locally to estimate the compression ratio reported by
+    :class:`CompressionStats`; ``0`` turns sampling off.
+    """
+
+    algorithm: grpc.Compression = grpc.Compression.Gzip
+    min_size: int = DEFAULT_MIN_SIZE
+    methods: Optional[FrozenSet[str]] = None
+    sample_every: int = 16
+
+    def __post_init__(self) -> None:
+        if self.min_size < 0:
+            raise ValueError("min_size must not be negative")
+        if self.sample_every < 0:
+            raise ValueError("sample_every must not be negative")
+
+    def applies_to(self, method: str, size: int) -> bool:
+        if self.algorithm == grpc.Compression.NoCompression:
+            return False
+        if self.methods is not None and method not in self.methods:
+            return False
+        return size >= self.min_size
+
+
+@dataclass(slots=True)
+class CompressionStats:
+    """Compression counters exposed through ``Client.compression_stats``."""
+
+    requests: int = 0
+    compressed_requests: int = 0
+    compressed_bytes_in: int = 0
+    sampled_bytes_in: int = 0
+    sampled_bytes_out: int = 0
+
+    @property
+    def ratio(self) -> Optional[float]:
+        """Estimated compressed/uncompressed size of compressed requests."""
+
+        if not self.sampled_bytes_in:
+            return None
+        return self.sampled_bytes_out / self.sampled_bytes_in
+
+    @property
+    def estimated_bytes_saved(self) -> int:
+        ratio = self.ratio
+        if ratio is None:
+            return 0
+        return int(self.compressed_bytes_in * (1 - ratio))
+
+
+class _CompressionInterceptor(grpc.UnaryUnaryClientInterceptor):
+    """Sets the per-call compression of requests that pass the policy."""
+
+    def __init__(self, policy: CompressionPolicy) -> None:
+        self._policy = policy
+        self._lock = threading.Lock()
+        self._stats = CompressionStats()
+
+    @property
+    def stats(self) -> CompressionStats:
+        with self._lock:
+            return dataclasses.replace(self._stats)
+
+    def intercept_unary_unary(self, continuation, client_call_details, request):
+        policy = self._policy
+        size = _payload_size(request)
+        compress = policy.applies_to(_method_name(client_call_details.method), size)
+        with self._lock:
+            stats = self._stats
+            stats.requests += 1
+            if compress:
+                stats.compressed_requests += 1
+                stats.compressed_bytes_in += size
+                sample = bool(policy.sample_every) and (
+                    (stats.compressed_requests - 1) % policy.sample_every == 0)
+            else:
+                sample = False
+        if not compress:
+            return continuation(client_call_details, request)
+
+        if sample:
+            self._sample(request, size)
+        details = _replace_call_details(client_call_details, compression=policy.algorithm)
+        return continuation(details, request)
+
+    def _sample(self, request, size: int) -> None:
+        payload = request if isinstance(request, (bytes, bytearray, memoryview)) \
+            else request.SerializeToString()
+        compressed = len(zlib.compress(payload))
+        with self._lock:
+            self._stats.sampled_bytes_in += size
+            self._stats.sampled_bytes_out += compressed
@@ -0,0 +1,261 @@
+"""Metrics and tracing hooks for ``Auth`` and the clients.
+
+Pass a :class:`Recorder` as ``recorder=`` to ``Auth``, ``EmailClient`` or
+``GroupClient``. The SDK calls it for every RPC (method, status code, latency,
+request and response size), for token cache events and refreshes, and for
+the client-side stages of a send: validation, request building and
+serialization. :class:`MetricsRecorder` keeps these in memory and renders them
+in the Prometheus text format. Tracing integrations can subclass
+:class:`Recorder` and override :meth:`Recorder.span`.
+"""
+
+from __future__ import annotations
+
+import bisect
+import contextlib
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import grpc
+
+from .policy import _method_name, _nonblocking_call
+
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS: Tuple[float, ...] = (
+    256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+class Recorder:
+    """Receives instrumentation events; every hook is a no-op by default."""
+
+    def record_rpc(
+        self,
+        method: str,
+        code: str,
+        seconds: float,
+        request_bytes: int,
+        response_bytes: int,
+    ) -> None:
+        """Called once per unary call, after retries, with the final status."""
+
+    def record_stage(self, stage: str, seconds: float) -> None:
+        """Called with the duration of a client-side stage of a send."""
+
+    def record_token_event(self, event: str) -> None:
+        """Called for each ``Auth`` cache event, named like :class:`AuthStats` fields."""
+
+    def record_token_refresh(self, seconds: float, ok: bool) -> None:
+        """Called after every ``GetJwtToken`` fetch."""
+
+    @contextlib.contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        """Time ``stage``; override to open a tracing span around it as well."""
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(stage, time.perf_counter() - start)
+
+
+class Histogram:
+    """Cumulative histogram with fixed upper bounds."""
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Estimate the ``q`` quantile by interpolating within its bucket."""
+
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.buckets[index - 1] if index else 0.0
+                if index == len(self.buckets):
+                    return lower
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-1]
+
+
+_Labels = Tuple[Tuple[str, str], ...]
+
+
+class MetricsRecorder(Recorder):
+    """Thread-safe in-memory recorder with a Prometheus text exporter."""
+
+    def __init__(
+        self,
+        *,
+        latency_buckets: Sequence[float] = LATENCY_BUCKETS,
+        size_buckets: Sequence[float] = SIZE_BUCKETS,
+        prefix: str = "sendlix",
+    ) -> None:
+        self._latency_buckets = tuple(latency_buckets)
+        self._size_buckets = tuple(size_buckets)
+        self._prefix = prefix
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[_Labels, Histogram]] = {}
+        self._counters: Dict[str, Dict[_Labels, int]] = {}
+
+    def _observe(self, name: str, labels: _Labels, value: float, buckets: Tuple[float, ...]) -> None:
+        series = self._histograms.setdefault(name, {})
+        histogram = series.get(labels)
+        if histogram is None:
+            histogram = series[labels] = Histogram(buckets)
+        histogram.observe(value)
+
+    def _increment(self, name: str, labels: _Labels) -> None:
+        series = self._counters.setdefault(name, {})
+        series[labels] = series.get(labels, 0) + 1
+
+    def record_rpc(self, method, code, seconds, request_bytes, response_bytes) -> None:
+        with self._lock:
+            self._observe("rpc_duration_seconds", (("method", method), ("code", code)),
+                          seconds, self._latency_buckets)
+            self._observe("rpc_request_bytes", (("method", method),),
+                          request_bytes, self._size_buckets)
+            if code == "OK":
+                self._observe("rpc_response_bytes", (("method", method),),
+                              response_bytes, self._size_buckets)
+
+    def record_stage(self, stage, seconds) -> None:
+        with self._lock:
+            self._observe("stage_duration_seconds", (("stage", stage),),
+                          seconds, self._latency_buckets)
+
+    def record_token_event(self, event) -> None:
+        with self._lock:
+            self._increment("token_events_total", (("event", event),))
+
+    def record_token_refresh(self, seconds, ok) -> None:
+        with self._lock:
+            self._observe("token_refresh_duration_seconds",
+                          (("outcome", "ok" if ok else "error"),),
+                          seconds, self._latency_buckets)
+
+    def histogram(self, name: str, **labels: str) -> Optional[Histogram]:
+        """Return the histogram ``name`` for the given labels, if recorded.
+
+        For example ``recorder.histogram("rpc_duration_seconds",
+        method="SendEmail", code="OK").quantile(0.99)``.
+        """
+
+        with self._lock:
+            for series_labels, histogram in self._histograms.get(name, {}).items():
+                if dict(series_labels) == labels:
+                    return histogram
+        return None
+
+    def counter(self, name: str, **labels: str) -> int:
+        with self._lock:
+            for series_labels, value in self._counters.get(name, {}).items():
+                if dict(series_labels) == labels:
+                    return value
+        return 0
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def render_prometheus(self) -> str:
+        """Return all metrics in the Prometheus text exposition format."""
+
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                metric = f"{self._prefix}_{name}"
+                lines.append(f"# TYPE {metric} counter")
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{metric}{_format_labels(labels)} {value}")
+            for name, series in sorted(self._histograms.items()):
+                metric = f"{self._prefix}_{name}"
+                lines.append(f"# TYPE {metric} histogram")
+                for labels, histogram in sorted(series.items()):
+                    cumulative = 0
+                    bounds = [*map(_format_value, histogram.buckets), "+Inf"]
+                    for bound, bucket_count in zip(bounds, histogram.counts):
+                        cumulative += bucket_count
+                        bucket_labels = labels + (("le", bound),)
+                        lines.append(
+                            f"{metric}_bucket{_format_labels(bucket_labels)} {cumulative}")
+                    lines.append(
+                        f"{metric}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+                    lines.append(
+                        f"{metric}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+def _format_labels(labels: _Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def _payload_size(message) -> int:
+    if isinstance(message, (bytes, bytearray, memoryview)):
+        return len(message)
+    byte_size = getattr(message, "ByteSize", None)
+    return byte_size() if byte_size else 0
+
+
+class _MetricsInterceptor(grpc.UnaryUnaryClientInterceptor):
+    """Reports every unary call to a :class:`Recorder`."""
+
+    def __init__(self, recorder: Recorder) -> None:
+        self._recorder = recorder
+
+    def intercept_unary_unary(self, continuation, client_call_details, request):
+        start = time.perf_counter()
+        outcome = continuation(client_call_details, request)
+        method = _method_name(client_call_details.method)
+        nonblocking = _nonblocking_call.get()
+
+        def record(outcome) -> None:
+            seconds = time.perf_counter() - start
+            if nonblocking and outcome.cancelled():
+                code, response_bytes = "CANCELLED", 0
+            else:
+                code, response_bytes = _outcome_status(outcome)
+            self._recorder.record_rpc(
+                method, code, seconds, _payload_size(request), response_bytes)
+
+        if nonblocking:
+            outcome.add_done_callback(record)
+        else:
+            record(outcome)
+        return outcome
+
+
+def _outcome_status(outcome) -> Tuple[str, int]:
+    """Return the status code name and response size of a finished call."""
+
+    error = outcome.exception()
+    if error is None:
+        return "OK", _payload_size(outcome.result())
+    if isinstance(error, grpc.RpcError) and hasattr(error, "code"):
+        return error.code().name, 0
+    return "UNKNOWN", 0
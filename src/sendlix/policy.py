@@ -0,0 +1,483 @@
+"""Deadlines, retries, hedging and circuit breaking for Sendlix RPCs.
+
+A :class:`CallPolicy` is applied to every unary call made by ``Auth`` and the
+clients through a channel interceptor. Unless configured otherwise each call
+gets a deadline, and calls that fail with ``UNAVAILABLE`` are retried with
+exponential backoff until that deadline runs out.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import os
+import random
+import threading
+import time
+from concurrent import futures
+from dataclasses import field
+from typing import Any, Callable, FrozenSet, Iterator, List, Mapping, Optional
+
+import grpc
+
+from ._compat import dataclass
+from .channels import _replace_call_details
+
+DEFAULT_TIMEOUT_SECONDS = 30.0
+DEFAULT_METHOD_TIMEOUTS: Mapping[str, float] = {
+    "GetJwtToken": 10.0,
+    "CheckEmailInGroup": 5.0,
+}
+
+_RETRYABLE_CODES = frozenset({grpc.StatusCode.UNAVAILABLE})
+# Calls that can be repeated without side effects. Sends and inserts are not:
+# UNAVAILABLE can arrive after the server accepted the request (for example
+# on a GOAWAY or from a proxy), so a retry could deliver an email twice.
+IDEMPOTENT_METHODS = frozenset(
+    {"GetJwtToken", "CheckEmailInGroup", "RemoveEmailFromGroup"})
+_BREAKER_CODES = frozenset(
+    {grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED})
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling the API while the circuit breaker is open."""
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff with full jitter for transient failures.
+
+    Only ``retryable_codes`` of the RPCs named in ``methods`` are retried. By
+    default these are the idempotent calls in :data:`IDEMPOTENT_METHODS`.
+    ``UNAVAILABLE`` does not prove that the server never saw a request, so
+    retrying ``SendEmail`` or ``InsertEmailToGroup`` can repeat it. Opt in
+    with ``methods=None`` (every method) or an explicit set when duplicates
+    are acceptable.
+    """
+
+    max_attempts: int = 3
+    initial_backoff: float = 0.1
+    max_backoff: float = 2.0
+    multiplier: float = 2.0
+    retryable_codes: FrozenSet[grpc.StatusCode] = _RETRYABLE_CODES
+    methods: Optional[FrozenSet[str]] = IDEMPOTENT_METHODS
+
+    def __post_init__(self) -> None:
+        if self.max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+
+    def applies_to(self, method: str) -> bool:
+        return self.methods is None or method in self.methods
+
+    def backoff(self, attempt: int) -> float:
+        """Return the delay before retry number ``attempt`` (starting at 1)."""
+
+        ceiling = self.initial_backoff * self.multiplier ** (attempt - 1)
+        return random.uniform(0, min(self.max_backoff, ceiling))
+
+
+@dataclass(frozen=True)
+class HedgingPolicy:
+    """Send extra copies of slow idempotent calls and keep the first answer.
+
+    A new attempt starts every ``delay`` seconds while none has answered, up to
+    ``max_attempts`` in flight. Only ``methods`` are hedged.
+    """
+
+    delay: float = 0.05
+    max_attempts: int = 2
+    methods: FrozenSet[str] = frozenset({"CheckEmailInGroup"})
+
+    def __post_init__(self) -> None:
+        if self.max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+
+
+class CircuitBreaker:
+    """Stops calling the API after repeated transport failures.
+
+    After ``failure_threshold`` consecutive failures with one of
+    ``failure_codes`` the breaker opens, and calls fail fast with
+    :class:`CircuitOpenError`. After ``reset_timeout`` seconds a single trial
+    call is let through. If it succeeds the breaker closes again, and if it
+    fails, is cancelled or ends without a status the breaker opens again. A
+    trial that never reports back lets another trial through after a further
+    ``reset_timeout``. Share one breaker between clients that talk to the
+    same host.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        *,
+        failure_codes: FrozenSet[grpc.StatusCode] = _BREAKER_CODES,
+    ) -> None:
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._failure_codes = failure_codes
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self._reset_due():
+                return self.HALF_OPEN
+            return self._state
+
+    def _reset_due(self) -> bool:
+        return time.monotonic() - self._opened_at >= self._reset_timeout
+
+    def allow(self) -> bool:
+        """Return whether a call may be made now."""
+
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._reset_due():
+                # Let exactly one trial call through. ``_opened_at`` now times
+                # the trial, so a lost trial cannot keep the breaker half open.
+                self._state = self.HALF_OPEN
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+    def record(self, code: Optional[grpc.StatusCode]) -> None:
+        """Record the status of a finished call; ``None`` if it had none."""
+
+        with self._lock:
+            if code is None or code == grpc.StatusCode.CANCELLED:
+                # No verdict on the service. A cancelled trial counts as a
+                # failure so that the next one is not blocked forever.
+                if self._state == self.HALF_OPEN:
+                    self._state = self.OPEN
+                    self._opened_at = time.monotonic()
+                return
+            if code in self._failure_codes:
+                self._failures += 1
+                if self._state == self.HALF_OPEN or self._failures >= self._failure_threshold:
+                    self._state = self.OPEN
+                    self._opened_at = time.monotonic()
+            else:
+                self._failures = 0
+                self._state = self.CLOSED
+
+    def __repr__(self) -> str:  # pragma: no cover - debug helper
+        return f"CircuitBreaker(state={self.state!r})"
+
+
+@dataclass(frozen=True)
+class CallPolicy:
+    """Deadlines, retries, hedging and circuit breaking for one client.
+
+    ``timeout`` is the default deadline of a call in seconds, including all
+    of its retries. ``method_timeouts`` overrides it per RPC name (for example
+    ``"SendEmail"``). An explicit ``timeout=`` passed to a stub method takes
+    precedence over both. Set ``timeout`` to ``None`` and ``retry`` to
+    ``None`` to restore plain gRPC behaviour.
+    """
+
+    timeout: Optional[float] = DEFAULT_TIMEOUT_SECONDS
+    method_timeouts: Mapping[str, float] = field(
+        default_factory=lambda: dict(DEFAULT_METHOD_TIMEOUTS))
+    retry: Optional[RetryPolicy] = RetryPolicy()
+    hedging: Optional[HedgingPolicy] = None
+    circuit_breaker: Optional[CircuitBreaker] = None
+
+    def timeout_for(self, method: str) -> Optional[float]:
+        return self.method_timeouts.get(method, self.timeout)
+
+    def hedging_for(self, method: str) -> Optional[HedgingPolicy]:
+        if self.hedging is not None and method in self.hedging.methods:
+            return self.hedging
+        return None
+
+    def retry_delay(
+        self,
+        method: str,
+        code: Optional[grpc.StatusCode],
+        attempt: int,
+        deadline: Optional[float],
+    ) -> Optional[float]:
+        """Return how long to wait before retrying, or ``None`` to give up."""
+
+        retry = self.retry
+        if retry is None or code not in retry.retryable_codes or attempt >= retry.max_attempts:
+            return None
+        if not retry.applies_to(method):
+            return None
+        if self.circuit_breaker is not None and self.circuit_breaker.state != CircuitBreaker.CLOSED:
+            return None
+        delay = retry.backoff(attempt)
+        if deadline is not None and time.monotonic() + delay >= deadline:
+            return None
+        return delay
+
+
+DEFAULT_CALL_POLICY = CallPolicy()
+
+
+def _method_name(method: Any) -> str:
+    if isinstance(method, bytes):
+        method = method.decode("ascii")
+    return method.rsplit("/", 1)[-1]
+
+
+def _remaining(deadline: Optional[float]) -> Optional[float]:
+    if deadline is None:
+        return None
+    return max(deadline - time.monotonic(), 0.0)
+
+
+def _outcome_code(outcome: Any) -> Optional[grpc.StatusCode]:
+    error = outcome.exception()
+    if error is None:
+        return grpc.StatusCode.OK
+    if isinstance(error, grpc.RpcError) and hasattr(error, "code"):
+        return error.code()
+    return None
+
+
+_hedging_executor: Optional[futures.ThreadPoolExecutor] = None
+_hedging_executor_lock = threading.Lock()
+
+
+def _get_hedging_executor() -> futures.ThreadPoolExecutor:
+    global _hedging_executor
+    with _hedging_executor_lock:
+        if _hedging_executor is None:
+            _hedging_executor = futures.ThreadPoolExecutor(
+                max_workers=64, thread_name_prefix="sendlix-hedge")
+        return _hedging_executor
+
+
+def _reset_hedging_executor() -> None:
+    # The executor's threads do not survive fork(); start a fresh one lazily.
+    global _hedging_executor, _hedging_executor_lock
+    _hedging_executor = None
+    _hedging_executor_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_hedging_executor)
+
+
+def _hedge(
+    attempt: Callable[[], Any],
+    hedging: HedgingPolicy,
+    retryable_codes: FrozenSet[grpc.StatusCode],
+) -> Any:
+    """Run ``attempt`` up to ``hedging.max_attempts`` times in parallel."""
+
+    executor = _get_hedging_executor()
+    pending = {executor.submit(attempt)}
+    started = 1
+    outcome = None
+    while pending:
+        can_hedge = started < hedging.max_attempts
+        done, pending = futures.wait(
+            pending,
+            timeout=hedging.delay if can_hedge else None,
+            return_when=futures.FIRST_COMPLETED,
+        )
+        for finished in done:
+            outcome = finished.result()
+            code = _outcome_code(outcome)
+            if code == grpc.StatusCode.OK or code not in retryable_codes:
+                # Slower attempts are left to finish on their own.
+                return outcome
+        if can_hedge and (not done or not pending):
+            pending.add(executor.submit(attempt))
+            started += 1
+    return outcome
+
+
+# Set while a client starts a call with ``.future()``. Interceptors must then
+# return without waiting for the outcome, so retries continue from callbacks.
+_nonblocking_call: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "sendlix_nonblocking_call", default=False)
+
+
+@contextlib.contextmanager
+def _nonblocking() -> Iterator[None]:
+    token = _nonblocking_call.set(True)
+    try:
+        yield
+    finally:
+        _nonblocking_call.reset(token)
+
+
+class _RetryingFuture(grpc.Future):
+    """A ``.future()`` call whose retries are driven by completion callbacks.
+
+    Each attempt is watched with ``add_done_callback``; a retryable failure
+    schedules the next attempt on a timer after the backoff, so no thread
+    waits on the call. ``grpc.Call`` methods such as ``code()`` are forwarded
+    to the latest attempt.
+    """
+
+    def __init__(
+        self,
+        attempt: Callable[[], Any],
+        policy: "CallPolicy",
+        method: str,
+        deadline: Optional[float],
+    ) -> None:
+        self._attempt = attempt
+        self._policy = policy
+        self._method = method
+        self._deadline = deadline
+        self._condition = threading.Condition()
+        self._call: Any = None
+        self._timer: Optional[threading.Timer] = None
+        self._outcome: Any = None
+        self._cancelled = False
+        self._callbacks: List[Callable[[Any], None]] = []
+        self._attempts = 0
+        self._start()
+
+    def _start(self) -> None:
+        with self._condition:
+            cancelled = self._cancelled
+            if not cancelled:
+                self._attempts += 1
+        if cancelled:
+            self._finish(self._call)
+            return
+        call = self._attempt()
+        with self._condition:
+            self._call = call
+        call.add_done_callback(self._on_attempt_done)
+
+    def _on_attempt_done(self, call: Any) -> None:
+        policy = self._policy
+        code = None if call.cancelled() else _outcome_code(call)
+        if policy.circuit_breaker is not None:
+            policy.circuit_breaker.record(code)
+        with self._condition:
+            delay = None
+            if not self._cancelled and code is not None:
+                delay = policy.retry_delay(
+                    self._method, code, self._attempts, self._deadline)
+            if delay is not None:
+                self._timer = threading.Timer(delay, self._start)
+                self._timer.daemon = True
+                self._timer.start()
+                return
+        self._finish(call)
+
+    def _finish(self, call: Any) -> None:
+        with self._condition:
+            if self._outcome is not None:
+                return
+            self._outcome = call
+            callbacks, self._callbacks = self._callbacks, []
+            self._condition.notify_all()
+        for callback in callbacks:
+            callback(self)
+
+    def _wait(self, timeout: Optional[float]) -> Any:
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._outcome is not None, timeout):
+                raise grpc.FutureTimeoutError()
+            if self._cancelled:
+                raise grpc.FutureCancelledError()
+            return self._outcome
+
+    def cancel(self) -> bool:
+        with self._condition:
+            if self._outcome is not None:
+                return False
+            self._cancelled = True
+            call, timer = self._call, self._timer
+        if timer is not None:
+            timer.cancel()
+        if not call.cancel():
+            # Between attempts: the last attempt already finished and no
+            # callback is coming, so complete here.
+            self._finish(call)
+        return True
+
+    def cancelled(self) -> bool:
+        return self._cancelled and self._outcome is not None
+
+    def running(self) -> bool:
+        return self._outcome is None
+
+    def done(self) -> bool:
+        return self._outcome is not None
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        return self._wait(timeout).result()
+
+    def exception(self, timeout: Optional[float] = None) -> Optional[BaseException]:
+        return self._wait(timeout).exception()
+
+    def traceback(self, timeout: Optional[float] = None) -> Any:
+        return self._wait(timeout).traceback()
+
+    def add_done_callback(self, fn: Callable[[Any], None]) -> None:
+        with self._condition:
+            if self._outcome is None:
+                self._callbacks.append(fn)
+                return
+        fn(self)
+
+    def __getattr__(self, name: str) -> Any:
+        # grpc.Call methods (code, details, metadata) of the latest attempt.
+        return getattr(self._outcome or self._call, name)
+
+
+class _PolicyInterceptor(grpc.UnaryUnaryClientInterceptor):
+    """Applies a :class:`CallPolicy` to every outgoing unary call."""
+
+    def __init__(self, policy: CallPolicy) -> None:
+        self._policy = policy
+
+    def intercept_unary_unary(self, continuation, client_call_details, request):
+        policy = self._policy
+        method = _method_name(client_call_details.method)
+        breaker = policy.circuit_breaker
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpenError(
+                f"Circuit breaker is open; not calling {method}")
+
+        timeout = client_call_details.timeout
+        if timeout is None:
+            timeout = policy.timeout_for(method)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        hedging = policy.hedging_for(method)
+        retryable: FrozenSet[grpc.StatusCode] = (
+            policy.retry.retryable_codes if policy.retry else _RETRYABLE_CODES)
+
+        def attempt():
+            details = _replace_call_details(
+                client_call_details, timeout=_remaining(deadline))
+            return continuation(details, request)
+
+        if _nonblocking_call.get():
+            # Hedging needs a thread to wait on each attempt, so non-blocking
+            # calls are only retried.
+            return _RetryingFuture(attempt, policy, method, deadline)
+
+        attempts = 0
+        while True:
+            attempts += 1
+            outcome = _hedge(attempt, hedging, retryable) if hedging else attempt()
+            code = _outcome_code(outcome)
+            if breaker is not None:
+                breaker.record(code)
+            delay = policy.retry_delay(method, code, attempts, deadline)
+            if delay is None:
+                return outcome
+            time.sleep(delay)
+
@@ -0,0 +1,156 @@
+"""Quota-aware rate limiting for :class:`sendlix.EmailClient`.
+
+Every ``SendEmailResponse`` reports how many emails the account may still
+send (``emailsLeft``). A :class:`RateLimiter` combines that figure with a
+token bucket, so that sending slows down as the quota runs low and stops
+before it is exhausted rather than after a burst of rejected calls.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Optional
+
+DEFAULT_QUOTA_RECHECK_SECONDS = 60.0
+
+
+class QuotaExhaustedError(RuntimeError):
+    """Raised instead of sending while the reported quota is used up."""
+
+    def __init__(self, emails_left: int) -> None:
+        super().__init__(
+            f"Sendlix quota exhausted ({emails_left} emails left)")
+        self.emails_left = emails_left
+
+
+class RateLimiter:
+    """Thread-safe token bucket that also tracks the remaining quota.
+
+    ``rate`` is the number of send requests per second, with bursts of up to
+    ``burst`` requests; ``None`` disables the rate limit and only the quota is
+    enforced. Once the reported quota drops below ``slowdown_below`` the rate
+    is scaled down in proportion, and at ``reserve`` or less, sending stops
+    with :class:`QuotaExhaustedError`. While stopped, one request is let
+    through every ``quota_recheck_interval`` seconds to notice when the quota
+    has been topped up.
+
+    Share one limiter between all clients that use the same API key.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        *,
+        burst: Optional[int] = None,
+        slowdown_below: Optional[int] = None,
+        reserve: int = 0,
+        quota_recheck_interval: float = DEFAULT_QUOTA_RECHECK_SECONDS,
+    ) -> None:
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst is not None and burst < 1:
+            raise ValueError("burst must be at least 1")
+        if reserve < 0:
+            raise ValueError("reserve must not be negative")
+
+        self._rate = rate
+        self._capacity = float(burst if burst is not None else max(1, int(rate or 1)))
+        self._slowdown_below = slowdown_below
+        self._reserve = reserve
+        self._recheck_interval = quota_recheck_interval
+        self._lock = threading.Lock()
+        self._tokens = self._capacity
+        self._updated_at = time.monotonic()
+        self._emails_left: Optional[int] = None
+        self._exhausted_at = 0.0
+
+    @property
+    def emails_left(self) -> Optional[int]:
+        """Last quota reported by the API, minus sends started since then."""
+
+        return self._emails_left
+
+    @property
+    def rate(self) -> Optional[float]:
+        """Current requests per second after the low-quota slowdown."""
+
+        with self._lock:
+            return self._effective_rate()
+
+    def _effective_rate(self) -> Optional[float]:
+        rate = self._rate
+        left = self._emails_left
+        if rate is None or left is None or not self._slowdown_below:
+            return rate
+        if left >= self._slowdown_below:
+            return rate
+        # Never drop below 1% so the bucket keeps refilling.
+        return rate * max(left / self._slowdown_below, 0.01)
+
+    def _refill(self, now: float) -> None:
+        rate = self._effective_rate()
+        if rate is not None:
+            elapsed = now - self._updated_at
+            self._tokens = min(self._capacity, self._tokens + elapsed * rate)
+        self._updated_at = now
+
+    def _check_quota(self, now: float, emails: int) -> None:
+        left = self._emails_left
+        if left is None or left - emails >= self._reserve:
+            return
+        if now - self._exhausted_at < self._recheck_interval:
+            raise QuotaExhaustedError(left)
+        # Let this request through as a probe; the response updates the quota.
+        self._exhausted_at = now
+
+    def acquire(
+        self,
+        cost: int = 1,
+        *,
+        emails: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> bool:
+        """Wait until ``cost`` requests carrying ``emails`` emails may be sent.
+
+        ``emails`` (default ``cost``) is charged against the quota, which the
+        API counts per recipient. Returns ``False`` if ``timeout`` elapses
+        first and raises :class:`QuotaExhaustedError` once the quota is used
+        up.
+        """
+
+        emails = cost if emails is None else emails
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._check_quota(now, emails)
+                self._refill(now)
+                rate = self._effective_rate()
+                if rate is None or self._tokens >= min(cost, self._capacity):
+                    self._tokens -= cost if rate is not None else 0
+                    if self._emails_left is not None:
+                        self._emails_left -= emails
+                        if self._emails_left <= self._reserve:
+                            self._exhausted_at = now
+                    return True
+                wait = (min(cost, self._capacity) - self._tokens) / rate
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+    def update_quota(self, emails_left: int) -> None:
+        """Record the ``emailsLeft`` value of a response."""
+
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._emails_left = emails_left
+            if emails_left <= self._reserve:
+                self._exhausted_at = now
+
+    def __repr__(self) -> str:  # pragma: no cover - debug helper
+        return f"RateLimiter(rate={self._rate!r}, emails_left={self._emails_left!r})"
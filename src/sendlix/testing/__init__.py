@@ -0,0 +1,5 @@
+"""Test helpers for code that uses the Sendlix SDK."""
+
+from .fake_server import FakeSendlixServer
+
+__all__ = ["FakeSendlixServer"]
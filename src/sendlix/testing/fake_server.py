@@ -0,0 +1,210 @@
+"""In-process fake of the Sendlix API for tests and load generation.
+
+:class:`FakeSendlixServer` implements the ``Auth``, ``Email`` and ``Group``
+services on a local port, with configurable latency, error rate and quota::
+
+    with FakeSendlixServer(latency=0.02, error_rate=0.01) as server:
+        client = EmailClient("key.1", **server.client_options())
+        client.send_email({...})
+"""
+
+from __future__ import annotations
+
+import collections
+import itertools
+import random
+import threading
+import time
+from concurrent import futures
+from typing import Any, Counter, Dict, Optional, Set
+
+import grpc
+
+from ..channels import ChannelConfig, ChannelPool
+from ..proto import (
+    auth_pb2,
+    auth_pb2_grpc,
+    email_pb2,
+    email_pb2_grpc,
+    group_pb2,
+    group_pb2_grpc,
+)
+
+DEFAULT_EMAILS_LEFT = 1_000_000_000
+
+
+class FakeSendlixServer:
+    """Local gRPC server that behaves like the Sendlix API.
+
+    Every call sleeps ``latency`` seconds, plus or minus up to ``jitter``
+    seconds, and then fails with ``error_code`` with probability
+    ``error_rate``. Each successful send reduces ``emails_left`` by one per
+    recipient (one for EML and group mails). Once the quota would go negative,
+    sends fail with ``RESOURCE_EXHAUSTED``. Email and group calls without an
+    ``authorization`` header fail with ``UNAUTHENTICATED``.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_code: grpc.StatusCode = grpc.StatusCode.UNAVAILABLE,
+        emails_left: int = DEFAULT_EMAILS_LEFT,
+        token_ttl: int = 3600,
+        max_workers: int = 64,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: Optional[int] = None,
+    ) -> None:
+        if not 0 <= error_rate <= 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_code = error_code
+        self.token_ttl = token_ttl
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._emails_left = emails_left
+        self._message_ids = itertools.count(1)
+        self._groups: Dict[str, Set[str]] = collections.defaultdict(set)
+        self.calls: Counter[str] = collections.Counter()
+
+        self._server = grpc.server(
+            futures.ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="sendlix-fake"))
+        auth_pb2_grpc.add_AuthServicer_to_server(_AuthServicer(self), self._server)
+        email_pb2_grpc.add_EmailServicer_to_server(_EmailServicer(self), self._server)
+        group_pb2_grpc.add_GroupServicer_to_server(_GroupServicer(self), self._server)
+        bound = self._server.add_insecure_port(f"{host}:{port}")
+        self.address = f"{host}:{bound}"
+
+    @property
+    def emails_left(self) -> int:
+        return self._emails_left
+
+    @emails_left.setter
+    def emails_left(self, value: int) -> None:
+        with self._lock:
+            self._emails_left = value
+
+    def group_members(self, group_id: str) -> Set[str]:
+        with self._lock:
+            return set(self._groups.get(group_id, ()))
+
+    def reset(self) -> None:
+        """Clear the per-method call counts."""
+
+        with self._lock:
+            self.calls.clear()
+
+    def client_options(self, *, subchannels: int = 1, pool: ChannelPool | None = None) -> Dict[str, Any]:
+        """Return ``host``/``channel_config``/``channel_pool`` keyword arguments for clients."""
+
+        return {
+            "host": self.address,
+            "channel_config": ChannelConfig(subchannels=subchannels, insecure=True),
+            "channel_pool": pool if pool is not None else ChannelPool(),
+        }
+
+    def start(self) -> "FakeSendlixServer":
+        self._server.start()
+        return self
+
+    def stop(self, grace: Optional[float] = None) -> None:
+        self._server.stop(grace).wait()
+
+    def __enter__(self) -> "FakeSendlixServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    def _handle(self, method: str, context: grpc.ServicerContext, *, authenticated: bool = True) -> None:
+        """Apply latency, auth checks and injected errors for one call."""
+
+        with self._lock:
+            self.calls[method] += 1
+            delay = self.latency + self._random.uniform(-self.jitter, self.jitter)
+            fail = self._random.random() < self.error_rate
+        if delay > 0:
+            time.sleep(delay)
+        if authenticated and not any(
+                key == "authorization" for key, _ in context.invocation_metadata()):
+            context.abort(grpc.StatusCode.UNAUTHENTICATED, "missing authorization header")
+        if fail:
+            context.abort(self.error_code, "injected failure")
+
+    def _send(self, recipients: int, context: grpc.ServicerContext) -> email_pb2.SendEmailResponse:
+        with self._lock:
+            left = self._emails_left
+            exhausted = recipients > left
+            if not exhausted:
+                self._emails_left = left = left - recipients
+                ids = [f"fake-{next(self._message_ids)}" for _ in range(max(recipients, 1))]
+        if exhausted:
+            context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED,
+                          f"quota exceeded ({left} emails left)")
+        return email_pb2.SendEmailResponse(message=ids, emailsLeft=left)
+
+
+class _AuthServicer(auth_pb2_grpc.AuthServicer):
+    def __init__(self, server: FakeSendlixServer) -> None:
+        self._server = server
+
+    def GetJwtToken(self, request, context):
+        self._server._handle("GetJwtToken", context, authenticated=False)
+        response = auth_pb2.AuthResponse(token=f"fake-token-{time.monotonic_ns()}")
+        response.expires.seconds = self._server.token_ttl
+        return response
+
+
+class _EmailServicer(email_pb2_grpc.EmailServicer):
+    def __init__(self, server: FakeSendlixServer) -> None:
+        self._server = server
+
+    def SendEmail(self, request, context):
+        self._server._handle("SendEmail", context)
+        recipients = len(request.to) + len(request.cc) + len(request.bcc)
+        return self._server._send(recipients, context)
+
+    def SendEmlEmail(self, request, context):
+        self._server._handle("SendEmlEmail", context)
+        return self._server._send(1, context)
+
+    def SendGroupEmail(self, request, context):
+        self._server._handle("SendGroupEmail", context)
+        return self._server._send(1, context)
+
+
+class _GroupServicer(group_pb2_grpc.GroupServicer):
+    def __init__(self, server: FakeSendlixServer) -> None:
+        self._server = server
+
+    def InsertEmailToGroup(self, request, context):
+        server = self._server
+        server._handle("InsertEmailToGroup", context)
+        with server._lock:
+            members = server._groups[request.groupId]
+            before = len(members)
+            members.update(entry.email.email for entry in request.entries)
+            affected = len(members) - before
+        return group_pb2.UpdateResponse(success=True, affectedRows=affected)
+
+    def RemoveEmailFromGroup(self, request, context):
+        server = self._server
+        server._handle("RemoveEmailFromGroup", context)
+        with server._lock:
+            members = server._groups[request.groupId]
+            affected = int(request.email in members)
+            members.discard(request.email)
+        return group_pb2.UpdateResponse(success=True, affectedRows=affected)
+
+    def CheckEmailInGroup(self, request, context):
+        server = self._server
+        server._handle("CheckEmailInGroup", context)
+        with server._lock:
+            exists = request.email in server._groups.get(request.groupId, ())
+        return group_pb2.CheckEmailInGroupResponse(exists=exists)
@@ -0,0 +1,263 @@
+"""Drive ``EmailClient``/``GroupClient`` against a :class:`FakeSendlixServer`.
+
+Use it to size worker pools and to check concurrency, channel and policy
+settings offline::
+
+    python -m sendlix.testing.loadgen --operation send_email \\
+        --concurrency 64 --duration 10 --latency 0.03 --error-rate 0.01
+
+With ``--rate`` requests are started on a fixed schedule and latency is
+measured from the scheduled start, so queueing inside the client is counted
+instead of hidden.
+"""
+
+from __future__ import annotations
+
+import argparse
+import collections
+import itertools
+import json
+import math
+import threading
+import time
+from dataclasses import asdict, field
+from typing import Callable, Dict, List, Optional, Sequence
+
+import grpc
+
+from .._compat import dataclass
+from ..clients.email_client import EmailClient
+from ..clients.group_client import GroupClient
+from ..policy import CallPolicy
+from .fake_server import FakeSendlixServer
+
+OPERATIONS = ("send_email", "send_template", "send_eml", "insert", "check")
+
+_API_KEY = "loadgen.1"
+_GROUP_ID = "loadgen-group"
+
+
+@dataclass(slots=True)
+class LoadReport:
+    """Outcome of a load run; latencies are in milliseconds."""
+
+    operation: str
+    concurrency: int
+    duration: float
+    requests: int
+    succeeded: int
+    errors: Dict[str, int] = field(default_factory=dict)
+    throughput: float = 0.0
+    p50_ms: float = 0.0
+    p95_ms: float = 0.0
+    p99_ms: float = 0.0
+    max_ms: float = 0.0
+    server_calls: Dict[str, int] = field(default_factory=dict)
+
+    def format(self) -> str:
+        lines = [
+            f"operation    {self.operation} x{self.concurrency}",
+            f"requests     {self.requests} in {self.duration:.2f}s "
+            f"({self.throughput:.1f} ok/s)",
+            f"latency      p50 {self.p50_ms:.2f} ms  p95 {self.p95_ms:.2f} ms  "
+            f"p99 {self.p99_ms:.2f} ms  max {self.max_ms:.2f} ms",
+            f"succeeded    {self.succeeded}",
+        ]
+        for code, count in sorted(self.errors.items()):
+            lines.append(f"error        {code}: {count}")
+        calls = ", ".join(f"{name}={count}" for name, count in sorted(self.server_calls.items()))
+        lines.append(f"server calls {calls}")
+        return "\n".join(lines)
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(fraction * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def _mail(recipients: int) -> dict:
+    return {
+        "from": {"email": "loadgen@example.com", "name": "Load generator"},
+        "to": [f"user{i}@example.com" for i in range(recipients)],
+        "subject": "Load test",
+        "html": "<p>" + "x" * 2048 + "</p>",
+        "text": "Load test",
+    }
+
+
+def _operation(
+    name: str,
+    email_client: EmailClient,
+    group_client: GroupClient,
+    recipients: int,
+) -> Callable[[int], object]:
+    if name == "send_email":
+        mail = _mail(recipients)
+        return lambda i: email_client.send_email(mail)
+    if name == "send_template":
+        template = email_client.compile_template(_mail(0))
+        to = [f"user{i}@example.com" for i in range(recipients)]
+        return lambda i: email_client.send_template(template, to)
+    if name == "send_eml":
+        eml = b"From: loadgen@example.com\r\nSubject: Load test\r\n\r\n" + b"x" * 4096
+        return lambda i: email_client.send_eml_email(eml)
+    if name == "insert":
+        return lambda i: group_client.insert_email_into_group(
+            _GROUP_ID, f"member{i}@example.com", fail_handling="SKIP")
+    if name == "check":
+        return lambda i: group_client.contains_email_in_group(
+            _GROUP_ID, f"member{i % 1000}@example.com")
+    raise ValueError(f"Unknown operation: {name}")
+
+
+def run_load(
+    server: FakeSendlixServer,
+    *,
+    operation: str = "send_email",
+    concurrency: int = 16,
+    duration: float = 5.0,
+    requests: Optional[int] = None,
+    rate: Optional[float] = None,
+    recipients: int = 1,
+    subchannels: int = 1,
+    policy: CallPolicy | None = None,
+) -> LoadReport:
+    """Run ``operation`` from ``concurrency`` threads and report the results.
+
+    The run stops after ``duration`` seconds or, if given, after ``requests``
+    requests, whichever comes first.
+    """
+
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    options = server.client_options(subchannels=subchannels)
+    email_client = EmailClient(_API_KEY, policy=policy, **options)
+    group_client = GroupClient(_API_KEY, policy=policy, **options)
+    call = _operation(operation, email_client, group_client, recipients)
+    try:
+        call(0)  # Warm up: fetch a token and connect before measuring.
+    except Exception:  # injected errors or an empty quota are measured below
+        pass
+
+    lock = threading.Lock()
+    counter = iter(range(requests)) if requests is not None else itertools.count()
+    latencies: List[float] = []
+    errors: collections.Counter[str] = collections.Counter()
+    start = time.perf_counter()
+    stop_at = start + duration
+    interval = 1.0 / rate if rate else 0.0
+
+    def worker() -> None:
+        local_latencies: List[float] = []
+        local_errors: collections.Counter[str] = collections.Counter()
+        while True:
+            with lock:
+                index = next(counter, None)
+            if index is None:
+                break
+            scheduled = start + index * interval if rate else time.perf_counter()
+            if scheduled >= stop_at:
+                break
+            wait = scheduled - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                call(index)
+            except grpc.RpcError as exc:
+                local_errors[exc.code().name if hasattr(exc, "code") else "RpcError"] += 1
+            except Exception as exc:  # reported, not raised, to keep the run going
+                local_errors[type(exc).__name__] += 1
+            local_latencies.append(time.perf_counter() - scheduled)
+        with lock:
+            latencies.extend(local_latencies)
+            errors.update(local_errors)
+
+    threads = [
+        threading.Thread(target=worker, name=f"sendlix-loadgen-{i}", daemon=True)
+        for i in range(concurrency)
+    ]
+    server.reset()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    email_client.close()
+    group_client.close()
+
+    latencies.sort()
+    failed = sum(errors.values())
+    succeeded = len(latencies) - failed
+    return LoadReport(
+        operation=operation,
+        concurrency=concurrency,
+        duration=elapsed,
+        requests=len(latencies),
+        succeeded=succeeded,
+        errors=dict(errors),
+        throughput=succeeded / elapsed if elapsed else 0.0,
+        p50_ms=percentile(latencies, 0.50) * 1000,
+        p95_ms=percentile(latencies, 0.95) * 1000,
+        p99_ms=percentile(latencies, 0.99) * 1000,
+        max_ms=(latencies[-1] * 1000) if latencies else 0.0,
+        server_calls=dict(server.calls),
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m sendlix.testing.loadgen",
+        description="Load-test the Sendlix clients against a local fake server.")
+    parser.add_argument("--operation", choices=OPERATIONS, default="send_email")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--requests", type=int, help="stop after this many requests")
+    parser.add_argument("--rate", type=float, help="target requests per second")
+    parser.add_argument("--recipients", type=int, default=1)
+    parser.add_argument("--subchannels", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0, help="server latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--emails-left", type=int, default=None)
+    parser.add_argument("--server-workers", type=int, default=64)
+    parser.add_argument("--no-retry", action="store_true",
+                        help="disable client retries so injected errors surface")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    server_options = {}
+    if args.emails_left is not None:
+        server_options["emails_left"] = args.emails_left
+    policy = CallPolicy(retry=None) if args.no_retry else None
+
+    with FakeSendlixServer(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        max_workers=args.server_workers,
+        **server_options,
+    ) as server:
+        report = run_load(
+            server,
+            operation=args.operation,
+            concurrency=args.concurrency,
+            duration=args.duration,
+            requests=args.requests,
+            rate=args.rate,
+            recipients=args.recipients,
+            subchannels=args.subchannels,
+            policy=policy,
+        )
+
+    print(json.dumps(asdict(report), indent=2) if args.json else report.format())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,250 @@
+"""Pluggable token stores that let several ``Auth`` instances share a JWT.
+
+``Auth`` keeps its own in-memory copy of the token; a store is consulted when
+that copy is missing or expiring. Refreshes happen under the store's lock, so
+across all processes on a host only one of them calls ``GetJwtToken`` while the
+others pick up the token it saved.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import ContextManager, Dict, Iterator, Optional, Protocol
+
+from .auth import _CachedToken
+
+try:  # POSIX
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+    import msvcrt
+
+
+class TokenStore(Protocol):
+    """Storage backend shared between ``Auth`` instances."""
+
+    def load(self, key: str) -> Optional[_CachedToken]:
+        ...
+
+    def save(self, key: str, token: _CachedToken) -> None:
+        ...
+
+    def lock(self, key: str) -> ContextManager[None]:
+        """Exclusive lock held by whoever refreshes the token for ``key``."""
+        ...
+
+
+class MemoryTokenStore:
+    """Shares tokens between ``Auth`` instances inside one process."""
+
+    def __init__(self) -> None:
+        self._tokens: Dict[str, _CachedToken] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    def load(self, key: str) -> Optional[_CachedToken]:
+        return self._tokens.get(key)
+
+    def save(self, key: str, token: _CachedToken) -> None:
+        self._tokens[key] = token
+
+    def lock(self, key: str) -> ContextManager[None]:
+        with self._guard:
+            lock = self._locks.setdefault(key, threading.Lock())
+        return lock
+
+
+class _FileLock:
+    """Advisory exclusive lock on a file, held across processes."""
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+
+    @contextlib.contextmanager
+    def hold(self) -> Iterator[None]:
+        fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            _lock_fd(fd)
+            try:
+                yield
+            finally:
+                _unlock_fd(fd)
+        finally:
+            os.close(fd)
+
+
+def _lock_fd(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        return
+    while True:  # pragma: no cover - Windows
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return
+        except OSError:
+            time.sleep(0.01)
+
+
+def _unlock_fd(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:  # pragma: no cover - Windows
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+class FileTokenStore:
+    """Persists tokens as JSON files, replaced atomically on every save.
+
+    Files are created with ``0600`` permissions; the directory defaults to the
+    system temporary directory and must be local to the host.
+    """
+
+    def __init__(self, directory: str | Path | None = None) -> None:
+        self._directory = Path(directory or tempfile.gettempdir())
+        self._directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self._directory / f"sendlix-token-{key}.json"
+
+    def load(self, key: str) -> Optional[_CachedToken]:
+        try:
+            payload = json.loads(self._path(key).read_text(encoding="utf-8"))
+            return _CachedToken(
+                payload["token"], payload["expires_at"], payload.get("issued_at", 0.0))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, key: str, token: _CachedToken) -> None:
+        target = self._path(key)
+        payload = json.dumps({
+            "token": token.value,
+            "expires_at": token.expires_at,
+            "issued_at": token.issued_at,
+        })
+        fd, tmp_name = tempfile.mkstemp(
+            prefix=f".{target.name}.", dir=self._directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                handle.write(payload)
+            os.replace(tmp_name, target)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_name)
+            raise
+
+    def lock(self, key: str) -> ContextManager[None]:
+        return _FileLock(self._directory / f"sendlix-token-{key}.lock").hold()
+
+
+# seq (u32), token length (u32), expires_at (f64), issued_at (f64)
+_SHM_HEADER = struct.Struct("<IIdd")
+
+
+class SharedMemoryTokenStore:
+    """Keeps tokens in named shared memory segments.
+
+    Readers never take a lock: writers bump a sequence number before and after
+    each update and readers retry if it changed underneath them. Segments
+    outlive individual worker processes so a restarted worker finds the token
+    immediately.
+    """
+
+    def __init__(self, *, size: int = 8192, lock_directory: str | Path | None = None) -> None:
+        if size <= _SHM_HEADER.size:
+            raise ValueError("size is too small to hold a token")
+        self._size = size
+        self._lock_directory = Path(lock_directory or tempfile.gettempdir())
+        self._lock_directory.mkdir(parents=True, exist_ok=True)
+        self._segments: Dict[str, object] = {}
+        self._guard = threading.Lock()
+
+    def _segment(self, key: str):
+        with self._guard:
+            segment = self._segments.get(key)
+            if segment is None:
+                segment = _open_segment(f"sendlix_{key}", self._size)
+                self._segments[key] = segment
+            return segment
+
+    def load(self, key: str) -> Optional[_CachedToken]:
+        buffer = self._segment(key).buf
+        for _ in range(100):
+            seq, length, expires_at, issued_at = _SHM_HEADER.unpack_from(buffer)
+            if seq % 2:
+                time.sleep(0)
+                continue
+            data = bytes(buffer[_SHM_HEADER.size:_SHM_HEADER.size + length])
+            if _SHM_HEADER.unpack_from(buffer)[0] == seq:
+                if not length:
+                    return None
+                return _CachedToken(data.decode("utf-8"), expires_at, issued_at)
+        return None
+
+    def save(self, key: str, token: _CachedToken) -> None:
+        data = token.value.encode("utf-8")
+        buffer = self._segment(key).buf
+        if len(data) > len(buffer) - _SHM_HEADER.size:
+            raise ValueError("token does not fit into the shared memory segment")
+        seq = _SHM_HEADER.unpack_from(buffer)[0]
+        struct.pack_into("<I", buffer, 0, seq + 1)
+        buffer[_SHM_HEADER.size:_SHM_HEADER.size + len(data)] = data
+        _SHM_HEADER.pack_into(
+            buffer, 0, seq + 1, len(data), token.expires_at, token.issued_at)
+        struct.pack_into("<I", buffer, 0, (seq + 2) & 0xFFFFFFFF)
+
+    def lock(self, key: str) -> ContextManager[None]:
+        return _FileLock(self._lock_directory / f"sendlix-shm-{key}.lock").hold()
+
+    def remove(self, key: str) -> None:
+        """Delete the segment for ``key`` so the next load starts empty."""
+
+        with self._guard:
+            segment = self._segments.pop(key, None)
+        if segment is None:
+            segment = _open_segment(f"sendlix_{key}", self._size)
+        if sys.version_info < (3, 13):
+            from multiprocessing import resource_tracker
+
+            # Balance the unregister in _open_segment; unlink() unregisters.
+            resource_tracker.register(segment._name, "shared_memory")  # type: ignore[attr-defined]
+        segment.close()
+        segment.unlink()
+
+    def close(self) -> None:
+        """Detach from all segments without removing them."""
+
+        with self._guard:
+            segments = list(self._segments.values())
+            self._segments.clear()
+        for segment in segments:
+            segment.close()
+
+
+def _open_segment(name: str, size: int):
+    from multiprocessing import shared_memory
+
+    kwargs = {"track": False} if sys.version_info >= (3, 13) else {}
+    try:
+        segment = shared_memory.SharedMemory(name=name, **kwargs)
+    except FileNotFoundError:
+        try:
+            segment = shared_memory.SharedMemory(
+                name=name, create=True, size=size, **kwargs)
+        except FileExistsError:
+            segment = shared_memory.SharedMemory(name=name, **kwargs)
+    if not kwargs:
+        # Before 3.13 the resource tracker unlinks segments when the process
+        # that touched them exits, which would defeat sharing across workers.
+        from multiprocessing import resource_tracker
+
+        resource_tracker.unregister(segment._name, "shared_memory")  # type: ignore[attr-defined]
+    return segment
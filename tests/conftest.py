@@ -12,6 +12,14 @@ class _DummyChannel:
         pass
 
 
+class _DummyAsyncChannel:
+    def __init__(self, interceptors=None) -> None:
+        self.interceptors = list(interceptors or ())
+
+    async def close(self) -> None:
+        pass
+
+
 class _FixtureAuthStub:
     def __init__(self, channel):
         self.channel = channel
@@ -26,8 +34,11 @@ class _FixtureAuthStub:
 def patch_grpc_transports(monkeypatch: pytest.MonkeyPatch) -> None:
     """Prevent tests from opening real network connections."""
 
-    import sendlix.clients.client as client_module
+    import grpc
+    import grpc.aio
+
     import sendlix.auth as auth_module
+    import sendlix.channels as channels_module
 
     def metadata_call_credentials(callback):
         return ("metadata", callback)
@@ -41,14 +52,22 @@ def patch_grpc_transports(monkeypatch: pytest.MonkeyPatch) -> None:
     def secure_channel(host, credentials, options=None):  # noqa: D401
         return _DummyChannel()
 
-    for module in (client_module.grpc, auth_module.grpc):
-        monkeypatch.setattr(
-            module, "metadata_call_credentials", metadata_call_credentials)
-        monkeypatch.setattr(module, "ssl_channel_credentials",
-                            ssl_channel_credentials)
-        monkeypatch.setattr(
-            module, "composite_channel_credentials", composite_channel_credentials)
-        monkeypatch.setattr(module, "secure_channel", secure_channel)
+    def aio_secure_channel(host, credentials, options=None, interceptors=None):
+        return _DummyAsyncChannel(interceptors)
+
+    monkeypatch.setattr(
+        grpc, "metadata_call_credentials", metadata_call_credentials)
+    monkeypatch.setattr(grpc, "ssl_channel_credentials",
+                        ssl_channel_credentials)
+    monkeypatch.setattr(
+        grpc, "composite_channel_credentials", composite_channel_credentials)
+    monkeypatch.setattr(grpc, "secure_channel", secure_channel)
+
+    monkeypatch.setattr(grpc.aio, "secure_channel", aio_secure_channel)
+
+    # Each test starts from an empty process-wide channel pool.
+    monkeypatch.setattr(channels_module, "_default_pool",
+                        channels_module.ChannelPool())
 
     monkeypatch.setattr(auth_module.auth_pb2_grpc, "AuthStub",
                         lambda channel: _FixtureAuthStub(channel))
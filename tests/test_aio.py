@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import grpc.aio
+import pytest
+
+import sendlix.aio.auth as aio_auth_module
+import sendlix.aio.email_client as aio_email_module
+import sendlix.aio.group_client as aio_group_module
+from sendlix.aio import AsyncAuth, AsyncEmailClient, AsyncGroupClient
+from sendlix.aio.client import _AuthMetadataInterceptor
+from sendlix.proto import auth_pb2, email_pb2, group_pb2
+
+
+class _FakeAsyncAuthStub:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def GetJwtToken(self, request):
+        self.calls += 1
+        await asyncio.sleep(0)
+        response = auth_pb2.AuthResponse(token="async-token")
+        response.expires.seconds = 60
+        return response
+
+
+class _FakeAsyncEmailStub:
+    def __init__(self) -> None:
+        self.sent_emails: list[email_pb2.SendMailRequest] = []
+        self.raw_emails: list[email_pb2.EmlMailRequest] = []
+
+    async def SendEmail(self, request):
+        self.sent_emails.append(request)
+        return email_pb2.SendEmailResponse(message=["msg-1"])
+
+    async def SendEmlEmail(self, request):
+        self.raw_emails.append(request)
+        return email_pb2.SendEmailResponse(message=["raw-msg"])
+
+
+class _FakeAsyncGroupStub:
+    def __init__(self) -> None:
+        self.insert_response = group_pb2.UpdateResponse(success=True)
+
+    async def InsertEmailToGroup(self, request):
+        return self.insert_response
+
+    async def CheckEmailInGroup(self, request):
+        return group_pb2.CheckEmailInGroupResponse(exists=True)
+
+
+def test_async_auth_fetches_token_once_for_concurrent_callers(monkeypatch: pytest.MonkeyPatch):
+    stub = _FakeAsyncAuthStub()
+    monkeypatch.setattr(aio_auth_module.auth_pb2_grpc,
+                        "AuthStub", lambda channel: stub)
+
+    async def scenario():
+        auth = AsyncAuth("secret.7")
+        headers = await asyncio.gather(*(auth.get_auth_header() for _ in range(10)))
+        await auth.close()
+        return headers
+
+    headers = asyncio.run(scenario())
+    assert set(headers) == {("authorization", "Bearer async-token")}
+    assert stub.calls == 1
+
+
+def test_auth_interceptor_adds_header():
+    class _StaticAuth:
+        async def get_auth_header(self):
+            return "authorization", "Bearer abc"
+
+    captured = {}
+
+    async def continuation(details, request):
+        captured["metadata"] = list(details.metadata)
+        return "call"
+
+    async def scenario():
+        details = grpc.aio.ClientCallDetails(
+            "/sendlix.api.v1.Email/SendEmail", None, None, None, None)
+        interceptor = _AuthMetadataInterceptor(_StaticAuth())
+        return await interceptor.intercept_unary_unary(continuation, details, object())
+
+    assert asyncio.run(scenario()) == "call"
+    assert captured["metadata"] == [("authorization", "Bearer abc")]
+
+
+def test_async_send_email_uses_shared_validation(monkeypatch: pytest.MonkeyPatch):
+    stub = _FakeAsyncEmailStub()
+    monkeypatch.setattr(aio_email_module.email_pb2_grpc,
+                        "EmailStub", lambda channel: stub)
+
+    async def scenario():
+        client = AsyncEmailClient("secret.1")
+        result = await client.send_email(
+            {
+                "from": "sender@example.com",
+                "to": ["a@example.com"],
+                "subject": "Hi",
+                "text": "Hello",
+            }
+        )
+        with pytest.raises(ValueError):
+            await client.send_email(
+                {"from": "a@example.com", "to": ["b@example.com"], "subject": "Hi"})
+        return result
+
+    assert asyncio.run(scenario()) == ["msg-1"]
+    assert stub.sent_emails[0].to[0].email == "a@example.com"
+
+
+def test_async_send_eml_email_reads_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    stub = _FakeAsyncEmailStub()
+    monkeypatch.setattr(aio_email_module.email_pb2_grpc,
+                        "EmailStub", lambda channel: stub)
+    eml_file = tmp_path / "mail.eml"
+    eml_file.write_bytes(b"From: example@example.com")
+
+    async def scenario():
+        return await AsyncEmailClient("secret.1").send_eml_email(eml_file)
+
+    assert asyncio.run(scenario()) == ["raw-msg"]
+    assert stub.raw_emails[0].mail == b"From: example@example.com"
+
+
+def test_async_group_client(monkeypatch: pytest.MonkeyPatch):
+    stub = _FakeAsyncGroupStub()
+    monkeypatch.setattr(aio_group_module.group_pb2_grpc,
+                        "GroupStub", lambda channel: stub)
+
+    async def scenario():
+        client = AsyncGroupClient("secret.2")
+        assert await client.contains_email_in_group("group-1", "a@example.com")
+        stub.insert_response = group_pb2.UpdateResponse(
+            success=False, message="failure")
+        with pytest.raises(RuntimeError):
+            await client.insert_email_into_group("group-1", "a@example.com")
+
+    asyncio.run(scenario())
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from google.protobuf.timestamp_pb2 import Timestamp
 
@@ -43,3 +46,69 @@ def test_auth_caches_token(monkeypatch: pytest.MonkeyPatch):
     auth.invalidate_cache()
     auth.get_auth_header()
     assert fake_stub.calls == 2
+
+
+class _SlowAuthStub(_FakeAuthStub):
+    def __init__(self, channel):
+        super().__init__(channel)
+        self.release = threading.Event()
+
+    def GetJwtToken(self, request):
+        self.release.wait(timeout=5)
+        return super().GetJwtToken(request)
+
+
+def test_auth_refresh_is_single_flight(monkeypatch: pytest.MonkeyPatch):
+    fake_stub = _SlowAuthStub(None)
+    monkeypatch.setattr(auth_module.auth_pb2_grpc,
+                        "AuthStub", lambda channel: fake_stub)
+    auth = Auth("secret.42")
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(auth.get_auth_header) for _ in range(8)]
+        fake_stub.release.set()
+        headers = {future.result() for future in futures}
+
+    assert headers == {("authorization", "Bearer token-123")}
+    assert fake_stub.calls == 1
+    stats = auth.stats
+    assert stats.misses == 1
+    assert stats.refreshes == 1
+    assert stats.hits == 7
+
+
+def test_auth_refreshes_ahead_of_expiry_in_background(monkeypatch: pytest.MonkeyPatch):
+    fake_stub = _FakeAuthStub(None)
+    monkeypatch.setattr(auth_module.auth_pb2_grpc,
+                        "AuthStub", lambda channel: fake_stub)
+    clock = [1000.0]
+    monkeypatch.setattr(auth_module.time, "time", lambda: clock[0])
+
+    auth = Auth("secret.42", refresh_ahead=20)
+    auth.get_auth_header()
+    clock[0] += 10  # still outside the refresh-ahead window
+    auth.get_auth_header()
+    assert fake_stub.calls == 1
+
+    clock[0] += 35  # 15 seconds left: served from cache, refreshed behind
+    assert auth.get_auth_header() == ("authorization", "Bearer token-123")
+    auth._refresh_thread.join(timeout=5)
+
+    assert fake_stub.calls == 2
+    assert auth._token_cache.expires_at == clock[0] + 60
+    stats = auth.stats
+    assert stats.background_refreshes == 1
+    assert stats.hits == 2
+
+
+def test_auth_counts_refresh_errors(monkeypatch: pytest.MonkeyPatch):
+    class _EmptyAuthStub:
+        def GetJwtToken(self, request):
+            return auth_pb2.AuthResponse()
+
+    monkeypatch.setattr(auth_module.auth_pb2_grpc,
+                        "AuthStub", lambda channel: _EmptyAuthStub())
+    auth = Auth("secret.42")
+    with pytest.raises(RuntimeError):
+        auth.get_auth_header()
+    assert auth.stats.refresh_errors == 1
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import grpc
+import pytest
+
+import sendlix.clients.email_client as email_module
+import sendlix.clients.group_client as group_module
+from sendlix.channels import ChannelConfig, ChannelPool, _ClientCallDetails, _RoundRobinChannel
+from sendlix.clients.client import _AuthMetadataInterceptor
+from sendlix.clients.email_client import EmailClient
+from sendlix.clients.group_client import GroupClient
+
+
+class _RecordingChannel:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.closed = False
+
+    def unary_unary(self, method, *args, **kwargs):
+        return lambda request, **call_kwargs: (self.name, request)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture()
+def opened_channels(monkeypatch: pytest.MonkeyPatch) -> list[_RecordingChannel]:
+    opened: list[_RecordingChannel] = []
+
+    def secure_channel(host, credentials, options=None):
+        channel = _RecordingChannel(f"{host}#{len(opened)}")
+        opened.append(channel)
+        return channel
+
+    monkeypatch.setattr(grpc, "secure_channel", secure_channel)
+    return opened
+
+
+def test_pool_shares_channel_per_host_and_config(opened_channels):
+    pool = ChannelPool()
+    first = pool.acquire("api.example:443")
+    second = pool.acquire("api.example:443")
+    keepalive = pool.acquire(
+        "api.example:443", ChannelConfig(keepalive_time_ms=30_000))
+
+    assert len(opened_channels) == 2
+    assert len(pool) == 2
+
+    first.close()
+    first.close()  # releasing twice must not drop another lease's reference
+    assert not opened_channels[0].closed
+    second.close()
+    assert opened_channels[0].closed
+    keepalive.close()
+    assert len(pool) == 0
+
+
+def test_subchannels_spread_calls_round_robin(opened_channels):
+    pool = ChannelPool()
+    lease = pool.acquire("api.example:443", ChannelConfig(subchannels=3))
+    call = lease.unary_unary("/svc/Method")
+
+    targets = [call(i)[0] for i in range(6)]
+
+    assert len(opened_channels) == 3
+    assert targets == [channel.name for channel in opened_channels] * 2
+
+
+def test_channel_config_options():
+    options = dict(ChannelConfig(
+        subchannels=2,
+        keepalive_time_ms=10_000,
+        keepalive_timeout_ms=2_000,
+        keepalive_permit_without_calls=True,
+    ).channel_options())
+
+    assert options["grpc.keepalive_time_ms"] == 10_000
+    assert options["grpc.keepalive_timeout_ms"] == 2_000
+    assert options["grpc.keepalive_permit_without_calls"] == 1
+    assert options["grpc.use_local_subchannel_pool"] == 1
+    with pytest.raises(ValueError):
+        ChannelConfig(subchannels=0)
+
+
+def test_clients_and_auth_share_one_connection(opened_channels, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(email_module.email_pb2_grpc,
+                        "EmailStub", lambda channel: object())
+    monkeypatch.setattr(group_module.group_pb2_grpc,
+                        "GroupStub", lambda channel: object())
+    pool = ChannelPool()
+
+    email_client = EmailClient("secret.1", channel_pool=pool)
+    group_client = GroupClient(email_client._auth, channel_pool=pool)
+    # Channels are only opened on first use.
+    assert opened_channels == []
+
+    email_client.client
+    group_client.client
+    email_client._auth.get_auth_header()
+
+    assert len(opened_channels) == 1
+    group_client.close()
+    email_client.close()
+    assert opened_channels[0].closed
+    assert len(pool) == 0
+
+
+def test_auth_interceptor_appends_header():
+    class _StaticAuth:
+        def get_auth_header(self):
+            return "authorization", "Bearer abc"
+
+    captured = {}
+
+    def continuation(details, request):
+        captured["details"] = details
+        return "outcome"
+
+    details = _ClientCallDetails(
+        "/svc/Method", None, [("x-trace", "1")], None, None, None)
+    outcome = _AuthMetadataInterceptor(_StaticAuth()).intercept_unary_unary(
+        continuation, details, object())
+
+    assert outcome == "outcome"
+    assert captured["details"].metadata == [
+        ("x-trace", "1"), ("authorization", "Bearer abc")]
+    assert captured["details"].method == "/svc/Method"
+
+
+def test_round_robin_channel_closes_all():
+    channels = [_RecordingChannel("a"), _RecordingChannel("b")]
+    _RoundRobinChannel(channels).close()
+    assert all(channel.closed for channel in channels)
+
+
+def test_closed_client_cannot_reconnect(opened_channels):
+    pool = ChannelPool()
+    client = GroupClient("secret.1", channel_pool=pool)
+    client.close()
+
+    with pytest.raises(RuntimeError):
+        client.client
+    assert opened_channels == []
+
+
+def test_subchannels_spread_client_calls(monkeypatch: pytest.MonkeyPatch):
+    from sendlix.testing import FakeSendlixServer
+
+    calls: list[int] = []
+    insecure_channel = grpc.insecure_channel
+
+    class _CountingChannel(grpc.Channel):
+        def __init__(self, index: int, channel: grpc.Channel) -> None:
+            self._index = index
+            self._channel = channel
+
+        def unary_unary(self, method, *args, **kwargs):
+            call = self._channel.unary_unary(method, *args, **kwargs)
+            index = self._index
+
+            class _Counting:
+                def __getattr__(self, name):
+                    calls.append(index)
+                    return getattr(call, name)
+
+                def __call__(self, *call_args, **call_kwargs):
+                    calls.append(index)
+                    return call(*call_args, **call_kwargs)
+
+            return _Counting()
+
+        unary_stream = stream_unary = stream_stream = unary_unary
+
+        def subscribe(self, callback, try_to_connect=False):
+            self._channel.subscribe(callback, try_to_connect)
+
+        def unsubscribe(self, callback):
+            self._channel.unsubscribe(callback)
+
+        def close(self) -> None:
+            self._channel.close()
+
+    opened: list[int] = []
+
+    def counting_insecure_channel(host, options=None, **kwargs):
+        opened.append(len(opened))
+        return _CountingChannel(opened[-1], insecure_channel(host, options=options, **kwargs))
+
+    monkeypatch.setattr(grpc, "insecure_channel", counting_insecure_channel)
+    mail = {"from": "a@example.com", "to": ["b@example.com"], "subject": "s", "text": "t"}
+    with FakeSendlixServer() as server:
+        client = EmailClient("key.1", **server.client_options(subchannels=4))
+        for _ in range(8):
+            client.send_email(mail)
+        client.close()
+
+    assert len(opened) == 4
+    assert sorted(set(calls)) == [0, 1, 2, 3]
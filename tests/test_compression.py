@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import grpc
+import pytest
+
+from sendlix.channels import ChannelConfig, ChannelPool, _ClientCallDetails
+from sendlix.clients.email_client import EmailClient
+from sendlix.clients.group_client import GroupClient
+from sendlix.compression import CompressionPolicy, _CompressionInterceptor
+from sendlix.testing import FakeSendlixServer
+
+_BIG_MAIL = {"from": "a@example.com", "to": ["b@example.com"], "subject": "s",
+             "html": "<p>Hello there, this repeats.</p>" * 2000}
+_SMALL_MAIL = {"from": "a@example.com", "to": ["b@example.com"], "subject": "s", "text": "t"}
+
+
+def _details(method: str):
+    return _ClientCallDetails(method, None, None, None, None, None)
+
+
+def test_only_large_requests_are_compressed():
+    interceptor = _CompressionInterceptor(CompressionPolicy(min_size=100, sample_every=1))
+    seen = []
+
+    def continuation(details, request):
+        seen.append(details.compression)
+
+    interceptor.intercept_unary_unary(continuation, _details("/svc/SendEmail"), b"x" * 99)
+    interceptor.intercept_unary_unary(continuation, _details("/svc/SendEmail"), b"x" * 1000)
+
+    assert seen == [None, grpc.Compression.Gzip]
+    stats = interceptor.stats
+    assert (stats.requests, stats.compressed_requests, stats.compressed_bytes_in) == (2, 1, 1000)
+    assert stats.ratio < 0.1
+    assert stats.estimated_bytes_saved > 900
+
+
+def test_methods_filter_and_invalid_policy():
+    policy = CompressionPolicy(min_size=0, methods=frozenset({"SendEmlEmail"}))
+
+    assert policy.applies_to("SendEmlEmail", 10)
+    assert not policy.applies_to("SendEmail", 10_000)
+    with pytest.raises(ValueError):
+        CompressionPolicy(min_size=-1)
+
+
+def test_compressed_calls_reach_the_server():
+    with FakeSendlixServer() as server:
+        options = server.client_options()
+        client = EmailClient("key.1", compression=CompressionPolicy(min_size=1024), **options)
+
+        assert client.send_email(_BIG_MAIL)
+        assert client.send_email(_SMALL_MAIL)
+        stats = client.compression_stats
+        assert (stats.requests, stats.compressed_requests) == (2, 1)
+        assert stats.ratio is not None and stats.ratio < 0.5
+        client.close()
+
+        config = ChannelConfig(insecure=True, compression=grpc.Compression.Gzip)
+        group_client = GroupClient("key.1", host=server.address, channel_config=config,
+                                   channel_pool=ChannelPool())
+        assert group_client.insert_email_into_group("g", "x@example.com")
+        assert group_client.compression_stats is None
+        group_client.close()
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import itertools
+import mmap
 from pathlib import Path
 
 import pytest
 
 import sendlix.clients.email_client as email_module
-from sendlix.clients.email_client import EmailClient
+from sendlix.clients.content_cache import ContentCache, data_key
+from sendlix.clients.email_client import EmailClient, MailTemplate
 from sendlix.proto import email_pb2
+from sendlix.rate_limit import QuotaExhaustedError, RateLimiter
 
 
 class _FakeEmailStub:
@@ -34,11 +38,29 @@ class _FakeEmailStub:
         return email_pb2.SendEmailResponse()
 
 
+class _FakeRawEmailStub:
+    """Decodes pre-serialized requests and forwards them to the fake stub."""
+
+    def __init__(self, stub: _FakeEmailStub) -> None:
+        self.stub = stub
+        self.payloads: list[bytes] = []
+
+    def SendEmail(self, payload, **kwargs):
+        self.payloads.append(payload)
+        return self.stub.SendEmail(email_pb2.SendMailRequest.FromString(payload))
+
+    def SendEmlEmail(self, payload, **kwargs):
+        self.payloads.append(payload)
+        return self.stub.SendEmlEmail(email_pb2.EmlMailRequest.FromString(payload))
+
+
 @pytest.fixture()
 def fake_email_stub(monkeypatch: pytest.MonkeyPatch) -> _FakeEmailStub:
     stub = _FakeEmailStub(None)
     monkeypatch.setattr(email_module.email_pb2_grpc,
                         "EmailStub", lambda channel: stub)
+    monkeypatch.setattr(email_module, "_RawEmailStub",
+                        lambda channel: _FakeRawEmailStub(stub))
     return stub
 
 
@@ -117,3 +139,178 @@ def test_send_group_email_requires_fields(fake_email_stub: _FakeEmailStub):
     client = EmailClient("secret.1")
     with pytest.raises(ValueError):
         client.send_group_email({"groupId": "missing"})
+
+
+def test_send_many_reports_results_in_order(fake_email_stub: _FakeEmailStub):
+    client = EmailClient("secret.1")
+    mails = [
+        {"from": "sender@example.com", "to": [f"user{i}@example.com"],
+         "subject": "Hi", "text": "Hello"}
+        for i in range(20)
+    ]
+    mails[3] = {"from": "sender@example.com", "to": ["bad"], "subject": "Hi", "text": "x"}
+
+    results = list(client.send_many(mails, concurrency=4))
+
+    assert [result.index for result in results] == list(range(20))
+    assert not results[3].ok and isinstance(results[3].error, ValueError)
+    assert all(result.message_ids == ["msg-1", "msg-2"]
+               for result in results if result.index != 3)
+    assert len(fake_email_stub.sent_emails) == 19
+
+
+def test_send_many_bounds_pending_input(fake_email_stub: _FakeEmailStub):
+    client = EmailClient("secret.1")
+    pulled = []
+
+    def generate():
+        for i in itertools.count():
+            pulled.append(i)
+            yield {"from": "sender@example.com", "to": ["a@example.com"],
+                   "subject": "Hi", "text": str(i)}
+
+    results = client.send_many(generate(), concurrency=3, ordered=False)
+    first = [next(results) for _ in range(5)]
+    results.close()
+
+    assert all(result.ok for result in first)
+    # Never more than `concurrency` messages are read ahead of the consumer.
+    assert len(pulled) <= 5 + 3
+
+
+def test_template_render_matches_full_request():
+    options = {
+        "from": {"email": "sender@example.com", "name": "Sender"},
+        "subject": "Hello",
+        "html": "<p>Hi</p>",
+        "bcc": ["archive@example.com"],
+        "replyTo": "reply@example.com",
+        "images": [{"placeholder": "logo", "data": b"123", "type": "PNG"}],
+    }
+    additional = {"category": "welcome"}
+    template = MailTemplate(options, additional)
+
+    rendered = template.build(to=["a@example.com"], cc="cc@example.com")
+    expected = email_module._build_send_mail_request(
+        {**options, "to": ["a@example.com"], "cc": ["cc@example.com"]}, additional)
+
+    assert rendered == expected
+
+
+def test_template_validation():
+    with pytest.raises(ValueError):
+        MailTemplate({"from": "a@example.com", "subject": "Hi"})
+    template = MailTemplate(
+        {"from": "a@example.com", "subject": "Hi", "text": "Hello"})
+    with pytest.raises(ValueError):
+        template.render()
+    with pytest.raises(ValueError):
+        template.render(to=["not-an-email"])
+
+
+def test_send_template_sends_serialized_request(fake_email_stub: _FakeEmailStub):
+    client = EmailClient("secret.1")
+    template = client.compile_template(
+        {"from": "sender@example.com", "subject": "Hi", "text": "Hello"})
+
+    for recipient in ("a@example.com", "b@example.com"):
+        assert client.send_template(template, to=recipient) == ["msg-1", "msg-2"]
+
+    assert [request.to[0].email for request in fake_email_stub.sent_emails] == [
+        "a@example.com", "b@example.com"]
+    assert all(getattr(request, "from").email == "sender@example.com"
+               for request in fake_email_stub.sent_emails)
+
+
+def test_content_cache_reuses_built_content(fake_email_stub: _FakeEmailStub):
+    cache = ContentCache()
+    client = EmailClient("secret.1", content_cache=cache)
+    logo = bytearray(b"\x89PNG" * 100)
+    for recipient in ("a@example.com", "b@example.com", "c@example.com"):
+        client.send_email({
+            "from": "sender@example.com",
+            "to": [recipient],
+            "subject": "Hi",
+            "html": "<p>Hi</p>",
+            "images": [{"placeholder": "logo", "data": logo, "type": "png"}],
+        })
+
+    requests = fake_email_stub.sent_emails
+    assert requests[0].TextContent == requests[2].TextContent
+    assert requests[0].TextContent.Images[0].Image == bytes(logo)
+    assert requests[0].TextContent.Images[0].type == email_pb2.MimeType.PNG
+    stats = cache.stats
+    assert (stats.hits, stats.misses) == (2, 1)
+    assert stats.hit_rate == pytest.approx(2 / 3)
+    # The image is stored once, inside the content.
+    assert len(cache) == 1
+    assert cache.size_bytes == requests[0].TextContent.ByteSize()
+
+
+def test_content_cache_evicts_by_size():
+    cache = ContentCache(max_bytes=1500)
+    for i in range(3):
+        email_module._build_mail_content({"html": str(i) * 600}, cache)
+
+    assert len(cache) == 2
+    assert cache.size_bytes <= 1500
+    assert cache.stats.evictions == 1
+
+
+def test_content_cache_keys_large_content_by_digest():
+    cache = ContentCache()
+    html = "<p>" + "x" * 100_000 + "</p>"
+    logo = b"\x89PNG" * 10_000
+    source = {"html": html, "images": [{"placeholder": "logo", "data": logo}]}
+
+    first = email_module._build_mail_content(source, cache)
+    assert email_module._build_mail_content(dict(source), cache) is first
+    assert first.html == html and first.Images[0].Image == logo
+    assert all(len(repr(key)) < 500 for key in cache._entries)
+    assert data_key("short") == "short"
+    assert data_key(b"x" * 16) != data_key(b"x" * 1000)
+
+
+@pytest.mark.parametrize("kind", ["path", "bytes", "bytearray", "memoryview", "mmap"])
+def test_serialize_eml_request_matches_protobuf(tmp_path: Path, kind: str):
+    body = b"From: example@example.com\r\n\r\n" + b"x" * 300
+    eml_file = tmp_path / "mail.eml"
+    eml_file.write_bytes(body)
+    additional = {"category": "newsletter"}
+
+    with open(eml_file, "rb") as handle:
+        mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        sources = {
+            "path": eml_file,
+            "bytes": body,
+            "bytearray": bytearray(body),
+            "memoryview": memoryview(body),
+            "mmap": mapped,
+        }
+        payload = email_module._serialize_eml_request(sources[kind], additional)
+        mapped.close()
+
+    expected = email_pb2.EmlMailRequest(mail=body)
+    expected.additionalInfos.category = "newsletter"
+    assert email_pb2.EmlMailRequest.FromString(payload) == expected
+
+
+def test_serialize_empty_eml_file(tmp_path: Path):
+    eml_file = tmp_path / "empty.eml"
+    eml_file.write_bytes(b"")
+    assert email_module._serialize_eml_request(eml_file) == b""
+
+
+def test_email_client_tracks_quota_and_stops(fake_email_stub: _FakeEmailStub):
+    mail = {"from": "a@example.com", "to": ["b@example.com"], "subject": "s", "text": "t"}
+    limiter = RateLimiter(reserve=123)
+    client = EmailClient("secret.1", rate_limiter=limiter)
+    assert client.emails_left is None
+
+    client.send_email(mail)
+
+    assert client.emails_left == 123
+    assert limiter.emails_left == 123
+    with pytest.raises(QuotaExhaustedError):
+        client.send_email(mail)
+    assert len(fake_email_stub.sent_emails) == 1
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import grpc
+import pytest
+
+from sendlix.clients.email_client import EmailClient
+from sendlix.clients.group_client import GroupClient
+from sendlix.policy import CallPolicy
+from sendlix.proto import group_pb2, group_pb2_grpc
+from sendlix.testing import FakeSendlixServer
+from sendlix.testing.loadgen import percentile, run_load
+
+_MAIL = {"from": "a@example.com", "to": ["b@example.com", "c@example.com"],
+         "subject": "s", "text": "t"}
+
+
+@pytest.fixture()
+def server():
+    with FakeSendlixServer(emails_left=3) as fake:
+        yield fake
+
+
+def test_email_client_round_trip_and_quota(server: FakeSendlixServer):
+    client = EmailClient("key.1", **server.client_options())
+
+    message_ids = client.send_email(_MAIL)
+
+    assert len(message_ids) == 2
+    assert client.emails_left == 1
+    with pytest.raises(grpc.RpcError) as excinfo:
+        client.send_email(_MAIL)
+    assert excinfo.value.code() == grpc.StatusCode.RESOURCE_EXHAUSTED
+    client.close()
+
+
+def test_group_client_round_trip(server: FakeSendlixServer):
+    client = GroupClient("key.1", **server.client_options())
+
+    assert client.insert_email_into_group("g", ["x@example.com", "y@example.com"])
+    assert client.contains_email_in_group("g", "x@example.com")
+    assert client.delete_email_from_group("g", "x@example.com")
+    assert server.group_members("g") == {"y@example.com"}
+    client.close()
+
+
+def test_injected_errors_and_missing_auth(server: FakeSendlixServer):
+    server.error_rate = 1.0
+    client = GroupClient("key.1", policy=CallPolicy(retry=None), **server.client_options())
+    with pytest.raises(grpc.RpcError) as excinfo:
+        client.contains_email_in_group("g", "x@example.com")
+    assert excinfo.value.code() == grpc.StatusCode.UNAVAILABLE
+    client.close()
+
+    server.error_rate = 0.0
+    with grpc.insecure_channel(server.address) as channel:
+        with pytest.raises(grpc.RpcError) as excinfo:
+            group_pb2_grpc.GroupStub(channel).CheckEmailInGroup(
+                group_pb2.CheckEmailInGroupRequest(email="x@example.com", groupId="g"))
+    assert excinfo.value.code() == grpc.StatusCode.UNAUTHENTICATED
+
+
+def test_run_load_reports_latency_percentiles():
+    with FakeSendlixServer(latency=0.001) as server:
+        report = run_load(server, operation="check", concurrency=4, requests=40)
+
+    assert report.requests == 40
+    assert report.succeeded == 40
+    assert report.server_calls == {"CheckEmailInGroup": 40}
+    assert 0 < report.p50_ms <= report.p99_ms <= report.max_ms
+
+
+def test_run_load_survives_a_failing_warm_up():
+    with FakeSendlixServer(error_rate=1.0) as server:
+        report = run_load(server, operation="check", concurrency=2, requests=10)
+
+    assert report.requests == 10
+    assert report.succeeded == 0
+    assert report.errors == {"UNAVAILABLE": 10}
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 0.5) == 50
+    assert percentile(values, 0.99) == 99
+    assert percentile(values, 1.0) == 100
+    assert percentile([], 0.5) == 0.0
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import wait
+
+import grpc
+import pytest
+
+from sendlix.clients.email_client import EmailClient
+from sendlix.clients.group_client import GroupClient, MembershipCache
+from sendlix.instrumentation import MetricsRecorder
+from sendlix.policy import CallPolicy, CircuitBreaker, CircuitOpenError, RetryPolicy
+from sendlix.testing import FakeSendlixServer
+
+_MAIL = {"from": "a@example.com", "to": ["b@example.com"], "subject": "s", "text": "t"}
+
+
+@pytest.fixture()
+def server():
+    with FakeSendlixServer(seed=1) as fake:
+        yield fake
+
+
+def test_many_sends_in_flight_from_one_thread(server: FakeSendlixServer):
+    recorder = MetricsRecorder()
+    client = EmailClient("key.1", recorder=recorder, **server.client_options())
+    server.latency = 0.05
+
+    start = time.perf_counter()
+    futures = [client.send_email_future(_MAIL) for _ in range(50)]
+    done, _ = wait(futures, timeout=10)
+
+    assert len(done) == 50
+    assert time.perf_counter() - start < 50 * 0.05
+    assert all(len(future.result()) == 1 for future in futures)
+    # Concurrent responses can arrive out of order; the next send settles it.
+    client.send_email(_MAIL)
+    assert client.emails_left == server.emails_left
+    assert recorder.histogram("rpc_duration_seconds", method="SendEmail", code="OK").count == 51
+    client.close()
+
+
+def test_futures_are_retried_without_blocking(server: FakeSendlixServer):
+    policy = CallPolicy(retry=RetryPolicy(max_attempts=20, initial_backoff=0.001, max_backoff=0.01,
+                                         methods=None))
+    client = EmailClient("key.1", policy=policy, **server.client_options())
+    client.send_email(_MAIL)
+    server.error_rate = 0.5
+    server.calls.clear()
+
+    futures = [client.send_eml_email_future(b"Subject: hi\r\n\r\nbody") for _ in range(20)]
+
+    assert all(future.exception(timeout=10) is None for future in futures)
+    assert server.calls["SendEmlEmail"] > 20
+    client.close()
+
+
+def test_errors_and_cancellation(server: FakeSendlixServer):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    client = EmailClient("key.1", policy=CallPolicy(retry=None, circuit_breaker=breaker),
+                         **server.client_options())
+    with pytest.raises(ValueError):
+        client.send_email_future({"from": "a@example.com"})
+
+    server.error_rate = 1.0
+    error = client.send_email_future(_MAIL).exception(timeout=10)
+    assert isinstance(error, grpc.RpcError) and error.code() == grpc.StatusCode.UNAVAILABLE
+    assert isinstance(client.send_email_future(_MAIL).exception(), CircuitOpenError)
+
+    server.error_rate = 0.0
+    server.latency = 1.0
+    slow = EmailClient("key.1", **server.client_options())
+    future = slow.send_email_future(_MAIL)
+    assert future.cancel()
+    assert future.cancelled()
+    client.close()
+    slow.close()
+
+
+def test_group_futures_update_the_membership_cache(server: FakeSendlixServer):
+    cache = MembershipCache()
+    client = GroupClient("key.1", membership_cache=cache, **server.client_options())
+
+    assert client.insert_email_into_group_future("g", ["x@example.com"]).result(timeout=10)
+    assert server.group_members("g") == {"x@example.com"}
+    server.calls.clear()
+    assert client.contains_email_in_group_future("g", "x@example.com").result() is True
+    assert server.calls["CheckEmailInGroup"] == 0
+    assert client.delete_email_from_group_future("g", "x@example.com").result(timeout=10)
+    assert client.contains_email_in_group_future("g", "x@example.com").result() is False
+    client.close()
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import threading
+import time
+
 import pytest
 
+import sendlix.clients._cache as cache_module
 import sendlix.clients.group_client as group_module
-from sendlix.clients.group_client import GroupClient
+from sendlix.clients._cache import MISSING
+from sendlix.clients.group_client import GroupClient, MembershipCache
+from sendlix.clients.group_import import read_csv, read_jsonl
 from sendlix.proto import group_pb2
 
 
@@ -84,3 +90,176 @@ def test_contains_email_in_group(fake_group_stub: _FakeGroupStub):
     assert client.contains_email_in_group("group-1", "a@example.com")
     fake_group_stub.check_response.exists = False
     assert not client.contains_email_in_group("group-1", "a@example.com")
+
+
+class _ChunkRecordingStub(_FakeGroupStub):
+    def __init__(self, channel, failing_chunks=()):
+        super().__init__(channel)
+        self.failing_chunks = set(failing_chunks)
+        self._lock = threading.Lock()
+
+    def InsertEmailToGroup(self, request):
+        with self._lock:
+            self.insert_requests.append(request)
+        first = request.entries[0].email.email
+        if first in self.failing_chunks:
+            return group_pb2.UpdateResponse(success=False, message="rejected")
+        return group_pb2.UpdateResponse(
+            success=True, affectedRows=len(request.entries))
+
+
+def _records(count):
+    for i in range(count):
+        yield {"email": {"email": f"user{i}@example.com"},
+               "substitutions": {"plan": "pro" * 10}}
+
+
+def test_import_emails_chunks_by_serialized_size(monkeypatch: pytest.MonkeyPatch):
+    stub = _ChunkRecordingStub(None)
+    monkeypatch.setattr(group_module.group_pb2_grpc,
+                        "GroupStub", lambda channel: stub)
+    client = GroupClient("secret.2")
+
+    result = client.import_emails(
+        "group-1", _records(500), max_chunk_bytes=4096, concurrency=3)
+
+    assert result.ok
+    assert result.affected_rows == 500
+    assert result.records == 500
+    assert result.chunks == len(stub.insert_requests) > 1
+    assert all(request.ByteSize() <= 4096 for request in stub.insert_requests)
+    assert all(request.groupId == "group-1" for request in stub.insert_requests)
+
+
+def test_import_emails_skip_reports_failures_and_continues(monkeypatch: pytest.MonkeyPatch):
+    stub = _ChunkRecordingStub(None, failing_chunks={"user0@example.com"})
+    monkeypatch.setattr(group_module.group_pb2_grpc,
+                        "GroupStub", lambda channel: stub)
+    client = GroupClient("secret.2")
+    records = list(_records(10))
+    records.insert(4, "not-an-email")
+
+    result = client.import_emails(
+        "group-1", records, fail_handling="SKIP", max_chunk_entries=3)
+
+    assert result.invalid_records[0][0] == 4
+    assert [failure.first_record for failure in result.failures] == [0]
+    assert result.affected_rows == 7
+    assert not result.aborted
+    assert all(request.onFailure == group_pb2.FailureHandler.SKIP
+               for request in stub.insert_requests)
+
+
+def test_import_emails_abort_stops_after_failure(monkeypatch: pytest.MonkeyPatch):
+    stub = _ChunkRecordingStub(None, failing_chunks={"user0@example.com"})
+    monkeypatch.setattr(group_module.group_pb2_grpc,
+                        "GroupStub", lambda channel: stub)
+    client = GroupClient("secret.2")
+
+    result = client.import_emails(
+        "group-1", _records(10_000), max_chunk_entries=10, concurrency=1)
+
+    assert result.aborted
+    assert len(result.failures) == 1
+    assert len(stub.insert_requests) < 10
+
+
+def test_import_emails_reports_malformed_records(monkeypatch: pytest.MonkeyPatch):
+    stub = _ChunkRecordingStub(None)
+    monkeypatch.setattr(group_module.group_pb2_grpc,
+                        "GroupStub", lambda channel: stub)
+    client = GroupClient("secret.2")
+    records = [*_records(5), 42, None, {"email": 5}, *_records(2)]
+
+    skipped = client.import_emails("group-1", records, fail_handling="SKIP")
+    assert [index for index, _ in skipped.invalid_records] == [5, 6, 7]
+    assert skipped.records == 7
+
+    stub.insert_requests.clear()
+    aborted = client.import_emails("group-1", records, max_chunk_entries=10)
+    assert aborted.aborted
+    assert aborted.invalid_records[0][0] == 5
+    assert aborted.unsent_records == [0, 1, 2, 3, 4]
+    assert stub.insert_requests == []
+
+
+class _SlowChunkStub(_ChunkRecordingStub):
+    def InsertEmailToGroup(self, request):
+        if request.entries[0].email.email not in self.failing_chunks:
+            time.sleep(0.05)
+        return super().InsertEmailToGroup(request)
+
+
+def test_import_emails_abort_counts_chunks_in_flight(monkeypatch: pytest.MonkeyPatch):
+    stub = _SlowChunkStub(None, failing_chunks={"user0@example.com"})
+    monkeypatch.setattr(group_module.group_pb2_grpc,
+                        "GroupStub", lambda channel: stub)
+    client = GroupClient("secret.2")
+
+    result = client.import_emails(
+        "group-1", _records(1000), max_chunk_entries=10, concurrency=4)
+
+    assert result.aborted
+    assert len(stub.insert_requests) == result.chunks == 4
+    assert result.affected_rows == result.records == 30
+    assert result.unsent_records[0] == 40
+
+
+def test_read_csv_and_jsonl(tmp_path):
+    csv_file = tmp_path / "members.csv"
+    csv_file.write_text("email,name,plan\na@example.com,A,pro\nb@example.com,,\n")
+    jsonl_file = tmp_path / "members.jsonl"
+    jsonl_file.write_text(
+        '"c@example.com"\n'
+        '{"email": "d@example.com", "name": "D", "substitutions": {"plan": "free"}}\n')
+
+    csv_records = list(read_csv(csv_file))
+    jsonl_records = list(read_jsonl(jsonl_file))
+
+    assert csv_records[0] == {"email": {"email": "a@example.com", "name": "A"},
+                              "substitutions": {"plan": "pro"}}
+    assert csv_records[1] == {"email": {"email": "b@example.com"}, "substitutions": {}}
+    assert jsonl_records[0] == "c@example.com"
+    assert jsonl_records[1] == {"email": {"email": "d@example.com", "name": "D"},
+                                "substitutions": {"plan": "free"}}
+
+
+def test_contains_many_dedupes_and_caches(fake_group_stub: _FakeGroupStub):
+    cache = MembershipCache(max_entries=100, ttl=60)
+    client = GroupClient("secret.2", membership_cache=cache)
+    emails = ["a@example.com", "b@example.com", "a@example.com"]
+
+    assert client.contains_many("group-1", emails, concurrency=2) == {
+        "a@example.com": True, "b@example.com": True}
+    assert len(fake_group_stub.check_requests) == 2
+
+    client.contains_many("group-1", emails)
+    assert len(fake_group_stub.check_requests) == 2
+    assert cache.stats.hits == 2
+
+
+def test_membership_cache_follows_inserts_and_deletes(fake_group_stub: _FakeGroupStub):
+    client = GroupClient("secret.2", membership_cache=MembershipCache())
+    fake_group_stub.check_response.exists = False
+
+    client.insert_email_into_group("group-1", ["a@example.com"])
+    client.delete_email_from_group("group-1", "b@example.com")
+
+    assert client.contains_many("group-1", ["a@example.com", "b@example.com"]) == {
+        "a@example.com": True, "b@example.com": False}
+    assert fake_group_stub.check_requests == []
+
+
+def test_membership_cache_expires_and_evicts(monkeypatch: pytest.MonkeyPatch):
+    clock = [100.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: clock[0])
+    cache = MembershipCache(max_entries=2, ttl=10)
+
+    cache.set(("g", "a"), True)
+    cache.set(("g", "b"), False)
+    cache.set(("g", "c"), True)
+    assert cache.get(("g", "a")) is MISSING
+    assert cache.get(("g", "b")) is False
+    clock[0] += 11
+    assert cache.get(("g", "c")) is MISSING
+    assert cache.stats.evictions == 1
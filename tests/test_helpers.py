@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import pytest
+
+import sendlix.clients._helpers as helpers
+from sendlix.clients import AddressValidationError, set_email_data_cache_size
+from sendlix.clients._helpers import (
+    EMAIL_DATA_CACHE_SIZE,
+    _email_data,
+    build_recipients,
+    to_email_data,
+    validate_addresses,
+)
+from sendlix.clients.email_client import MailTemplate, _build_send_mail_request
+from sendlix.proto import EmailData_pb2, email_pb2
+
+
+def test_validate_addresses_reports_every_invalid_index():
+    with pytest.raises(AddressValidationError) as excinfo:
+        validate_addresses(["a@example.com", "broken", "b@example.com", "x@y"])
+
+    assert [(index, value) for _, index, value in excinfo.value.invalid] == [
+        (1, "broken"), (3, "x@y")]
+    assert isinstance(excinfo.value, ValueError)
+
+
+def test_build_recipients_dedupes_across_fields():
+    recipients = build_recipients(
+        ["a@example.com", {"email": "B@example.com", "name": "B"}],
+        ["b@example.com", "c@example.com"],
+        ["A@EXAMPLE.com", "c@example.com", "d@example.com"],
+        dedupe=True,
+    )
+
+    assert [e.email for e in recipients.to] == ["a@example.com", "B@example.com"]
+    assert [e.email for e in recipients.cc] == ["c@example.com"]
+    assert [e.email for e in recipients.bcc] == ["d@example.com"]
+
+
+def test_build_recipients_collects_errors_from_all_fields():
+    with pytest.raises(AddressValidationError) as excinfo:
+        build_recipients(["bad"], ["ok@example.com"], ["also bad"])
+
+    assert [(field, index) for field, index, _ in excinfo.value.invalid] == [
+        ("to", 0), ("bcc", 0)]
+
+
+def test_mail_options_can_dedupe_recipients():
+    options = {"from": "s@example.com", "to": ["a@example.com"], "cc": ["A@example.com"],
+               "bcc": ["b@example.com", "a@example.com"], "subject": "s", "text": "t"}
+
+    assert len(_build_send_mail_request(options).cc) == 1
+    request = _build_send_mail_request({**options, "dedupeRecipients": True})
+    assert [e.email for e in (*request.to, *request.cc, *request.bcc)] == [
+        "a@example.com", "b@example.com"]
+
+    template = MailTemplate({"from": "s@example.com", "subject": "s", "text": "t",
+                             "dedupeRecipients": True})
+    rendered = email_pb2.SendMailRequest.FromString(
+        template.render(["a@example.com"], bcc=["a@example.com"]))
+    assert len(rendered.bcc) == 0
+
+
+def test_to_email_data_interns_hot_addresses():
+    first = _email_data({"email": "hot@example.com", "name": "Hot"})
+    second = _email_data({"email": "hot@example.com", "name": "Hot"})
+
+    assert first is second
+    assert _email_data("hot@example.com") is not first
+    copy = to_email_data({"email": "hot@example.com", "name": "Hot"})
+    assert copy == first and copy is not first
+    existing = EmailData_pb2.EmailData(email="pb@example.com")
+    assert to_email_data(existing) is existing
+    with pytest.raises(ValueError):
+        to_email_data("not an email")
+
+
+def test_email_data_cache_can_be_resized_and_disabled():
+    try:
+        set_email_data_cache_size(0)
+        assert _email_data("cold@example.com") is not _email_data("cold@example.com")
+        assert helpers._interned_email_data.cache_info().maxsize == 0
+        with pytest.raises(ValueError):
+            set_email_data_cache_size(-1)
+    finally:
+        set_email_data_cache_size(EMAIL_DATA_CACHE_SIZE)
+    assert _email_data("cold@example.com") is _email_data("cold@example.com")
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import grpc
+import pytest
+
+import sendlix.auth as auth_module
+import sendlix.clients.email_client as email_module
+from sendlix.auth import Auth
+from sendlix.channels import _ClientCallDetails
+from sendlix.clients.email_client import EmailClient
+from sendlix.instrumentation import Histogram, MetricsRecorder, Recorder, _MetricsInterceptor
+from sendlix.proto import auth_pb2, email_pb2
+
+
+class _Outcome:
+    def __init__(self, response=None, error=None) -> None:
+        self._response = response
+        self._error = error
+
+    def exception(self):
+        return self._error
+
+    def result(self):
+        return self._response
+
+
+class _Unavailable(grpc.RpcError):
+    def code(self):
+        return grpc.StatusCode.UNAVAILABLE
+
+
+def test_interceptor_records_method_status_and_sizes():
+    recorder = MetricsRecorder()
+    interceptor = _MetricsInterceptor(recorder)
+    details = _ClientCallDetails(
+        "/sendlix.api.v1.Email/SendEmail", None, None, None, None, None)
+    response = email_pb2.SendEmailResponse(message=["id-1"], emailsLeft=3)
+
+    interceptor.intercept_unary_unary(
+        lambda d, r: _Outcome(response), details, b"x" * 300)
+    interceptor.intercept_unary_unary(
+        lambda d, r: _Outcome(error=_Unavailable()), details, b"x")
+
+    ok = recorder.histogram("rpc_duration_seconds", method="SendEmail", code="OK")
+    failed = recorder.histogram(
+        "rpc_duration_seconds", method="SendEmail", code="UNAVAILABLE")
+    assert ok.count == 1 and failed.count == 1
+    sizes = recorder.histogram("rpc_request_bytes", method="SendEmail")
+    assert sizes.count == 2 and sizes.sum == 301
+    assert recorder.histogram(
+        "rpc_response_bytes", method="SendEmail").sum == response.ByteSize()
+
+
+def test_histogram_quantile_interpolates():
+    histogram = Histogram((1.0, 2.0, 4.0))
+    for value in (0.5, 1.5, 1.5, 3.0):
+        histogram.observe(value)
+
+    assert histogram.quantile(0.5) == pytest.approx(1.5)
+    assert histogram.quantile(1.0) == pytest.approx(4.0)
+
+
+def test_prometheus_rendering():
+    recorder = MetricsRecorder(latency_buckets=(0.1, 1.0))
+    recorder.record_stage("build", 0.05)
+    recorder.record_token_event("hits")
+    recorder.record_token_event("hits")
+
+    text = recorder.render_prometheus()
+
+    assert "# TYPE sendlix_token_events_total counter" in text
+    assert 'sendlix_token_events_total{event="hits"} 2' in text
+    assert 'sendlix_stage_duration_seconds_bucket{stage="build",le="0.1"} 1' in text
+    assert 'sendlix_stage_duration_seconds_bucket{stage="build",le="+Inf"} 1' in text
+    assert 'sendlix_stage_duration_seconds_count{stage="build"} 1' in text
+
+
+def test_auth_reports_cache_events_and_refresh_latency(monkeypatch: pytest.MonkeyPatch):
+    class _Stub:
+        def GetJwtToken(self, request):
+            response = auth_pb2.AuthResponse(token="tok")
+            response.expires.seconds = 3600
+            return response
+
+    monkeypatch.setattr(auth_module.auth_pb2_grpc, "AuthStub", lambda channel: _Stub())
+    recorder = MetricsRecorder()
+    auth = Auth("secret.1", recorder=recorder, background_refresh=False)
+
+    auth.get_auth_header()
+    auth.get_auth_header()
+
+    assert recorder.counter("token_events_total", event="misses") == 1
+    assert recorder.counter("token_events_total", event="hits") == 1
+    assert recorder.histogram(
+        "token_refresh_duration_seconds", outcome="ok").count == 1
+
+
+def test_email_client_reports_stages(monkeypatch: pytest.MonkeyPatch):
+    class _RawStub:
+        def __init__(self, channel) -> None:
+            self.payloads = []
+
+        def SendEmail(self, payload):
+            self.payloads.append(payload)
+            return email_pb2.SendEmailResponse(message=["id"])
+
+    class _SpanRecorder(Recorder):
+        def __init__(self) -> None:
+            self.stages = []
+
+        def record_stage(self, stage, seconds):
+            self.stages.append(stage)
+
+    monkeypatch.setattr(email_module, "_RawEmailStub", _RawStub)
+    recorder = _SpanRecorder()
+    client = EmailClient("secret.1", recorder=recorder)
+
+    client.send_email({
+        "from": "a@example.com", "to": ["b@example.com"], "subject": "s", "text": "t"})
+
+    assert recorder.stages == ["validate", "build", "serialize"]
+    sent = email_pb2.SendMailRequest.FromString(client._raw_client.payloads[0])
+    assert sent.subject == "s"
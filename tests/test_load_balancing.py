@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import wait
+
+import pytest
+
+from sendlix.channels import (
+    LEAST_OUTSTANDING,
+    ChannelConfig,
+    ChannelPool,
+    HealthCheck,
+    normalize_hosts,
+)
+from sendlix.clients.email_client import EmailClient
+from sendlix.policy import CallPolicy, RetryPolicy
+from sendlix.testing import FakeSendlixServer
+
+_MAIL = {"from": "a@example.com", "to": ["b@example.com"], "subject": "s", "text": "t"}
+
+
+@pytest.fixture()
+def servers():
+    fakes = [FakeSendlixServer(seed=index).start() for index in range(3)]
+    yield fakes
+    for fake in fakes:
+        fake.stop()
+
+
+def _client(servers, **config) -> EmailClient:
+    return EmailClient(
+        "key.1",
+        host=[server.address for server in servers],
+        channel_config=ChannelConfig(insecure=True, **config),
+        channel_pool=ChannelPool(),
+        policy=CallPolicy(retry=RetryPolicy(max_attempts=5, initial_backoff=0.001, methods=None)),
+    )
+
+
+def test_normalize_hosts():
+    assert normalize_hosts("a:443") == "a:443"
+    assert normalize_hosts(["a:443"]) == "a:443"
+    assert normalize_hosts(["a:443", "b:443", "a:443"]) == ("a:443", "b:443")
+    with pytest.raises(ValueError):
+        normalize_hosts([])
+    with pytest.raises(ValueError):
+        ChannelConfig(load_balancing="random")
+
+
+def test_round_robin_spreads_calls(servers):
+    client = _client(servers)
+    for _ in range(30):
+        client.send_email(_MAIL)
+
+    assert [server.calls["SendEmail"] for server in servers] == [10, 10, 10]
+    assert [status.outstanding for status in client.endpoint_status()] == [0, 0, 0]
+    client.close()
+
+
+def test_least_outstanding_avoids_slow_endpoint(servers):
+    servers[0].latency = 0.2
+    client = _client(servers, load_balancing=LEAST_OUTSTANDING)
+
+    futures = []
+    for _ in range(30):
+        futures.append(client.send_email_future(_MAIL))
+        time.sleep(0.005)
+    wait(futures, timeout=10)
+
+    assert all(future.exception() is None for future in futures)
+    assert servers[0].calls["SendEmail"] < 5
+    client.close()
+
+
+def test_failing_endpoint_is_ejected_and_probed_back(servers):
+    servers[1].error_rate = 1.0
+    client = _client(servers, health_check=HealthCheck(failure_threshold=2, ejection_time=0.05))
+
+    for _ in range(20):
+        client.send_email(_MAIL)  # retries land on the healthy endpoints
+    status = client.endpoint_status()
+    assert [entry.ejected for entry in status] == [False, True, False]
+    assert servers[1].calls["SendEmail"] == 2
+
+    servers[1].error_rate = 0.0
+    time.sleep(0.1)
+    client.send_email(_MAIL)  # starts the health probe
+    deadline = time.monotonic() + 5
+    while client.endpoint_status()[1].ejected and time.monotonic() < deadline:
+        time.sleep(0.01)
+    for _ in range(6):
+        client.send_email(_MAIL)
+
+    assert not client.endpoint_status()[1].ejected
+    assert servers[1].calls["SendEmail"] > 2
+    client.close()
+
+
+def test_stopped_endpoint_is_routed_around(servers):
+    client = _client(servers, health_check=HealthCheck(failure_threshold=1, ejection_time=60))
+    client.send_email(_MAIL)
+    servers[2].stop()
+
+    results = [client.send_email(_MAIL) for _ in range(12)]
+
+    assert all(results)
+    assert client.endpoint_status()[2].ejected
+    client.close()
+
+
+def test_clients_share_one_balanced_channel(servers):
+    pool = ChannelPool()
+    hosts = [server.address for server in servers]
+    config = ChannelConfig(insecure=True)
+    first = EmailClient("key.1", host=hosts, channel_config=config, channel_pool=pool)
+    second = EmailClient("key.1", host=list(reversed(hosts)), channel_config=config,
+                         channel_pool=pool)
+    first.send_email(_MAIL)
+    second.send_email(_MAIL)
+
+    assert len(pool) == 2  # endpoint order is part of the key
+    assert [status.host for status in first.endpoint_status()] == hosts
+    first.close()
+    second.close()
+    assert len(pool) == 0
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import pickle
+from pathlib import Path
+
+import pytest
+
+import sendlix.clients.email_client as email_module
+from sendlix.clients import AddressValidationError
+from sendlix.clients.email_client import (
+    EmailClient,
+    GroupMail,
+    Mail,
+    _build_group_mail_request,
+    _build_send_mail_request,
+)
+from sendlix.clients.outbox import Outbox, OutboxWorker
+from sendlix.testing import FakeSendlixServer
+
+_OPTIONS = {"from": "a@example.com", "to": ["b@example.com", "c@example.com"],
+            "subject": "s", "html": "<p>hi</p>"}
+_GROUP = {"from": "a@example.com", "groupId": "g", "subject": "s", "text": "t"}
+
+
+def test_mail_validates_once_and_is_immutable():
+    with pytest.raises(ValueError):
+        Mail({"from": "a@example.com", "subject": "s", "text": "t"})
+    with pytest.raises(AddressValidationError):
+        Mail({**_OPTIONS, "to": ["not-an-address"]})
+    with pytest.raises(ValueError):
+        GroupMail({"from": "a@example.com", "subject": "s"})
+
+    options = dict(_OPTIONS, to=list(_OPTIONS["to"]))
+    mail = Mail(options)
+    options["to"].append("d@example.com")
+
+    assert mail.options["to"] == ("b@example.com", "c@example.com")
+    with pytest.raises(AttributeError):
+        mail._payload = b""
+    with pytest.raises(TypeError):
+        mail.options["subject"] = "changed"
+
+
+@pytest.mark.parametrize("options, additional", [
+    ({**_OPTIONS, "from": "not-an-email"}, None),
+    ({**_OPTIONS, "replyTo": "not-an-email"}, None),
+    ({**_OPTIONS, "images": [{"placeholder": "logo", "data": b"x", "type": "BMP"}]}, None),
+    ({**_OPTIONS, "images": [{"placeholder": "logo", "data": "x"}]}, None),
+    (_OPTIONS, {"attachments": [{"filename": "a.pdf"}]}),
+])
+def test_mail_rejects_invalid_fields_at_construction(options, additional):
+    with pytest.raises((ValueError, TypeError, KeyError)):
+        Mail(options, additional)
+
+
+def test_nested_options_are_copied():
+    image = {"placeholder": "logo", "data": bytearray(b"png"), "type": "PNG"}
+    sender = {"email": "a@example.com", "name": "A"}
+    mail = Mail({**_OPTIONS, "from": sender, "images": [image]})
+    image["data"][:] = b"gif"
+    sender["name"] = "B"
+
+    request = mail.build()
+    assert request.TextContent.Images[0].Image == b"png"
+    assert getattr(request, "from").name == "A"
+    assert isinstance(mail.options["images"][0]["data"], bytes)
+    with pytest.raises(TypeError):
+        mail.options["images"][0]["data"] = b""
+
+
+def test_serialized_bytes_are_built_once_and_reused(monkeypatch: pytest.MonkeyPatch):
+    expected = _build_send_mail_request(_OPTIONS, {"category": "news"}).SerializeToString()
+    builds = []
+    populate = email_module._populate_send_mail_request
+    monkeypatch.setattr(email_module, "_populate_send_mail_request",
+                        lambda *args: builds.append(1) or populate(*args))
+    mail = Mail(_OPTIONS, {"category": "news"})
+
+    payload = mail.serialize()
+
+    assert mail.serialize() is payload
+    assert payload == expected
+    assert mail.build().subject == "s"
+    assert len(builds) == 1
+    assert GroupMail(_GROUP).serialize() == _build_group_mail_request(_GROUP).SerializeToString()
+
+
+def test_pickle_keeps_the_cached_payload():
+    mail = Mail(_OPTIONS)
+    mail.serialize()
+
+    restored = pickle.loads(pickle.dumps(mail))
+
+    assert restored._payload == mail._payload
+    assert restored == mail and hash(restored) == hash(mail)
+
+
+def test_clients_and_outbox_send_prepared_mails(tmp_path: Path):
+    with FakeSendlixServer() as server:
+        client = EmailClient("key.1", **server.client_options())
+        mail = Mail(_OPTIONS)
+
+        assert len(client.send_email(mail)) == 2
+        assert len(client.send_email_future(mail).result(timeout=10)) == 2
+        assert client.send_group_email(GroupMail(_GROUP))
+        with pytest.raises(TypeError):
+            client.send_email(mail, {"category": "news"})
+
+        with Outbox(tmp_path / "outbox.db") as outbox:
+            outbox.enqueue(mail)
+            outbox.enqueue_group(GroupMail(_GROUP))
+            assert len(OutboxWorker(outbox, client).run_once().sent) == 2
+
+        assert server.calls["SendEmail"] == 3
+        assert server.calls["SendGroupEmail"] == 2
+        client.close()
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import grpc
+import pytest
+
+from sendlix.clients.email_client import EmailClient
+from sendlix.clients.outbox import FAILED, PENDING, SENDING, SENT, Outbox, OutboxWorker
+from sendlix.policy import CallPolicy, RetryPolicy
+from sendlix.testing import FakeSendlixServer
+
+_MAIL = {"from": "a@example.com", "to": ["b@example.com"], "subject": "s", "text": "t"}
+
+
+@pytest.fixture()
+def server():
+    with FakeSendlixServer() as fake:
+        yield fake
+
+
+@pytest.fixture()
+def client(server: FakeSendlixServer):
+    client = EmailClient("key.1", policy=CallPolicy(retry=None), **server.client_options())
+    yield client
+    client.close()
+
+
+def test_worker_sends_queued_mails(tmp_path: Path, server, client):
+    with Outbox(tmp_path / "outbox.db") as outbox:
+        key = outbox.enqueue(_MAIL, idempotency_key="welcome-1")
+        outbox.enqueue_eml(b"Subject: hi\r\n\r\nbody")
+        assert outbox.enqueue(_MAIL, idempotency_key="welcome-1") == key
+
+        result = OutboxWorker(outbox, client).run_once()
+
+        assert len(result.sent) == 2
+        assert server.calls["SendEmail"] == 1
+        assert server.calls["SendEmlEmail"] == 1
+        entry = outbox.get(key)
+        assert entry.status == SENT
+        assert entry.attempts == 1
+        assert len(entry.message_ids) == 1
+        assert outbox.counts()[SENT] == 2
+        assert not OutboxWorker(outbox, client).run_once().sent
+        assert outbox.purge_sent() == 2
+
+
+def test_invalid_mail_is_rejected_at_enqueue(tmp_path: Path):
+    with Outbox(tmp_path / "outbox.db") as outbox:
+        with pytest.raises(ValueError):
+            outbox.enqueue({"from": "a@example.com", "subject": "s", "text": "t"})
+        assert outbox.counts()[PENDING] == 0
+
+
+def test_entries_survive_reopen_and_expired_leases_are_reclaimed(tmp_path: Path):
+    path = tmp_path / "outbox.db"
+    with Outbox(path) as outbox:
+        key = outbox.enqueue(_MAIL)
+
+    with Outbox(path, lease_seconds=0) as outbox:
+        first = outbox.claim(10)
+        # The claiming worker "crashed"; the expired lease makes it claimable again.
+        second = outbox.claim(10)
+
+    assert [entry.idempotency_key for entry in first] == [key]
+    assert second[0].attempts == 2
+    assert second[0].payload == first[0].payload
+
+
+def test_late_completion_after_expired_lease_is_ignored(tmp_path: Path):
+    with Outbox(tmp_path / "outbox.db", lease_seconds=0) as outbox:
+        key = outbox.enqueue(_MAIL)
+        (stale,) = outbox.claim(10)
+        (current,) = outbox.claim(10)  # the first lease expired
+
+        stale.last_error = "UNAVAILABLE"
+        outbox.complete(retried=[(stale, 0.0)])
+        assert outbox.get(key).status == SENDING
+
+        current.message_ids = ["m-1"]
+        outbox.complete(sent=[current])
+        stale.last_error = "INVALID_ARGUMENT"
+        outbox.complete(failed=[stale])
+        entry = outbox.get(key)
+        assert (entry.status, entry.message_ids, entry.last_error) == (SENT, ["m-1"], None)
+
+
+def test_transient_errors_are_retried_and_permanent_ones_fail(tmp_path: Path, server, client):
+    retry = RetryPolicy(max_attempts=2, initial_backoff=0, max_backoff=0,
+                        retryable_codes=frozenset({grpc.StatusCode.UNAVAILABLE}))
+    with Outbox(tmp_path / "outbox.db") as outbox:
+        worker = OutboxWorker(outbox, client, retry=retry)
+        key = outbox.enqueue(_MAIL)
+        server.error_rate = 1.0
+
+        assert len(worker.run_once().retried) == 1
+        assert outbox.get(key).status == PENDING
+        assert len(worker.run_once().failed) == 1
+        assert outbox.get(key).status == FAILED
+        assert "UNAVAILABLE" in outbox.get(key).last_error
+
+        server.error_code = grpc.StatusCode.INVALID_ARGUMENT
+        other = outbox.enqueue(_MAIL)
+        assert [entry.idempotency_key for entry in worker.run_once().failed] == [other]
+
+        server.error_rate = 0.0
+        assert outbox.requeue_failed() == 2
+        assert len(worker.run_once().sent) == 2
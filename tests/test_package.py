@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import sendlix
+import sendlix.clients
+
+SRC = str(Path(__file__).resolve().parents[1] / "src")
+
+
+def test_import_does_not_load_grpc():
+    code = "import sys, sendlix; print('grpc' in sys.modules, 'sendlix.proto' in sys.modules)"
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True,
+        env={"PYTHONPATH": SRC},
+    ).stdout
+    assert output.split() == ["False", "False"]
+
+
+def test_lazy_attributes_resolve():
+    from sendlix.clients.email_client import EmailClient
+
+    assert sendlix.EmailClient is EmailClient
+    assert sendlix.clients.EmailClient is EmailClient
+    assert "GroupClient" in dir(sendlix)
+
+
+def test_unknown_attribute_raises():
+    with pytest.raises(AttributeError, match="NotAThing"):
+        sendlix.NotAThing
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import os
+import pickle
+
+import pytest
+
+import sendlix.channels as channels_module
+from sendlix.channels import ChannelPool
+from sendlix.clients import AddressValidationError
+from sendlix.clients.email_client import EmailClient, _build_send_mail_request
+from sendlix.clients.pipeline import (
+    ProcessPipeline,
+    RemoteSendError,
+    _build_chunk,
+    _portable,
+    _read_built_chunk,
+)
+from sendlix.testing import FakeSendlixServer
+
+_MAILS = [
+    {"from": "a@example.com", "to": [f"user{i}@example.com"], "subject": "s",
+     "html": f"<p>{i}</p>" * 100}
+    for i in range(10)
+]
+_INVALID = {"from": "a@example.com", "subject": "no recipients", "text": "t"}
+_BAD_ADDRESS = {"from": "a@example.com", "to": ["bad"], "subject": "s", "text": "t"}
+
+
+@pytest.fixture(scope="module")
+def server():
+    with FakeSendlixServer() as fake:
+        yield fake
+
+
+@pytest.fixture(scope="module")
+def pipeline(server: FakeSendlixServer):
+    options = server.client_options()
+    del options["channel_pool"]
+    with ProcessPipeline("key.1", processes=2, chunk_size=3, **options) as pipeline:
+        yield pipeline
+
+
+def test_workers_build_and_send(server: FakeSendlixServer, pipeline: ProcessPipeline):
+    before = server.calls["SendEmail"]
+
+    results = list(pipeline.send_many([*_MAILS, _INVALID]))
+
+    assert [result.index for result in results] == list(range(11))
+    assert all(result.ok and len(result.message_ids) == 1 for result in results[:10])
+    assert isinstance(results[10].error, ValueError)
+    assert server.calls["SendEmail"] - before == 10
+
+
+def test_parent_sends_requests_built_by_workers(server: FakeSendlixServer, pipeline: ProcessPipeline):
+    client = EmailClient("key.1", **server.client_options())
+
+    results = list(pipeline.send_many([_INVALID, *_MAILS], client=client, ordered=False))
+
+    assert sorted(result.index for result in results if result.ok) == list(range(1, 11))
+    assert [result.index for result in results if not result.ok] == [0]
+    client.close()
+
+
+def test_serialize_many_matches_in_process_build(pipeline: ProcessPipeline):
+    expected = [_build_send_mail_request(mail).SerializeToString() for mail in _MAILS]
+
+    assert list(pipeline.serialize_many(_MAILS)) == expected
+    with pytest.raises(ValueError):
+        list(pipeline.serialize_many([_INVALID]))
+
+
+@pytest.mark.skipif(not os.path.isdir("/dev/shm"), reason="needs /dev/shm")
+def test_stopping_early_releases_shared_memory(pipeline: ProcessPipeline):
+    before = set(os.listdir("/dev/shm"))
+
+    with pytest.raises(ValueError):
+        list(pipeline.serialize_many([_INVALID, *_MAILS * 3]))
+    payloads = pipeline.serialize_many(_MAILS * 3)
+    next(payloads)
+    payloads.close()
+
+    assert set(os.listdir("/dev/shm")) <= before
+
+
+def test_invalid_address_is_reported_per_mail(pipeline: ProcessPipeline):
+    results = list(pipeline.send_many([_BAD_ADDRESS, *_MAILS[:2]]))
+
+    assert isinstance(results[0].error, AddressValidationError)
+    assert results[0].error.invalid == [("to", 0, "bad")]
+    assert all(result.ok for result in results[1:])
+
+
+def test_unpicklable_errors_become_remote_send_errors():
+    class _Unpicklable(ValueError):
+        def __init__(self, first, second):
+            super().__init__(f"{first} {second}")
+
+    assert isinstance(_portable(_Unpicklable(1, 2)), RemoteSendError)
+    error = AddressValidationError([("to", 0, "bad")])
+    assert _portable(error) is error
+
+
+def test_built_chunks_carry_recipient_counts():
+    chunk = [(0, _MAILS[0]), (1, _INVALID), (2, {**_MAILS[0], "cc": ["c@example.com"]})]
+    payloads, counts, errors = _read_built_chunk(_build_chunk(chunk, None), len(chunk))
+
+    assert counts == [1, 0, 2]
+    assert list(errors) == [1]
+    assert payloads[2] == _build_send_mail_request(chunk[2][1]).SerializeToString()
+
+
+def test_remote_send_error_pickles():
+    error = pickle.loads(pickle.dumps(RemoteSendError("UNAVAILABLE: down", "UNAVAILABLE")))
+
+    assert error.code == "UNAVAILABLE"
+    assert str(error) == "UNAVAILABLE: down"
+
+
+def test_pools_forget_channels_after_fork():
+    pool = ChannelPool()
+    lease = pool.acquire("example.com:443")
+    assert len(pool) == 1
+
+    channels_module._after_fork_in_child()
+
+    assert len(pool) == 0
+    lease.close()  # releasing a lease from before the fork is a no-op
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import grpc
+import grpc.aio
+import pytest
+
+from sendlix.aio._policy import _AsyncPolicyInterceptor
+from sendlix.channels import _ClientCallDetails
+from sendlix.policy import (
+    CallPolicy,
+    CircuitBreaker,
+    CircuitOpenError,
+    HedgingPolicy,
+    RetryPolicy,
+    _PolicyInterceptor,
+)
+
+# Retries every method, sends included, to exercise the retry loop itself.
+_FAST_RETRY = RetryPolicy(max_attempts=3, initial_backoff=0.001, max_backoff=0.001,
+                          methods=None)
+
+
+class _RpcError(grpc.RpcError):
+    def __init__(self, code: grpc.StatusCode) -> None:
+        self._code = code
+
+    def code(self) -> grpc.StatusCode:
+        return self._code
+
+
+class _Outcome:
+    def __init__(self, value=None, code: grpc.StatusCode | None = None) -> None:
+        self.value = value
+        self.error = _RpcError(code) if code else None
+
+    def exception(self):
+        return self.error
+
+
+class _ScriptedContinuation:
+    """Returns the scripted outcomes in order and records call details."""
+
+    def __init__(self, *codes) -> None:
+        self._codes = list(codes)
+        self.details: list[_ClientCallDetails] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, details, request):
+        with self._lock:
+            self.details.append(details)
+            code = self._codes.pop(0) if self._codes else None
+        return _Outcome("response", code)
+
+
+def _details(method="/sendlix.api.v1.Email/SendEmail", timeout=None):
+    return _ClientCallDetails(method, timeout, None, None, None, None)
+
+
+def test_retries_unavailable_within_the_method_deadline():
+    continuation = _ScriptedContinuation(
+        grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.UNAVAILABLE)
+    policy = CallPolicy(method_timeouts={"SendEmail": 2.0}, retry=_FAST_RETRY)
+
+    outcome = _PolicyInterceptor(policy).intercept_unary_unary(
+        continuation, _details(), object())
+
+    assert outcome.exception() is None
+    assert len(continuation.details) == 3
+    timeouts = [details.timeout for details in continuation.details]
+    assert 0 < timeouts[-1] <= timeouts[0] <= 2.0
+
+
+def test_does_not_retry_other_codes_or_beyond_max_attempts():
+    rejected = _ScriptedContinuation(grpc.StatusCode.INVALID_ARGUMENT)
+    policy = CallPolicy(retry=_FAST_RETRY)
+    outcome = _PolicyInterceptor(policy).intercept_unary_unary(
+        rejected, _details(), object())
+    assert outcome.exception().code() == grpc.StatusCode.INVALID_ARGUMENT
+    assert len(rejected.details) == 1
+
+    down = _ScriptedContinuation(*[grpc.StatusCode.UNAVAILABLE] * 5)
+    outcome = _PolicyInterceptor(policy).intercept_unary_unary(
+        down, _details(), object())
+    assert outcome.exception().code() == grpc.StatusCode.UNAVAILABLE
+    assert len(down.details) == 3
+
+
+def test_default_retry_skips_non_idempotent_methods():
+    policy = CallPolicy(retry=RetryPolicy(initial_backoff=0.001, max_backoff=0.001))
+
+    send = _ScriptedContinuation(grpc.StatusCode.UNAVAILABLE)
+    outcome = _PolicyInterceptor(policy).intercept_unary_unary(send, _details(), object())
+    assert outcome.exception().code() == grpc.StatusCode.UNAVAILABLE
+    assert len(send.details) == 1
+
+    check = _ScriptedContinuation(grpc.StatusCode.UNAVAILABLE)
+    outcome = _PolicyInterceptor(policy).intercept_unary_unary(
+        check, _details("/sendlix.api.v1.Group/CheckEmailInGroup"), object())
+    assert outcome.exception() is None
+    assert len(check.details) == 2
+
+
+def test_explicit_timeout_wins_and_none_disables_deadline():
+    continuation = _ScriptedContinuation()
+    _PolicyInterceptor(CallPolicy()).intercept_unary_unary(
+        continuation, _details(timeout=0.5), object())
+    _PolicyInterceptor(CallPolicy(timeout=None, method_timeouts={})).intercept_unary_unary(
+        continuation, _details(), object())
+
+    assert 0 < continuation.details[0].timeout <= 0.5
+    assert continuation.details[1].timeout is None
+
+
+def test_circuit_breaker_opens_and_recovers():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    policy = CallPolicy(retry=None, circuit_breaker=breaker)
+    interceptor = _PolicyInterceptor(policy)
+    failing = _ScriptedContinuation(*[grpc.StatusCode.UNAVAILABLE] * 2)
+
+    for _ in range(2):
+        interceptor.intercept_unary_unary(failing, _details(), object())
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        interceptor.intercept_unary_unary(failing, _details(), object())
+    assert len(failing.details) == 2
+
+    time.sleep(0.06)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    interceptor.intercept_unary_unary(failing, _details(), object())
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_circuit_breaker_recovers_from_a_lost_trial():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record(grpc.StatusCode.UNAVAILABLE)
+    time.sleep(0.06)
+
+    assert breaker.allow()  # the trial call
+    assert not breaker.allow()
+    breaker.record(None)  # cancelled: reopens instead of sticking half open
+    assert breaker.state == CircuitBreaker.OPEN
+    time.sleep(0.06)
+
+    assert breaker.allow()  # a trial that never reports back
+    assert not breaker.allow()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record(grpc.StatusCode.OK)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_async_cancelled_trial_reopens_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.2)
+    breaker.record(grpc.StatusCode.UNAVAILABLE)
+    time.sleep(0.21)
+
+    async def continuation(details, request):
+        await asyncio.sleep(10)
+
+    async def scenario():
+        details = grpc.aio.ClientCallDetails(
+            "/sendlix.api.v1.Email/SendEmail", None, None, None, None)
+        interceptor = _AsyncPolicyInterceptor(CallPolicy(circuit_breaker=breaker))
+        task = asyncio.ensure_future(
+            interceptor.intercept_unary_unary(continuation, details, object()))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_hedging_returns_the_first_answer():
+    started = []
+
+    def continuation(details, request):
+        started.append(time.monotonic())
+        if len(started) == 1:
+            time.sleep(0.5)
+            return _Outcome("slow")
+        return _Outcome("fast")
+
+    policy = CallPolicy(hedging=HedgingPolicy(delay=0.01, max_attempts=2))
+    begin = time.monotonic()
+    outcome = _PolicyInterceptor(policy).intercept_unary_unary(
+        continuation, _details("/sendlix.api.v1.Group/CheckEmailInGroup"), object())
+
+    assert outcome.value == "fast"
+    assert time.monotonic() - begin < 0.4
+    assert len(started) == 2
+
+
+def test_hedging_only_applies_to_listed_methods():
+    continuation = _ScriptedContinuation()
+    policy = CallPolicy(hedging=HedgingPolicy(delay=0))
+    _PolicyInterceptor(policy).intercept_unary_unary(
+        continuation, _details("/sendlix.api.v1.Email/SendEmail"), object())
+    assert len(continuation.details) == 1
+
+
+def test_async_policy_retries_unavailable():
+    class _Call:
+        def __init__(self, code):
+            self._code = code
+
+        async def code(self):
+            return self._code
+
+    codes = [grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.OK]
+    seen = []
+
+    async def continuation(details, request):
+        seen.append(details.timeout)
+        return _Call(codes.pop(0))
+
+    async def scenario():
+        details = grpc.aio.ClientCallDetails(
+            "/sendlix.api.v1.Email/SendEmail", None, None, None, None)
+        interceptor = _AsyncPolicyInterceptor(CallPolicy(retry=_FAST_RETRY))
+        return await interceptor.intercept_unary_unary(continuation, details, object())
+
+    call = asyncio.run(scenario())
+
+    assert asyncio.run(call.code()) == grpc.StatusCode.OK
+    assert len(seen) == 2
+    assert all(0 < timeout <= 30.0 for timeout in seen)
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from sendlix.clients.email_client import EmailClient, Mail, RecipientSplitting
+from sendlix.clients.outbox import Outbox, OutboxWorker
+from sendlix.clients.replay import RequestWriter, replay
+from sendlix.rate_limit import QuotaExhaustedError, RateLimiter
+from sendlix.testing import FakeSendlixServer
+
+
+def test_token_bucket_paces_requests_across_threads():
+    limiter = RateLimiter(rate=200, burst=5)
+
+    def worker():
+        for _ in range(5):
+            limiter.acquire()
+
+    begin = time.monotonic()
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 20 requests, 5 served from the burst, 15 at 200/s.
+    assert time.monotonic() - begin >= 0.07
+
+
+def test_acquire_times_out():
+    limiter = RateLimiter(rate=1, burst=1)
+    assert limiter.acquire(timeout=0)
+    assert not limiter.acquire(timeout=0.01)
+
+
+def test_low_quota_slows_down_and_reserve_stops():
+    limiter = RateLimiter(rate=100, slowdown_below=100, reserve=5)
+    limiter.update_quota(1000)
+    assert limiter.rate == 100
+
+    limiter.update_quota(50)
+    assert limiter.rate == pytest.approx(50)
+
+    limiter.update_quota(5)
+    with pytest.raises(QuotaExhaustedError) as excinfo:
+        limiter.acquire()
+    assert excinfo.value.emails_left == 5
+
+
+def test_exhausted_quota_is_probed_again_after_interval():
+    limiter = RateLimiter(quota_recheck_interval=0.02)
+    limiter.update_quota(0)
+    with pytest.raises(QuotaExhaustedError):
+        limiter.acquire()
+
+    time.sleep(0.03)
+    assert limiter.acquire()
+    with pytest.raises(QuotaExhaustedError):
+        limiter.acquire()
+    limiter.update_quota(500)
+    assert limiter.acquire()
+    assert limiter.emails_left == 499
+
+
+
+def test_quota_is_charged_per_email():
+    limiter = RateLimiter(reserve=5)
+    limiter.update_quota(10)
+    assert limiter.acquire(emails=5)
+    assert limiter.emails_left == 5
+    with pytest.raises(QuotaExhaustedError):
+        limiter.acquire()
+
+
+def test_client_charges_every_recipient(monkeypatch: pytest.MonkeyPatch, tmp_path):
+    def parse(self, method, payload):
+        raise AssertionError("the recipient count should be known without parsing")
+
+    monkeypatch.setattr(EmailClient, "_emails_in", parse)
+    limiter = RateLimiter()
+    charged = []
+    acquire = limiter.acquire
+    limiter.acquire = lambda cost=1, **kwargs: charged.append(kwargs["emails"]) or acquire(
+        cost, **kwargs)
+    mail = {"from": "a@example.com", "to": ["b@example.com", "c@example.com"],
+            "cc": ["d@example.com"], "subject": "s", "text": "t"}
+
+    with FakeSendlixServer() as server:
+        client = EmailClient("key.1", rate_limiter=limiter,
+                             split_recipients=RecipientSplitting(max_recipients=2),
+                             **server.client_options())
+        client.send_email({**mail, "cc": []})
+        client.send_email_future(Mail({**mail, "cc": []})).result(timeout=5)
+        template = client.compile_template({"from": "a@example.com", "subject": "s", "text": "t"})
+        client.send_template(template, ["x@example.com", "y@example.com"])
+        client.send_eml_email(b"Subject: hi\r\n\r\nbody")
+        client.send_email(mail)  # split into 2 + 1
+
+        with Outbox(tmp_path / "outbox.sqlite3") as outbox:
+            outbox.enqueue(Mail(mail))
+            OutboxWorker(outbox, client).run_once()
+        with RequestWriter(tmp_path / "campaign.slxr") as writer:
+            writer.send_email(mail)
+            writer.send_template(template, "z@example.com")
+        list(replay(tmp_path / "campaign.slxr", email_client=client, concurrency=1))
+        client.close()
+
+    assert charged == [2, 2, 2, 1, 2, 1, 3, 3, 1]
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import grpc
+import pytest
+
+from sendlix.clients.email_client import (
+    EmailClient,
+    PartialSendError,
+    RecipientSplitting,
+    _build_send_mail_request,
+)
+from sendlix.policy import CallPolicy
+from sendlix.rate_limit import QuotaExhaustedError, RateLimiter
+from sendlix.proto import email_pb2
+from sendlix.testing import FakeSendlixServer
+
+
+def _mail(recipients: int, *, html: str = "<p>hi</p>") -> dict:
+    return {
+        "from": "sender@example.com",
+        "to": [f"to{i}@example.com" for i in range(recipients)],
+        "cc": ["cc@example.com"],
+        "bcc": ["bcc@example.com"],
+        "subject": "s",
+        "html": html,
+    }
+
+
+def test_small_requests_are_not_split():
+    assert RecipientSplitting().split(_build_send_mail_request(_mail(10))) is None
+
+
+def test_split_keeps_content_and_every_recipient_once():
+    request = _build_send_mail_request(_mail(100, html="x" * 2000))
+    splitting = RecipientSplitting(max_request_bytes=3000)
+
+    payloads = splitting.split(request)
+
+    parts = [email_pb2.SendMailRequest.FromString(payload) for payload in payloads]
+    assert len(parts) > 1
+    assert all(len(payload) <= 3000 for payload in payloads)
+    assert all(part.TextContent == request.TextContent for part in parts)
+    assert [e.email for part in parts for e in part.to] == [e.email for e in request.to]
+    assert [e.email for part in parts for e in part.cc] == ["cc@example.com"]
+    assert [e.email for part in parts for e in part.bcc] == ["bcc@example.com"]
+
+
+def test_recipient_cap_and_oversized_content():
+    request = _build_send_mail_request(_mail(8))
+    payloads = RecipientSplitting(max_recipients=4).split(request)
+    assert len(payloads) == 3  # 8 to + cc + bcc
+
+    with pytest.raises(ValueError, match="too large"):
+        RecipientSplitting(max_request_bytes=100).split(
+            _build_send_mail_request(_mail(1, html="x" * 200)))
+    with pytest.raises(ValueError):
+        RecipientSplitting(max_recipients=0)
+
+
+def test_client_sends_split_requests_and_merges_ids():
+    with FakeSendlixServer() as server:
+        client = EmailClient("key.1", split_recipients=RecipientSplitting(max_recipients=5),
+                             **server.client_options())
+
+        message_ids = client.send_email(_mail(18))
+
+        assert len(message_ids) == 20
+        assert server.calls["SendEmail"] == 4
+        client.close()
+
+
+def test_partial_failures_are_reported():
+    with FakeSendlixServer(emails_left=7) as server:
+        client = EmailClient("key.1", policy=CallPolicy(retry=None),
+                             split_recipients=RecipientSplitting(max_recipients=5, concurrency=1),
+                             **server.client_options())
+
+        with pytest.raises(PartialSendError) as excinfo:
+            client.send_email(_mail(8))
+
+        assert len(excinfo.value.message_ids) == 5
+        assert excinfo.value.errors[0].code() == grpc.StatusCode.RESOURCE_EXHAUSTED
+        with pytest.raises(grpc.RpcError):
+            client.send_email(_mail(8))
+        client.close()
+
+
+def test_every_split_request_has_a_to_recipient():
+    request = _build_send_mail_request({**_mail(3), "bcc": [f"b{i}@example.com" for i in range(6)]})
+    parts = [email_pb2.SendMailRequest.FromString(payload)
+             for payload in RecipientSplitting(max_recipients=4).split(request)]
+
+    assert all(part.to for part in parts)
+    assert sum(len(part.bcc) for part in parts) == 6
+
+    lone_to = _build_send_mail_request({**_mail(1), "bcc": [f"b{i}@example.com" for i in range(5)]})
+    with pytest.raises(ValueError, match="'to' recipient"):
+        RecipientSplitting(max_recipients=2).split(lone_to)
+
+
+def test_future_sends_are_split():
+    with FakeSendlixServer() as server:
+        client = EmailClient("key.1", split_recipients=RecipientSplitting(max_recipients=5),
+                             **server.client_options())
+
+        assert len(client.send_email_future(_mail(18)).result(timeout=5)) == 20
+        assert server.calls["SendEmail"] == 4
+        client.close()
+
+
+def test_rejected_batches_fail_the_send_without_recursing():
+    limiter = RateLimiter()
+    limiter.update_quota(0)
+    with FakeSendlixServer() as server:
+        client = EmailClient("key.1", rate_limiter=limiter,
+                             split_recipients=RecipientSplitting(max_recipients=1, concurrency=1),
+                             **server.client_options())
+        mail = {**_mail(3000), "cc": [], "bcc": []}
+
+        with pytest.raises(QuotaExhaustedError):
+            client.send_email(mail)
+        with pytest.raises(QuotaExhaustedError):
+            client.send_email_future(mail).result(timeout=10)
+        assert server.calls["SendEmail"] == 0
+        client.close()
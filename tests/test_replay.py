@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import pytest
+
+from sendlix.clients.email_client import EmailClient, Mail
+from sendlix.clients.group_client import GroupClient, MembershipCache
+from sendlix.clients.replay import MAGIC, RequestFile, RequestWriter, replay
+from sendlix.proto import email_pb2, group_pb2
+from sendlix.testing import FakeSendlixServer
+
+_MAIL = {"from": "a@example.com", "to": ["b@example.com"], "subject": "s", "text": "t"}
+
+
+@pytest.fixture()
+def server():
+    with FakeSendlixServer(seed=1) as fake:
+        yield fake
+
+
+def test_writer_round_trips_every_request_kind(tmp_path):
+    path = tmp_path / "campaign.slxr"
+    with RequestWriter(path) as writer:
+        assert writer.send_email(_MAIL) == 0
+        writer.send_email(Mail({**_MAIL, "text": "x" * 300}))
+        writer.send_eml_email(b"Subject: hi\r\n\r\nbody")
+        writer.send_group_email({"from": "a@example.com", "subject": "s", "text": "t",
+                                 "groupId": "g1"})
+        writer.insert_email_into_group("g1", ["c@example.com", "d@example.com"])
+        assert not path.exists()
+    assert path.read_bytes().startswith(MAGIC)
+
+    with RequestFile(path) as request_file:
+        records = list(request_file)
+        assert len(request_file) == 5
+    assert [method for _, method, _ in records] == [
+        "SendEmail", "SendEmail", "SendEmlEmail", "SendGroupEmail", "InsertEmailToGroup"]
+    assert email_pb2.SendMailRequest.FromString(records[1][2]).TextContent.text == "x" * 300
+    insert = group_pb2.InsertEmailToGroupRequest.FromString(records[4][2])
+    assert [entry.email.email for entry in insert.entries] == ["c@example.com", "d@example.com"]
+
+
+def test_writer_validates_and_discards_on_error(tmp_path):
+    path = tmp_path / "campaign.slxr"
+    with pytest.raises(ValueError):
+        with RequestWriter(path) as writer:
+            writer.send_email(_MAIL)
+            writer.send_email({"from": "a@example.com"})
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_request_file_rejects_bad_input(tmp_path):
+    path = tmp_path / "bad.slxr"
+    path.write_bytes(b"not a request file")
+    with pytest.raises(ValueError):
+        RequestFile(path)
+
+    path.write_bytes(MAGIC + b"\x01\x01\x10abc")
+    with RequestFile(path) as request_file, pytest.raises(ValueError, match="Truncated"):
+        list(request_file)
+
+
+def test_replay_sends_everything(server: FakeSendlixServer, tmp_path):
+    path = tmp_path / "campaign.slxr"
+    with RequestWriter(path) as writer:
+        for index in range(40):
+            writer.send_email({**_MAIL, "to": [f"user{index}@example.com"]})
+        writer.insert_email_into_group("g1", "c@example.com")
+    email_client = EmailClient("key.1", **server.client_options())
+    cache = MembershipCache()
+    group_client = GroupClient("key.1", membership_cache=cache, **server.client_options())
+
+    results = list(replay(path, email_client=email_client, group_client=group_client,
+                          concurrency=8))
+
+    assert sorted(result.index for result in results) == list(range(41))
+    assert all(result.error is None for result in results)
+    assert sum(len(result.message_ids) for result in results) == 40
+    assert server.calls["SendEmail"] == 40
+    assert server.group_members("g1") == {"c@example.com"}
+    assert cache.get(("g1", "c@example.com")) is True
+    assert email_client.emails_left == server.emails_left
+
+    resumed = list(replay(path, email_client=email_client, group_client=group_client, start=39))
+    assert sorted(result.index for result in resumed) == [39, 40]
+    email_client.close()
+    group_client.close()
+
+
+def test_replay_reports_failures_and_needs_a_client(server: FakeSendlixServer, tmp_path):
+    path = tmp_path / "campaign.slxr"
+    with RequestWriter(path) as writer:
+        writer.send_email(_MAIL)
+        writer.insert_email_into_group("g1", "c@example.com")
+    email_client = EmailClient("key.1", **server.client_options())
+
+    with pytest.raises(ValueError, match="group_client"):
+        list(replay(path, email_client=email_client))
+
+    server.error_rate = 1.0
+    group_client = GroupClient("key.1", **server.client_options())
+    results = list(replay(path, email_client=email_client, group_client=group_client))
+    assert all(result.error is not None for result in results)
+    email_client.close()
+    group_client.close()
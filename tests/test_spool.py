@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import errno
+from pathlib import Path
+
+import pytest
+
+import sendlix.clients.email_client as email_module
+import sendlix.clients.spool as spool_module
+from sendlix.clients.email_client import EmailClient
+from sendlix.clients.spool import SpoolSender
+from sendlix.proto import email_pb2
+
+
+class _FakeRawEmailStub:
+    def __init__(self) -> None:
+        self.mails: list[bytes] = []
+
+    def SendEmlEmail(self, payload, **kwargs):
+        mail = email_pb2.EmlMailRequest.FromString(payload).mail
+        if mail.startswith(b"BAD"):
+            raise RuntimeError("rejected")
+        self.mails.append(mail)
+        return email_pb2.SendEmailResponse(message=[mail.decode()])
+
+
+@pytest.fixture()
+def raw_stub(monkeypatch: pytest.MonkeyPatch) -> _FakeRawEmailStub:
+    stub = _FakeRawEmailStub()
+    monkeypatch.setattr(email_module.email_pb2_grpc,
+                        "EmailStub", lambda channel: object())
+    monkeypatch.setattr(email_module, "_RawEmailStub", lambda channel: stub)
+    return stub
+
+
+def test_spool_sends_and_moves_files(tmp_path: Path, raw_stub: _FakeRawEmailStub):
+    spool = tmp_path / "spool"
+    spool.mkdir()
+    for i in range(5):
+        (spool / f"{i}.eml").write_bytes(f"mail-{i}".encode())
+    (spool / "partial.tmp").write_bytes(b"still being written")
+
+    sender = SpoolSender(EmailClient("secret.1"), spool, concurrency=3)
+    result = sender.run_once()
+
+    assert sorted(ids[0] for _, ids in result.sent) == [f"mail-{i}" for i in range(5)]
+    assert not result.failed
+    assert sorted(p.name for p in (spool / "sent").iterdir()) == [
+        f"{i}.eml" for i in range(5)]
+    assert [p.name for p in spool.iterdir() if p.is_file()] == ["partial.tmp"]
+
+
+def test_spool_failures_stay_or_move(tmp_path: Path, raw_stub: _FakeRawEmailStub):
+    spool = tmp_path / "spool"
+    spool.mkdir()
+    (spool / "good.eml").write_bytes(b"good")
+    (spool / "bad.eml").write_bytes(b"BAD mail")
+
+    sender = SpoolSender(EmailClient("secret.1"), spool)
+    result = sender.run_once()
+    assert [path.name for path, _ in result.failed] == ["bad.eml"]
+    assert (spool / "bad.eml").exists()
+
+    failed_dir = tmp_path / "failed"
+    SpoolSender(EmailClient("secret.1"), spool,
+                failed_directory=failed_dir).run_once()
+    assert (failed_dir / "bad.eml").exists()
+    assert raw_stub.mails == [b"good"]
+
+
+def test_spool_backs_off_failed_files(tmp_path: Path, raw_stub: _FakeRawEmailStub):
+    spool = tmp_path / "spool"
+    spool.mkdir()
+    (spool / "bad.eml").write_bytes(b"BAD mail")
+    sender = SpoolSender(EmailClient("secret.1"), spool, retry_backoff=60)
+
+    assert len(sender.run_once().failed) == 1
+    assert sender.run_once().failed == []  # not due yet
+    assert (spool / "bad.eml").exists()
+
+
+def test_spool_does_not_resend_when_the_move_fails(
+    tmp_path: Path, raw_stub: _FakeRawEmailStub, monkeypatch: pytest.MonkeyPatch,
+):
+    spool = tmp_path / "spool"
+    spool.mkdir()
+    (spool / "a.eml").write_bytes(b"mail-a")
+    sender = SpoolSender(EmailClient("secret.1"), spool)
+
+    def failing_replace(source, target):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(spool_module.os, "replace", failing_replace)
+    assert len(sender.run_once().sent) == 1
+    assert sender.run_once().sent == []
+    assert raw_stub.mails == [b"mail-a"]
+    assert (spool / "a.eml.sending").exists()
+    assert sender._send_file(spool / "a.eml") is None  # already claimed
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import os
+import stat
+import uuid
+from pathlib import Path
+
+import pytest
+
+import sendlix.auth as auth_module
+from sendlix.auth import Auth, _CachedToken
+from sendlix.proto import auth_pb2
+from sendlix.token_store import FileTokenStore, MemoryTokenStore, SharedMemoryTokenStore
+
+
+class _CountingAuthStub:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def GetJwtToken(self, request):
+        self.calls += 1
+        response = auth_pb2.AuthResponse(token=f"token-{self.calls}")
+        response.expires.seconds = 600
+        return response
+
+
+@pytest.fixture()
+def auth_stub(monkeypatch: pytest.MonkeyPatch) -> _CountingAuthStub:
+    stub = _CountingAuthStub()
+    monkeypatch.setattr(auth_module.auth_pb2_grpc,
+                        "AuthStub", lambda channel: stub)
+    return stub
+
+
+def test_file_store_round_trip(tmp_path: Path):
+    store = FileTokenStore(tmp_path)
+    assert store.load("key") is None
+
+    with store.lock("key"):
+        store.save("key", _CachedToken("abc", 2000.0, 1000.0))
+
+    assert store.load("key") == _CachedToken("abc", 2000.0, 1000.0)
+    token_file = tmp_path / "sendlix-token-key.json"
+    if os.name == "posix":
+        assert stat.S_IMODE(token_file.stat().st_mode) == 0o600
+    # No temporary files are left behind by the atomic replace.
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "sendlix-token-key.json", "sendlix-token-key.lock"]
+
+
+def test_file_store_ignores_corrupt_files(tmp_path: Path):
+    (tmp_path / "sendlix-token-key.json").write_text("{not json")
+    assert FileTokenStore(tmp_path).load("key") is None
+
+
+def test_auth_instances_share_token_through_store(tmp_path: Path, auth_stub: _CountingAuthStub):
+    store = FileTokenStore(tmp_path)
+    worker_a = Auth("secret.42", token_store=store)
+    worker_b = Auth("secret.42", token_store=FileTokenStore(tmp_path))
+
+    assert worker_a.get_auth_header() == ("authorization", "Bearer token-1")
+    assert worker_b.get_auth_header() == ("authorization", "Bearer token-1")
+    assert auth_stub.calls == 1
+    assert worker_b.stats.store_hits == 1
+    # The stored file never contains the API key secret in its name.
+    assert not any("secret" in p.name for p in tmp_path.iterdir())
+
+
+def test_invalidated_token_is_not_readopted_from_store(auth_stub: _CountingAuthStub):
+    auth = Auth("secret.42", token_store=MemoryTokenStore())
+    auth.get_auth_header()
+    auth.invalidate_cache()
+
+    assert auth.get_auth_header() == ("authorization", "Bearer token-2")
+    assert auth_stub.calls == 2
+
+
+def test_shared_memory_store_round_trip(tmp_path: Path):
+    key = uuid.uuid4().hex[:12]
+    writer = SharedMemoryTokenStore(lock_directory=tmp_path)
+    reader = SharedMemoryTokenStore(lock_directory=tmp_path)
+    try:
+        assert reader.load(key) is None
+        with writer.lock(key):
+            writer.save(key, _CachedToken("shm-token", 5000.0, 4000.0))
+        assert reader.load(key) == _CachedToken("shm-token", 5000.0, 4000.0)
+        with pytest.raises(ValueError):
+            writer.save(key, _CachedToken("x" * 10_000, 5000.0, 4000.0))
+    finally:
+        reader.close()
+        writer.remove(key)
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import pytest
+from google.protobuf.internal import encoder
+
+from sendlix.clients._wire import decode_varint, encode_varint, varint_size
+
+
+@pytest.mark.parametrize("value", [0, 1, 127, 128, 300, 2**21, 2**63 - 1])
+def test_varint_round_trip_matches_protobuf(value: int):
+    encoded = encode_varint(value)
+
+    assert encoded == encoder._VarintBytes(value)
+    assert varint_size(value) == len(encoded)
+    assert decode_varint(b"\x00" + encoded, 1) == (value, len(encoded) + 1)
+
+
+def test_decode_varint_rejects_truncated_input():
+    with pytest.raises(ValueError, match="Truncated"):
+        decode_varint(b"\x80\x80", 0)